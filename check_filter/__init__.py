@@ -17,6 +17,8 @@ Modules:
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Any
+
 __app_name__ = "check-filter"
 __description__ = "Check URLs that filtered (or not) in Iran."
 __version__ = "2.5.0"
@@ -26,6 +28,7 @@ __all__: list[str] = [
     "DomainChecker",
     "CheckResult",
     "FilterStatus",
+    "get_default_checker",
     "__app_name__",
     "__description__",
     "__version__",
@@ -33,4 +36,37 @@ __all__: list[str] = [
     "__epilog__",
 ]
 
-from check_filter.check import CheckResult, DomainChecker, FilterStatus
+if TYPE_CHECKING:
+    from check_filter.check import (
+        CheckResult,
+        DomainChecker,
+        FilterStatus,
+        get_default_checker,
+    )
+
+# Public names resolved on first access so that importing the package (and
+# therefore the CLI) does not pull in dnspython until a check is performed.
+_LAZY_ATTRS: dict[str, str] = {
+    "DomainChecker": "check_filter.check",
+    "CheckResult": "check_filter.check",
+    "FilterStatus": "check_filter.check",
+    "get_default_checker": "check_filter.check",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import heavy public attributes lazily on first access."""
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Include lazily imported attributes in ``dir()`` output."""
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
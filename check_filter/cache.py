@@ -0,0 +1,244 @@
+"""Result cache for DomainChecker.
+
+A bounded, TTL-aware LRU cache of :class:`~check_filter.check.CheckResult`
+objects keyed by normalized domain name. Entries expire according to the
+TTL of the DNS answer they were built from, clamped to configurable
+bounds, so a long-running process never serves results older than the
+upstream data allows.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from check_filter.check import FilterStatus
+
+if TYPE_CHECKING:
+    from check_filter.check import CheckResult
+
+# Default maximum number of cached results
+DEFAULT_MAX_ENTRIES = 100_000
+
+# Default bounds applied to answer TTLs (seconds)
+DEFAULT_MIN_TTL = 30
+DEFAULT_MAX_TTL = 3600
+
+# Default upper bound for negative answers (seconds); RFC 2308 suggests 1-3 hours
+DEFAULT_MAX_NEGATIVE_TTL = 3 * 3600
+
+# Default number of hits within one lifetime that make an entry "hot"
+DEFAULT_REFRESH_MIN_HITS = 2
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness.
+
+    Attributes:
+        hits: Lookups answered from the cache.
+        misses: Lookups that found no usable entry.
+        evictions: Entries dropped to stay within the size limit.
+        negative_hits: Hits that returned a cached negative answer.
+        refreshes: Hot entries handed out for a refresh-ahead.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    negative_hits: int = 0
+    refreshes: int = 0
+
+
+@dataclass(slots=True)
+class _Entry:
+    """A cached result with its expiry and refresh bookkeeping."""
+
+    result: CheckResult
+    expires_at: float
+    refresh_at: float
+    hits: int = 0
+    refreshing: bool = False
+
+
+class ResultCache:
+    """TTL-aware LRU cache of check results.
+
+    FREE and BLOCKED results are cached, as are negative answers (UNKNOWN
+    results for NXDOMAIN or no address records) that carry an SOA-derived
+    TTL. Errors are transient and must be retried. The cache is
+    thread-safe so that a checker can be shared between the synchronous
+    API's background loop and other loops.
+
+    Example:
+        >>> cache = ResultCache(max_entries=10_000)
+        >>> checker = DomainChecker(cache=cache)
+    """
+
+    cacheable_statuses: frozenset[FilterStatus] = frozenset(
+        {FilterStatus.FREE, FilterStatus.BLOCKED}
+    )
+    negative_error_classes: frozenset[str] = frozenset({"nxdomain", "no_answer"})
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        min_ttl: float = DEFAULT_MIN_TTL,
+        max_ttl: float = DEFAULT_MAX_TTL,
+        max_negative_ttl: float = DEFAULT_MAX_NEGATIVE_TTL,
+        *,
+        refresh_ahead: float | None = None,
+        refresh_min_hits: int = DEFAULT_REFRESH_MIN_HITS,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results.
+            min_ttl: Lower bound for an entry's lifetime in seconds.
+            max_ttl: Upper bound for an entry's lifetime in seconds. Also
+                used when the answer TTL is unknown.
+            max_negative_ttl: Upper bound for the lifetime of negative
+                answers in seconds. Set to 0 to disable negative caching.
+            refresh_ahead: Fraction (0-1) of an entry's lifetime after
+                which a hot entry is refreshed in the background, or None
+                to disable refresh-ahead.
+            refresh_min_hits: Hits an entry needs within its lifetime to
+                count as hot.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if min_ttl > max_ttl:
+            raise ValueError("min_ttl must not exceed max_ttl")
+        if refresh_ahead is not None and not 0 < refresh_ahead < 1:
+            raise ValueError("refresh_ahead must be between 0 and 1")
+
+        self.max_entries = max_entries
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.max_negative_ttl = max_negative_ttl
+        self.refresh_ahead = refresh_ahead
+        self.refresh_min_hits = refresh_min_hits
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries (including expired ones)."""
+        return len(self._entries)
+
+    def is_negative(self, result: CheckResult) -> bool:
+        """Return True if a result is a cacheable negative answer."""
+        return (
+            result.status is FilterStatus.UNKNOWN
+            and result.error_class in self.negative_error_classes
+            and result.ttl is not None
+            and self.max_negative_ttl > 0
+        )
+
+    def lifetime(self, result: CheckResult) -> float:
+        """Return how long a result may be cached, in seconds."""
+        if result.ttl is None:
+            return self.max_ttl
+        upper = self.max_negative_ttl if self.is_negative(result) else self.max_ttl
+        return min(max(result.ttl, self.min_ttl), upper)
+
+    def get(self, domain: str) -> CheckResult | None:
+        """Return a fresh cached result for a domain, if any.
+
+        Args:
+            domain: Normalized domain name.
+
+        Returns:
+            The cached CheckResult, or None on a miss or expired entry.
+        """
+        with self._lock:
+            entry = self._entries.get(domain)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                del self._entries[domain]
+                self.stats.misses += 1
+                return None
+
+            self._entries.move_to_end(domain)
+            entry.hits += 1
+            self.stats.hits += 1
+            if entry.result.status is FilterStatus.UNKNOWN:
+                self.stats.negative_hits += 1
+            return entry.result
+
+    def claim_refresh(self, domain: str) -> bool:
+        """Claim a hot, ageing entry for a background refresh.
+
+        Returns True at most once per cached entry: when refresh-ahead is
+        enabled, the entry has been hit at least ``refresh_min_hits``
+        times and ``refresh_ahead`` of its lifetime has passed. The caller
+        is then expected to re-resolve the domain and :meth:`put` the new
+        result; until that happens the current entry keeps being served.
+
+        Args:
+            domain: Normalized domain name.
+
+        Returns:
+            True if the caller should refresh the domain.
+        """
+        with self._lock:
+            entry = self._entries.get(domain)
+            if (
+                entry is None
+                or entry.refreshing
+                or entry.hits < self.refresh_min_hits
+                or entry.refresh_at > time.monotonic()
+            ):
+                return False
+            entry.refreshing = True
+            self.stats.refreshes += 1
+            return True
+
+    def release_refresh(self, domain: str) -> None:
+        """Give back a refresh claimed with :meth:`claim_refresh`."""
+        with self._lock:
+            entry = self._entries.get(domain)
+            if entry is not None:
+                entry.refreshing = False
+
+    def put(self, result: CheckResult) -> None:
+        """Store a result if it is cacheable.
+
+        Args:
+            result: The result to cache, keyed by ``result.domain``.
+        """
+        cacheable = result.status in self.cacheable_statuses
+        if not cacheable and not self.is_negative(result):
+            return
+
+        now = time.monotonic()
+        lifetime = self.lifetime(result)
+        refresh_at = (
+            now + lifetime * self.refresh_ahead
+            if self.refresh_ahead is not None
+            else math.inf
+        )
+        with self._lock:
+            self._entries[result.domain] = _Entry(result, now + lifetime, refresh_at)
+            self._entries.move_to_end(result.domain)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def invalidate(self, domain: str) -> None:
+        """Remove a domain from the cache."""
+        with self._lock:
+            self._entries.pop(domain, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
@@ -1,27 +1,50 @@
 """Checker module for DNS-based filtering status detection.
 
 This module provides functionality to detect if a domain is blocked
-by checking its DNS A record against known blocking IPs used by
-Iranian ISPs for censorship.
+by checking its DNS A record (and, in dual-stack mode, its AAAA record)
+against known blocking IPs used by Iranian ISPs for censorship.
 """
 
 from __future__ import annotations
 
 import asyncio
+import functools
+import ipaddress
 import logging
 import os
-from dataclasses import dataclass, field
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field, replace
 from enum import Enum
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from dns import asyncresolver, exception, resolver
+from dns import asyncresolver, exception, rdatatype, resolver
 
 if TYPE_CHECKING:
-    from collections.abc import Set
+    from collections.abc import AsyncGenerator, Iterable, Mapping, Sequence, Set
+
+    from check_filter.cache import ResultCache
+    from check_filter.incremental import PreviousEntry, StatusTransition
+    from check_filter.journal import ScanJournal
+    from check_filter.retry import RetryQueue
+    from check_filter.scheduler import PriorityScheduler
+    from check_filter.transport import Transport
+
+# Result type of futures from the background loop
+_T = TypeVar("_T")
 
 logger = logging.getLogger(__name__)
 
 
+# Failure classes that usually succeed when retried later
+TRANSIENT_ERROR_CLASSES: frozenset[str] = frozenset(
+    {"timeout", "no_nameservers", "network"}
+)
+
+
 class FilterStatus(Enum):
     """Enumeration of possible filtering statuses."""
 
@@ -29,6 +52,8 @@ class FilterStatus(Enum):
     BLOCKED = "blocked"
     ERROR = "error"
     UNKNOWN = "unknown"
+    UNCHECKED = "unchecked"
+    TAMPERED = "tampered"
 
 
 @dataclass(frozen=True)
@@ -40,12 +65,20 @@ class CheckResult:
         status: The filtering status of the domain.
         ips: Set of resolved IP addresses (empty if resolution failed).
         error: Error message if the check failed, None otherwise.
+        ttl: TTL in seconds of the answer the status is based on, if known.
+        error_class: Short machine-readable failure class (for example
+            ``"timeout"`` or ``"nxdomain"``), None for successful checks.
+        elapsed: Seconds the DNS lookup took, if known. Cached results
+            keep the time of the lookup they came from. Not compared.
     """
 
     domain: str
     status: FilterStatus
     ips: frozenset[str] = field(default_factory=frozenset)
     error: str | None = None
+    ttl: int | None = None
+    error_class: str | None = None
+    elapsed: float | None = field(default=None, compare=False)
 
     @property
     def is_blocked(self) -> bool:
@@ -57,11 +90,205 @@ class CheckResult:
         """Check if the domain is free (not blocked)."""
         return self.status == FilterStatus.FREE
 
+    @property
+    def is_transient(self) -> bool:
+        """Check if the check failed in a way that is worth retrying."""
+        return self.error_class in TRANSIENT_ERROR_CLASSES
+
     def __iter__(self) -> Any:
         """Allow tuple unpacking for backward compatibility."""
         yield self.domain
         yield self.is_free
 
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the result to a JSON-serializable dictionary."""
+        return {
+            "domain": self.domain,
+            "status": self.status.value,
+            "ips": sorted(self.ips),
+            "error": self.error,
+            "ttl": self.ttl,
+            "error_class": self.error_class,
+            "elapsed": self.elapsed,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> CheckResult:
+        """Create a result from a dictionary produced by :meth:`to_dict`."""
+        return cls(
+            domain=data["domain"],
+            status=FilterStatus(data["status"]),
+            ips=frozenset(data.get("ips") or ()),
+            error=data.get("error"),
+            ttl=data.get("ttl"),
+            error_class=data.get("error_class"),
+            elapsed=data.get("elapsed"),
+        )
+
+
+@dataclass
+class CheckerStats:
+    """Counters describing the checks performed by a DomainChecker.
+
+    Attributes:
+        checks: Results returned by ``acheck``, including cache hits.
+        queries: Checks that were resolved over the network.
+        shared: Checks that joined a query already in flight.
+        failures: Checks in a batch that raised and were turned into
+            ERROR results.
+        statuses: Returned results per status.
+    """
+
+    checks: int = 0
+    queries: int = 0
+    shared: int = 0
+    failures: int = 0
+    statuses: Counter[FilterStatus] = field(default_factory=Counter)
+
+    def record(self, result: CheckResult) -> None:
+        """Count one returned result."""
+        self.checks += 1
+        self.statuses[result.status] += 1
+
+
+@dataclass
+class _Flight:
+    """A DNS query shared by concurrent checks of the same domain."""
+
+    task: asyncio.Task[CheckResult]
+    waiters: int = 0
+
+
+class _LoopThread:
+    """An event loop running forever in a daemon thread.
+
+    Used by the synchronous DomainChecker API so that every sync call
+    shares one loop (and the resolver state living in it) instead of
+    creating a new loop per call with ``asyncio.run``.
+    """
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self._run, name="check-filter-loop", daemon=True
+        )
+        self.thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(self.loop)
+            for task in pending:
+                task.cancel()
+            self.loop.run_until_complete(
+                asyncio.gather(*pending, return_exceptions=True)
+            )
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+
+    def submit(self, coro: Any) -> Future[Any]:
+        """Schedule a coroutine on the loop from any thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self) -> None:
+        """Stop the loop and wait for the thread to exit."""
+        # Queued even if the thread has not entered run_forever yet.
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+def _answer_ttl(answer: Any) -> int | None:
+    """Return the TTL of a resolver answer's RRset, if available."""
+    ttl = getattr(getattr(answer, "rrset", None), "ttl", None)
+    return ttl if isinstance(ttl, int) else None
+
+
+def _unchecked(domain: str) -> CheckResult:
+    """Return the result recorded for a domain skipped by a time budget."""
+    return CheckResult(
+        domain=(domain or "").strip().lower(),
+        status=FilterStatus.UNCHECKED,
+        error="Not checked before the deadline",
+        error_class="deadline",
+    )
+
+
+def _negative_ttl(error: Exception) -> int | None:
+    """Return the negative-caching TTL of an NXDOMAIN or NoAnswer error.
+
+    Per RFC 2308 the lifetime of a negative answer is the smaller of the
+    TTL of the SOA record in the authority section and the SOA MINIMUM
+    field. Answers without an SOA must not be cached, so None is returned.
+    """
+    kwargs = getattr(error, "kwargs", None) or {}
+    responses = list((kwargs.get("responses") or {}).values())
+    if kwargs.get("response") is not None:
+        responses.append(kwargs["response"])
+
+    for response in responses:
+        for rrset in getattr(response, "authority", ()):
+            if rrset.rdtype == rdatatype.SOA and len(rrset):
+                return int(min(rrset.ttl, rrset[0].minimum))
+    return None
+
+
+# Resolution failures by exception type, checked in order: the status,
+# error class and message (formatted with the exception) of each
+_ERROR_CLASSES: tuple[
+    tuple[type[Exception] | tuple[type[Exception], ...], FilterStatus, str, str],
+    ...,
+] = (
+    (resolver.NXDOMAIN, FilterStatus.UNKNOWN, "nxdomain", "Domain does not exist"),
+    (resolver.NoAnswer, FilterStatus.UNKNOWN, "no_answer", "No address records"),
+    (resolver.YXDOMAIN, FilterStatus.ERROR, "yxdomain", "Name too long: {}"),
+    (
+        resolver.NoNameservers,
+        FilterStatus.ERROR,
+        "no_nameservers",
+        "No nameservers available: {}",
+    ),
+    (
+        (exception.Timeout, TimeoutError),
+        FilterStatus.ERROR,
+        "timeout",
+        "DNS query timeout: {}",
+    ),
+    (OSError, FilterStatus.ERROR, "network", "Network error: {}"),
+    (exception.DNSException, FilterStatus.ERROR, "dns", "DNS error: {}"),
+)
+
+
+def _classify_error(error: Exception) -> tuple[FilterStatus, str, str]:
+    """Map a resolution failure to a status, error class and message.
+
+    Every exception is classified, so that one odd answer (a YXDOMAIN, a
+    socket error, a bug in a custom transport) yields a per-domain result
+    instead of aborting a whole batch.
+    """
+    for types, status, error_class, message in _ERROR_CLASSES:
+        if isinstance(error, types):
+            return status, error_class, message.format(error)
+    return (
+        FilterStatus.ERROR,
+        "internal",
+        f"Unexpected error: {type(error).__name__}: {error}",
+    )
+
+
+def _canonical_ip(address: str) -> str:
+    """Return the canonical text form of an IP address.
+
+    IPv6 addresses have many spellings (``d0::11``, ``00d0:0:0::0011``);
+    resolver answers always use the compressed form, so blocked IPs are
+    compared in that form too. Unparseable values are returned unchanged.
+    """
+    try:
+        return ipaddress.ip_address(address).compressed
+    except ValueError:
+        return address
+
 
 # Default IPs used by Iranian ISPs for blocked domains
 DEFAULT_BLOCKED_IPS: frozenset[str] = frozenset(
@@ -72,20 +299,40 @@ DEFAULT_BLOCKED_IPS: frozenset[str] = frozenset(
     }
 )
 
+# Default IPv6 sinkhole addresses returned in AAAA answers for blocked domains
+DEFAULT_BLOCKED_IPV6: frozenset[str] = frozenset({"d0::11"})
+
+# Default number of checks in flight for streaming checks
+DEFAULT_CONCURRENCY = 256
+
+# Default number of refresh-ahead queries in flight
+DEFAULT_PREFETCH_CONCURRENCY = 16
+
 # Default DNS nameservers
 DEFAULT_NAMESERVER = "8.8.8.8"
 CI_NAMESERVER = "178.22.122.100"
 
 
-class DomainChecker:
+# The checker owns its resolver, cache, metrics and background work
+class DomainChecker:  # pylint: disable=too-many-instance-attributes
     """Checks if domains are blocked by analyzing DNS responses.
 
     This class resolves domain A records and compares the results
-    against known blocking IPs used by Iranian ISPs.
+    against known blocking IPs used by Iranian ISPs. In dual-stack mode
+    the A and AAAA records are queried concurrently and both address
+    families are matched, so AAAA-based blocking is detected as well.
+
+    Concurrent checks of the same domain share a single DNS query
+    (single-flight), and results are served from an optional ResultCache.
+    A checker is meant to be long-lived: it is an async context manager,
+    and :meth:`aclose` releases its transport connections and background
+    work. :func:`get_default_checker` returns a process-wide instance.
 
     Attributes:
         blocked_ips: Set of IP addresses that indicate a blocked domain.
         resolver: The DNS resolver instance.
+        cache: Optional cache of recent results.
+        stats: Counters of the checks performed so far.
 
     Example:
         >>> checker = DomainChecker()
@@ -101,30 +348,67 @@ class DomainChecker:
         blocked_ips: Set[str] | None = None,
         nameservers: list[str] | None = None,
         timeout: float = 5.0,
+        *,
+        cache: ResultCache | None = None,
+        transport: Transport | None = None,
+        dual_stack: bool = False,
+        prefetch_concurrency: int = DEFAULT_PREFETCH_CONCURRENCY,
     ) -> None:
         """Initialize the domain checker.
 
         Args:
-            blocked_ips: Custom set of IPs indicating blocked domains.
-                Defaults to Iranian ISP blocking IPs.
+            blocked_ips: Custom set of IPv4 and/or IPv6 addresses
+                indicating blocked domains. Defaults to Iranian ISP
+                blocking IPs (plus the IPv6 sinkholes in dual-stack mode).
             nameservers: List of DNS nameservers to use.
                 Defaults to Google DNS (8.8.8.8) or Iranian DNS in CI.
             timeout: DNS query timeout in seconds. Defaults to 5.0.
+            cache: Optional ResultCache shared by all checks.
+            transport: Optional DNS transport (for example a
+                PooledTCPTransport for DNS-over-TCP/TLS). When given, its
+                nameservers are used and ``nameservers`` is ignored.
+            dual_stack: If True, query A and AAAA records concurrently and
+                merge both address families into one result.
+            prefetch_concurrency: Maximum number of background refreshes
+                of hot cache entries (see ``ResultCache.refresh_ahead``)
+                in flight. Further refreshes are skipped rather than
+                queued, so they never compete with foreground checks.
         """
-        self.blocked_ips: frozenset[str] = (
-            frozenset(blocked_ips) if blocked_ips else DEFAULT_BLOCKED_IPS
-        )
+        if blocked_ips:
+            self.blocked_ips: frozenset[str] = frozenset(
+                _canonical_ip(ip) for ip in blocked_ips
+            )
+        elif dual_stack:
+            self.blocked_ips = DEFAULT_BLOCKED_IPS | DEFAULT_BLOCKED_IPV6
+        else:
+            self.blocked_ips = DEFAULT_BLOCKED_IPS
 
-        self.resolver = asyncresolver.Resolver(configure=False)
+        self.dual_stack = dual_stack
 
-        if nameservers:
-            self.resolver.nameservers = nameservers
-        else:
-            self.resolver.nameservers = [
-                CI_NAMESERVER if "CI" in os.environ else DEFAULT_NAMESERVER
-            ]
+        self.resolver: Any
+        if transport is not None:
+            from check_filter.transport import TransportResolver
 
-        self.resolver.lifetime = timeout
+            self.resolver = TransportResolver(transport, lifetime=timeout)
+        else:
+            self.resolver = asyncresolver.Resolver(configure=False)
+
+            if nameservers:
+                self.resolver.nameservers = nameservers
+            else:
+                self.resolver.nameservers = [
+                    CI_NAMESERVER if "CI" in os.environ else DEFAULT_NAMESERVER
+                ]
+
+            self.resolver.lifetime = timeout
+        self.cache = cache
+        self.stats = CheckerStats()
+        self.transport = transport
+        self.prefetch_concurrency = prefetch_concurrency
+        self._inflight: dict[str, _Flight] = {}
+        self._prefetches: set[asyncio.Task[CheckResult]] = set()
+        self._background: _LoopThread | None = None
+        self._background_lock = threading.Lock()
         logger.debug(
             "DomainChecker initialized with nameservers: %s",
             self.resolver.nameservers,
@@ -141,16 +425,156 @@ class DomainChecker:
             and any error message.
 
         Raises:
-            dns.resolver.NoAnswer: If the domain exists but has no A record.
+            dns.resolver.NoAnswer: If the domain is empty. Resolution
+                failures never raise; they are returned as classified
+                results.
         """
         if not domain or not domain.strip():
             raise resolver.NoAnswer("Domain can't be empty or whitespace only")
 
         domain = domain.strip().lower()
-        logger.debug("Checking domain: %s", domain)
+
+        if self.cache is not None:
+            cached = self.cache.get(domain)
+            if cached is not None:
+                logger.debug("Cache hit for %s", domain)
+                if self.cache.claim_refresh(domain):
+                    self._prefetch(domain)
+                self.stats.record(cached)
+                return cached
+
+        result = await self._single_flight(domain)
+        self.stats.record(result)
+        return result
+
+    def _prefetch(self, domain: str) -> None:
+        """Refresh a hot cache entry in the background.
+
+        The refresh goes through single-flight, so a foreground miss for
+        the same domain joins it instead of sending a second query.
+        """
+        assert self.cache is not None
+        if len(self._prefetches) >= self.prefetch_concurrency:
+            logger.debug("Prefetch limit reached, not refreshing %s", domain)
+            self.cache.release_refresh(domain)
+            return
+
+        logger.debug("Refreshing %s ahead of expiry", domain)
+        task = asyncio.get_running_loop().create_task(self._refresh(domain))
+        self._prefetches.add(task)
+        task.add_done_callback(self._prefetches.discard)
+
+    async def _refresh(self, domain: str) -> CheckResult:
+        """Re-resolve a cached domain and give back its refresh claim."""
+        assert self.cache is not None
+        try:
+            return await self._single_flight(domain)
+        finally:
+            # A result that is not cached (such as an ERROR) leaves the old
+            # entry in place, claimed; release it so a later hit retries.
+            self.cache.release_refresh(domain)
+
+    async def _single_flight(self, domain: str) -> CheckResult:
+        """Share one in-flight query between concurrent checks of a domain.
+
+        The shared query is only cancelled once every waiter has been
+        cancelled, so one caller giving up does not fail the others.
+        """
+        loop = asyncio.get_running_loop()
+        flight = self._inflight.get(domain)
+
+        if flight is None or flight.task.get_loop() is not loop:
+            flight = _Flight(loop.create_task(self._acheck_uncached(domain)))
+            self._inflight[domain] = flight
+            flight.task.add_done_callback(
+                functools.partial(self._forget_flight, domain, flight)
+            )
+        else:
+            self.stats.shared += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1:
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget_flight(self, domain: str, flight: _Flight, _: Any) -> None:
+        """Drop a finished query from the in-flight table."""
+        if self._inflight.get(domain) is flight:
+            del self._inflight[domain]
+
+    async def _acheck_uncached(self, domain: str) -> CheckResult:
+        """Resolve a normalized domain and classify the answer."""
+        self.stats.queries += 1
+        started = time.perf_counter()
+        result = await self._resolve(domain)
+        result = replace(result, elapsed=time.perf_counter() - started)
+        if self.cache is not None:
+            self.cache.put(result)
+        return result
+
+    async def _resolve(self, domain: str, dns_resolver: Any = None) -> CheckResult:
+        """Resolve a normalized domain, in both families if dual-stack.
+
+        The A and AAAA queries run concurrently, so a dual-stack check
+        takes as long as the slower of the two rather than their sum.
+
+        Args:
+            domain: Normalized domain name.
+            dns_resolver: Resolver to query instead of ``self.resolver``.
+        """
+        if not self.dual_stack:
+            return await self._resolve_family(domain, "A", dns_resolver)
+
+        results = await asyncio.gather(
+            self._resolve_family(domain, "A", dns_resolver),
+            self._resolve_family(domain, "AAAA", dns_resolver),
+        )
+        return self._merge_families(domain, results)
+
+    def _merge_families(
+        self, domain: str, results: Sequence[CheckResult]
+    ) -> CheckResult:
+        """Combine the A and AAAA results of a dual-stack check.
+
+        Addresses from every family that answered are merged and the
+        domain is BLOCKED if any of them is a blocked IP. A family without
+        records is ignored; if neither family answered, a non-existent
+        domain takes precedence over an ERROR, which takes precedence over
+        a name without address records.
+        """
+        answered = [r for r in results if r.ips]
+
+        if answered:
+            ips = frozenset().union(*(r.ips for r in answered))
+            ttls = [r.ttl for r in answered if r.ttl is not None]
+            is_blocked = bool(ips & self.blocked_ips)
+            return CheckResult(
+                domain=domain,
+                status=FilterStatus.BLOCKED if is_blocked else FilterStatus.FREE,
+                ips=ips,
+                ttl=min(ttls) if ttls else None,
+            )
+
+        def rank(result: CheckResult) -> int:
+            if result.error_class == "nxdomain":
+                return 0
+            return 1 if result.status is FilterStatus.ERROR else 2
+
+        return min(results, key=rank)
+
+    async def _resolve_family(
+        self, domain: str, rdtype: str, dns_resolver: Any = None
+    ) -> CheckResult:
+        """Query one address record type (A or AAAA) of a normalized domain."""
+        logger.debug("Checking domain: %s (%s)", domain, rdtype)
 
         try:
-            answer = await self.resolver.resolve(domain, "A")
+            answer = await (dns_resolver or self.resolver).resolve(domain, rdtype)
             ip_list = frozenset(data.address for data in answer)
             logger.debug("Resolved IPs for %s: %s", domain, ip_list)
 
@@ -161,40 +585,354 @@ class DomainChecker:
                 domain=domain,
                 status=status,
                 ips=ip_list,
+                ttl=_answer_ttl(answer),
             )
 
-        except resolver.NXDOMAIN:
-            logger.debug("Domain %s does not exist (NXDOMAIN)", domain)
+        # Any failure becomes this domain's result; see _classify_error.
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            status, error_class, message = _classify_error(e)
+            logger.log(
+                logging.DEBUG if status is FilterStatus.UNKNOWN else logging.WARNING,
+                "%s lookup of %s failed (%s): %s",
+                rdtype,
+                domain,
+                error_class,
+                e,
+                exc_info=error_class == "internal",
+            )
             return CheckResult(
                 domain=domain,
-                status=FilterStatus.UNKNOWN,
-                error="Domain does not exist",
+                status=status,
+                error=message,
+                ttl=_negative_ttl(e) if status is FilterStatus.UNKNOWN else None,
+                error_class=error_class,
             )
 
-        except resolver.NoNameservers as e:
-            logger.error("No nameservers available for %s: %s", domain, e)
+    async def _acheck_isolated(self, domain: str) -> CheckResult:
+        """Check a domain, turning any exception into an ERROR result."""
+        if not domain or not domain.strip():
             return CheckResult(
-                domain=domain,
+                domain="",
                 status=FilterStatus.ERROR,
-                error=f"No nameservers available: {e}",
+                error="Domain can't be empty or whitespace only",
+                error_class="invalid",
             )
-
-        except exception.Timeout as e:
-            logger.warning("DNS timeout for %s: %s", domain, e)
+        try:
+            return await self.acheck(domain)
+        # A failing check must not abort the batch it belongs to.
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            status, error_class, message = _classify_error(e)
+            logger.error("Check of %s failed: %s", domain, message)
+            self.stats.failures += 1
             return CheckResult(
-                domain=domain,
-                status=FilterStatus.ERROR,
-                error=f"DNS query timeout: {e}",
+                domain=domain.strip().lower(),
+                status=status,
+                error=message,
+                error_class=error_class,
             )
 
-    async def acheck_many(self, domains: list[str]) -> list[CheckResult]:
+    async def acheck_many(
+        self,
+        domains: list[str],
+        retries: RetryQueue | None = None,
+        time_budget: float | None = None,
+        scheduler: PriorityScheduler | None = None,
+    ) -> list[CheckResult]:
         """Check multiple domains concurrently.
 
+        A failing check never aborts the batch: every failure becomes a
+        classified per-domain result.
+
+        Args:
+            domains: List of domain names to check.
+            retries: Optional RetryQueue. Transient failures are retried
+                after the first pass, within the queue's budget.
+            time_budget: Optional wall-clock budget in seconds. Domains
+                not checked in time are returned as UNCHECKED.
+            scheduler: Optional PriorityScheduler. Domains are then
+                checked with bounded concurrency, most important first,
+                so a time budget is spent where it matters.
+
+        Returns:
+            List of CheckResult objects for each domain, in input order.
+        """
+        if retries is None and time_budget is None and scheduler is None:
+            tasks = [self._acheck_isolated(domain) for domain in domains]
+            return await asyncio.gather(*tasks)
+
+        if scheduler is None:
+            ordered: Iterable[str] = domains
+            concurrency = max(len(domains), 1)
+        else:
+            ordered = scheduler.order(domains)
+            concurrency = DEFAULT_CONCURRENCY
+
+        by_domain: dict[str, CheckResult] = {}
+        async for result in self.acheck_iter(
+            ordered, concurrency, retries=retries, time_budget=time_budget
+        ):
+            by_domain[result.domain] = result
+        return [by_domain[(domain or "").strip().lower()] for domain in domains]
+
+    async def acheck_iter(
+        self,
+        domains: Iterable[str],
+        concurrency: int = DEFAULT_CONCURRENCY,
+        retries: RetryQueue | None = None,
+        time_budget: float | None = None,
+        not_before: Mapping[str, float] | None = None,
+    ) -> AsyncGenerator[CheckResult, None]:
+        """Check domains with bounded concurrency, yielding as they complete.
+
+        Unlike :meth:`acheck_many`, domains are pulled from the iterable
+        lazily, so at most ``concurrency`` checks (and tasks) exist at any
+        time regardless of the input size. Closing the iterator early
+        cancels the checks still in flight.
+
+        With a RetryQueue, transient failures (timeouts, unreachable
+        nameservers, network errors) are not yielded straight away but
+        deferred. Deferred checks run once the input is exhausted, or
+        earlier whenever fewer than half of the slots are busy, and the
+        last result is yielded when a domain runs out of attempts.
+
+        When ``time_budget`` runs out, checks still in flight are
+        cancelled and every domain that was not checked is yielded as
+        UNCHECKED; domains awaiting a retry yield their last result.
+
+        Args:
+            domains: Iterable of domain names to check, in the order they
+                should be started.
+            concurrency: Maximum number of checks in flight.
+            retries: Optional RetryQueue for transient failures.
+            time_budget: Optional wall-clock budget in seconds.
+            not_before: Optional mapping of domain to the event loop time
+                (``loop.time()``) before which its check must not start.
+                It is read when the domain is taken from the iterable, so
+                a lazy iterable may fill it in as it goes.
+
+        Yields:
+            CheckResult objects in completion order.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        loop = asyncio.get_running_loop()
+        deadline = None if time_budget is None else loop.time() + time_budget
+        from check_filter.slots import CheckSlots
+
+        slots = CheckSlots(
+            self._acheck_isolated, domains, concurrency, retries, not_before
+        )
+
+        try:
+            while deadline is None or loop.time() < deadline:
+                start_at = slots.fill()
+                if slots.finished():
+                    return
+                for result in await slots.completed(slots.timeout(start_at, deadline)):
+                    yield result
+
+            logger.info("Time budget exhausted, reporting unchecked domains")
+            for domain in await slots.cancel():
+                yield _unchecked(domain)
+            if retries is not None:
+                for result in retries.drain():
+                    yield result
+            for domain in slots.remaining():
+                yield _unchecked(domain)
+        finally:
+            await slots.cancel()
+
+    async def arecheck(
+        self,
+        previous: str | os.PathLike[str] | Mapping[str, PreviousEntry],
+        max_age: float = 24 * 60 * 60,
+        use_ttl: bool = False,
+        time_budget: float | None = None,
+        journal: ScanJournal | None = None,
+    ) -> list[StatusTransition]:
+        """Recheck a previous scan and return only status transitions.
+
+        Entries that were ERROR or UNKNOWN, or whose age (or TTL, with
+        ``use_ttl``) has expired, are checked again; everything else is
+        assumed unchanged.
+
+        Args:
+            previous: Path to a previous scan journal, or a mapping of
+                domain to PreviousEntry.
+            max_age: Maximum age in seconds before a result is rechecked.
+            use_ttl: If True, an entry's recorded TTL replaces ``max_age``.
+            time_budget: Optional wall-clock budget in seconds.
+            journal: Optional journal receiving every fresh result.
+
+        Returns:
+            List of StatusTransition objects for domains whose status
+            changed.
+        """
+        from check_filter import incremental
+
+        if isinstance(previous, (str, os.PathLike)):
+            previous = incremental.load_previous(previous)
+
+        return await incremental.arecheck(
+            self,
+            previous,
+            max_age=max_age,
+            use_ttl=use_ttl,
+            time_budget=time_budget,
+            journal=journal,
+        )
+
+    def _background_loop(self) -> _LoopThread:
+        """Return the background loop, starting it on first use."""
+        with self._background_lock:
+            if self._background is None:
+                self._background = _LoopThread()
+            background = self._background
+
+        if threading.current_thread() is background.thread:
+            raise RuntimeError(
+                "Synchronous checks cannot be made from the checker's own "
+                "event loop; use 'await acheck()' instead"
+            )
+        return background
+
+    def submit(self, domain: str) -> Future[CheckResult]:
+        """Schedule a check on the background loop and return a future.
+
+        Safe to call from any number of threads at once.
+
+        Args:
+            domain: The domain name to check.
+
+        Returns:
+            A concurrent.futures.Future resolving to the CheckResult.
+        """
+        return self._background_loop().submit(self.acheck(domain))
+
+    @staticmethod
+    def _wait(future: Future[_T], timeout: float | None) -> _T:
+        """Return a background future's result, cancelling it on timeout."""
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def check(self, domain: str, timeout: float | None = None) -> CheckResult:
+        """Check a domain from synchronous code.
+
+        The check runs on a long-lived background event loop shared by all
+        synchronous calls of this checker, so resolver state and caches
+        stay warm between calls.
+
+        Args:
+            domain: The domain name to check.
+            timeout: Maximum seconds to wait for the result.
+
+        Returns:
+            CheckResult for the domain.
+
+        Raises:
+            TimeoutError: If the result is not ready within ``timeout``; the
+                check is cancelled.
+        """
+        return self._wait(self.submit(domain), timeout)
+
+    def check_many(
+        self, domains: list[str], timeout: float | None = None
+    ) -> list[CheckResult]:
+        """Check multiple domains concurrently from synchronous code.
+
         Args:
             domains: List of domain names to check.
+            timeout: Maximum seconds to wait for all results.
 
         Returns:
-            List of CheckResult objects for each domain.
+            List of CheckResult objects, in input order.
+
+        Raises:
+            TimeoutError: If the results are not ready within ``timeout``;
+                the remaining checks are cancelled.
+        """
+        future = self._background_loop().submit(self.acheck_many(domains))
+        return self._wait(future, timeout)
+
+    def close(self) -> None:
+        """Stop the background loop used by the synchronous API."""
+        with self._background_lock:
+            background, self._background = self._background, None
+        if background is not None:
+            background.stop()
+
+    async def aclose(self) -> None:
+        """Release the resources owned by the checker.
+
+        Cancels background cache refreshes started on the running loop,
+        closes the transport's connections and stops the synchronous
+        API's background loop. The checker stays usable afterwards;
+        connections and the loop are reopened on demand.
         """
-        tasks = [self.acheck(domain) for domain in domains]
-        return await asyncio.gather(*tasks, return_exceptions=False)
+        loop = asyncio.get_running_loop()
+        prefetches = [task for task in self._prefetches if task.get_loop() is loop]
+        for task in prefetches:
+            task.cancel()
+        if prefetches:
+            await asyncio.gather(*prefetches, return_exceptions=True)
+        if self.transport is not None:
+            await self.transport.aclose()
+        self.close()
+
+    async def __aenter__(self) -> DomainChecker:
+        """Return the checker for use in an ``async with`` block."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Release the checker's resources on leaving the context."""
+        await self.aclose()
+
+
+class _DefaultChecker:
+    """Holder of the lazily created process-wide checker."""
+
+    def __init__(self) -> None:
+        """Initialize an empty holder."""
+        self.lock = threading.Lock()
+        self.checker: DomainChecker | None = None
+
+
+# Process-wide checker shared by the CLI and print_result
+_default = _DefaultChecker()
+
+
+def get_default_checker() -> DomainChecker:
+    """Return the process-wide shared DomainChecker.
+
+    The instance is created on first use with a default ResultCache and
+    then reused, so consecutive batches share one resolver, single-flight
+    table, background loop and cache instead of rebuilding them. The
+    cache also keeps negative answers (NXDOMAIN, no address records) for
+    their SOA-derived TTL, so dead domains are not queried again.
+
+    Example:
+        >>> checker = get_default_checker()
+        >>> result = await checker.acheck("example.com")
+    """
+    from check_filter.cache import ResultCache
+
+    with _default.lock:
+        if _default.checker is None:
+            _default.checker = DomainChecker(cache=ResultCache())
+        return _default.checker
+
+
+def set_default_checker(checker: DomainChecker | None) -> None:
+    """Replace the process-wide shared DomainChecker.
+
+    Args:
+        checker: The new default (for example one with a ResultCache or
+            a pooled transport), or None to create a fresh default on
+            next use. The previous instance is not closed.
+    """
+    with _default.lock:
+        _default.checker = checker
@@ -4,18 +4,34 @@ This module provides the CLI commands for checking domain filtering status
 in Iran using DNS analysis.
 """
 
+# Every command of the Typer app is defined here, next to its helpers
+# pylint: disable=too-many-lines
+
 from __future__ import annotations
 
-import asyncio
+import contextlib
 import sys
+import time
 from pathlib import Path
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated, Any
 
 import typer
 from rich import print as rich_print
 from rich.console import Console
 
-from check_filter import __app_name__, __description__, __epilog__, __version__, utils
+from check_filter import __app_name__, __description__, __epilog__, __version__
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from types import ModuleType
+
+    from check_filter.check import CheckResult, DomainChecker, FilterStatus
+    from check_filter.history import HistoryStore
+    from check_filter.journal import ScanJournal
+    from check_filter.memtrace import MemoryTracer
+    from check_filter.scheduler import PriorityScheduler
+    from check_filter.sinks import ResultSink
+    from check_filter.stats import ScanStats
 
 # Initialize console for error output
 console = Console(stderr=True)
@@ -29,6 +45,25 @@ app = typer.Typer(
 )
 
 
+def _utils() -> ModuleType:
+    """Import the utils module on demand.
+
+    ``utils`` pulls in dnspython and Rich's live display, so it
+    is only loaded once a command actually needs to check domains. This
+    keeps ``--help`` and ``--version`` fast.
+    """
+    from check_filter import utils
+
+    return utils
+
+
+def __getattr__(name: str) -> Any:
+    """Expose ``cli.utils`` lazily for callers and tests that reference it."""
+    if name == "utils":
+        return _utils()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def _version_callback(value: bool) -> None:
     """Display version information and exit."""
     if value:
@@ -46,6 +81,283 @@ def _handle_validation_errors(invalid_domains: list[str]) -> None:
         raise typer.Exit(code=1)
 
 
+def _report_unchecked(results: list[CheckResult]) -> None:
+    """Print how many domains a deadline left unchecked, if any."""
+    from check_filter.check import FilterStatus
+
+    unchecked = sum(r.status is FilterStatus.UNCHECKED for r in results)
+    if unchecked:
+        rich_print(
+            f"[yellow]Deadline reached: {unchecked} domain(s) left unchecked."
+            "[/yellow]"
+        )
+
+
+def _scan_stats(enabled: bool) -> ScanStats | None:
+    """Return a new ScanStats if --stats was given."""
+    if not enabled:
+        return None
+    from check_filter.stats import ScanStats
+
+    return ScanStats()
+
+
+def _memory_tracer(enabled: bool) -> MemoryTracer | None:
+    """Start tracing memory if --memtrace was given."""
+    if not enabled:
+        return None
+    from check_filter.memtrace import MemoryTracer
+
+    tracer = MemoryTracer()
+    tracer.start()
+    return tracer
+
+
+def _report_memory(tracer: MemoryTracer | None, results: list[CheckResult]) -> None:
+    """Stop a memory trace and print where memory went."""
+    if tracer is None:
+        return
+    tracer.stop()
+    _utils().print_memory_report(tracer.report(domains=len(results)))
+
+
+def _sinks(specs: list[str] | None) -> list[ResultSink]:
+    """Create the result sinks given with --sink."""
+    if not specs:
+        return []
+    from check_filter.sinks import make_sink
+
+    try:
+        return [make_sink(spec) for spec in specs]
+    except (ValueError, OSError) as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(code=1) from None
+
+
+async def _scan(
+    domains: list[str], sinks: list[ResultSink], **kwargs: Any
+) -> list[CheckResult]:
+    """Run print_result, fanning results out to the sinks (if any)."""
+    utils = _utils()
+    results: list[CheckResult]
+    if not sinks:
+        results = await utils.print_result(domains, **kwargs)
+        return results
+
+    from check_filter.sinks import ResultFanOut
+
+    async with ResultFanOut(sinks) as fan_out:
+        results = await utils.print_result(domains, sinks=fan_out, **kwargs)
+    return results
+
+
+@contextlib.contextmanager
+def _human_output(specs: list[str] | None) -> Iterator[None]:
+    """Print messages and tables to stderr while a sink writes to stdout.
+
+    ``--sink stdout`` emits JSON lines, which anything else printed on
+    stdout (such as the live results table) would corrupt.
+    """
+    if not specs or not any(spec in ("stdout", "-") for spec in specs):
+        yield
+        return
+
+    from rich import reconfigure
+
+    reconfigure(stderr=True)
+    try:
+        yield
+    finally:
+        reconfigure()
+
+
+def _run_scan(
+    domains: list[str], sinks: list[ResultSink], **kwargs: Any
+) -> list[CheckResult]:
+    """Run a scan to completion, reporting a failed sink as an error."""
+    import asyncio
+
+    from check_filter.sinks import SinkError
+
+    try:
+        return asyncio.run(_scan(domains, sinks, **kwargs))
+    except SinkError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(code=1) from None
+
+
+def _split_list(value: str) -> list[str]:
+    """Split a comma-separated option value into its non-empty items."""
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _differential_checker(
+    resolvers: str | None, control: str | None
+) -> DomainChecker | None:
+    """Build a DifferentialChecker if --control was given."""
+    if control is None:
+        if resolvers is not None:
+            console.print("[red]--resolver requires --control.[/red]")
+            raise typer.Exit(code=1)
+        return None
+
+    from check_filter.differential import DifferentialChecker, system_nameservers
+
+    test = _split_list(resolvers) if resolvers else system_nameservers()
+    try:
+        return DifferentialChecker(test, _split_list(control))
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(code=1) from None
+
+
+def _read_unique(
+    path: str, dedupe: str | None, error_rate: float
+) -> tuple[list[str], dict[str, float]]:
+    """Stream a domain file, skipping repeated domains as they are read.
+
+    Domains are compared in their normalized form, so Unicode and
+    punycode spellings of a name count as the same domain, as they do
+    on the memory-mapped path.
+
+    Returns:
+        The domain names and the per-domain priorities.
+    """
+    from check_filter.dedupe import make_deduplicator
+    from check_filter.inputs import iter_domains
+    from check_filter.validation import normalize_domain, parse_priority
+
+    names: list[str] = []
+    priorities: dict[str, float] = {}
+    with contextlib.ExitStack() as stack:
+        seen = (
+            stack.enter_context(make_deduplicator(dedupe, error_rate=error_rate))
+            if dedupe is not None
+            else None
+        )
+        for line in iter_domains(path):
+            name, priority = parse_priority(line)
+            try:
+                key = normalize_domain(name)
+            except UnicodeError:
+                # Kept as written so validation reports it as invalid
+                key = name.strip().lower()
+            if seen is not None and not seen.add(key):
+                continue
+            if priority is not None:
+                priorities[key] = priority
+            names.append(name)
+    if seen is not None:
+        _report_duplicates(seen.stats.duplicates)
+    return names, priorities
+
+
+def _load_domains(
+    path: str, dedupe: str | None, error_rate: float
+) -> tuple[list[str], list[str], dict[str, float]]:
+    """Read, deduplicate and validate the domains of a file.
+
+    Streamed input is deduplicated line by line as it is read, so
+    repeated domains are never held in memory. Large plain files are
+    validated by worker processes first and deduplicated afterwards.
+
+    Returns:
+        The valid domains, the invalid lines and the per-domain priorities.
+    """
+    from check_filter.inputs import is_mappable
+
+    utils = _utils()
+
+    if not is_mappable(path):
+        names, priorities = _read_unique(path, dedupe, error_rate)
+        valid, invalid = utils.validate_domains(names)
+        return valid, invalid, priorities
+
+    # Large plain files are parsed and validated by worker
+    # processes sharing a memory map of the file.
+    mapped = utils.validate_domain_file(path)
+    if dedupe is None:
+        return mapped.valid, mapped.invalid, mapped.priorities
+
+    from check_filter.dedupe import make_deduplicator
+
+    with make_deduplicator(
+        dedupe, capacity=max(len(mapped.valid), 1), error_rate=error_rate
+    ) as deduplicator:
+        valid = list(deduplicator.filter(mapped.valid))
+    _report_duplicates(deduplicator.stats.duplicates)
+    return valid, mapped.invalid, mapped.priorities
+
+
+def _report_duplicates(duplicates: int) -> None:
+    """Report how many repeated domains were skipped."""
+    if duplicates:
+        rich_print(f"[yellow]Skipped {duplicates} duplicate domain(s).[/yellow]")
+
+
+def _read_domain_file(
+    path: str, dedupe: str | None, error_rate: float
+) -> tuple[list[str], list[str], dict[str, float]]:
+    """Load a domain file for the file command, exiting on read errors."""
+    try:
+        valid, invalid, priorities = _load_domains(path, dedupe, error_rate)
+    except FileNotFoundError:
+        console.print(f"[red]File not found: {path}[/red]")
+        raise typer.Exit(code=1) from None
+    except PermissionError:
+        console.print(f"[red]Permission denied: {path}[/red]")
+        raise typer.Exit(code=1) from None
+    except IsADirectoryError:
+        console.print(f"[red]Not a file: {path}[/red]")
+        raise typer.Exit(code=1) from None
+    except Exception as e:
+        console.print(f"[red]Error reading file: {e}[/red]")
+        raise typer.Exit(code=1) from None
+
+    if not valid and not invalid:
+        console.print("[red]No domains found in the file![/red]")
+        raise typer.Exit(code=1)
+    return valid, invalid, priorities
+
+
+def _scheduler(
+    priorities: dict[str, float], deadline: float | None, journal: Path | None
+) -> PriorityScheduler | None:
+    """Build the scheduler used with priorities or --deadline, if any."""
+    if deadline is None and not priorities:
+        return None
+
+    from check_filter.incremental import load_previous
+    from check_filter.scheduler import PriorityScheduler
+
+    previous = load_previous(journal) if journal and journal.exists() else None
+    return PriorityScheduler(priorities=priorities, previous=previous)
+
+
+def _scan_journal(
+    journal: Path | None,
+) -> contextlib.AbstractContextManager[ScanJournal | None]:
+    """Open the --journal file, or return a placeholder without one."""
+    if journal is None:
+        return contextlib.nullcontext()
+
+    from check_filter.journal import ScanJournal
+
+    return ScanJournal(journal)
+
+
+def _report_scan(
+    results: list[CheckResult],
+    scan_stats: ScanStats | None,
+    tracer: MemoryTracer | None,
+) -> None:
+    """Report unchecked domains, statistics and memory use after a scan."""
+    _report_unchecked(results)
+    if scan_stats is not None:
+        _utils().print_stats(scan_stats)
+    _report_memory(tracer, results)
+
+
 @app.command(epilog=__epilog__)
 def domain(
     domain_name: Annotated[
@@ -62,6 +374,10 @@ def domain(
         check-filter domain google.com
         check-filter domain twitter.com
     """
+    import asyncio
+
+    utils = _utils()
+
     if not utils.validate_domain(domain_name):
         raise typer.Exit(code=1)
 
@@ -78,32 +394,376 @@ def domains(
             show_default=False,
         ),
     ],
+    *,
+    deadline: Annotated[
+        float | None,
+        typer.Option(
+            "--deadline",
+            help="Stop after this many seconds; unfinished domains are "
+            "reported as unchecked.",
+            min=0,
+        ),
+    ] = None,
+    stats: Annotated[
+        bool,
+        typer.Option(
+            "--stats",
+            help="Print aggregate statistics (status counts, blocked ratio "
+            "by TLD and domain, latency, errors) after the scan.",
+        ),
+    ] = False,
+    memtrace: Annotated[
+        bool,
+        typer.Option(
+            "--memtrace",
+            help="Trace memory allocations and report the peak, the top "
+            "allocation sites and the memory per domain (slows the scan).",
+        ),
+    ] = False,
+    sink: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--sink",
+            help="Also write every result to a sink: jsonl:PATH, sqlite:PATH, "
+            "an http(s):// webhook URL or stdout. May be repeated.",
+            show_default=False,
+        ),
+    ] = None,
+    resolvers: Annotated[
+        str | None,
+        typer.Option(
+            "--resolver",
+            help="Comma-separated test resolvers for --control "
+            "(default: the system's resolvers).",
+            show_default=False,
+        ),
+    ] = None,
+    control: Annotated[
+        str | None,
+        typer.Option(
+            "--control",
+            help="Comma-separated control resolvers; answers from the test "
+            "resolvers that disagree with them are reported as tampered.",
+            show_default=False,
+        ),
+    ] = None,
 ) -> None:
     """Check filtering status for [green]multiple domains[/green].
 
     Provide a comma-separated list of domain names.
 
+    With [cyan]--control[/cyan], every domain is also resolved by trusted
+    control resolvers and answers from the test resolvers that disagree
+    are reported as [magenta]tampered[/magenta].
+
     Examples:
         check-filter domains google.com,twitter.com
         check-filter domains github.com,gitlab.com,bitbucket.org
+        check-filter domains example.com --resolver 10.0.0.1 --control 9.9.9.9
     """
-    rich_print("[yellow]Checking domains ...[/yellow]")
+    utils = _utils()
+
+    with _human_output(sink):
+        rich_print("[yellow]Checking domains ...[/yellow]")
+
+        # Parse and clean domain list
+        domain_names: list[str] = [
+            d.strip() for d in domain_list.split(",") if d.strip()
+        ]
 
-    # Parse and clean domain list
-    domain_names: list[str] = [d.strip() for d in domain_list.split(",") if d.strip()]
+        if not domain_names:
+            console.print("[red]No valid domains provided![/red]")
+            raise typer.Exit(code=1)
 
-    if not domain_names:
-        console.print("[red]No valid domains provided![/red]")
+        tracer = _memory_tracer(memtrace)
+        valid, invalid = utils.validate_domains(domain_names)
+        _handle_validation_errors(invalid)
+
+        scan_stats = _scan_stats(stats)
+        checker = _differential_checker(resolvers, control)
+        results = _run_scan(
+            valid,
+            _sinks(sink),
+            checker=checker,
+            time_budget=deadline,
+            stats=scan_stats,
+        )
+        _report_scan(results, scan_stats, tracer)
+
+
+# Typer maps every command-line option to one parameter of the command
+@app.command(epilog=__epilog__)
+def file(  # pylint: disable=too-many-arguments,too-many-locals
+    path: Annotated[
+        str,
+        typer.Argument(
+            help="Path to a file containing domain names (one per line); "
+            "may be .gz, .bz2 or .zst compressed, or - for stdin",
+            show_default=False,
+        ),
+    ],
+    *,
+    journal: Annotated[
+        Path | None,
+        typer.Option(
+            "--journal",
+            "-j",
+            help="Append every result to this JSON Lines journal as it completes.",
+            dir_okay=False,
+            writable=True,
+            resolve_path=True,
+        ),
+    ] = None,
+    resume: Annotated[
+        bool,
+        typer.Option(
+            "--resume",
+            help="Skip domains that already have a result in the journal.",
+        ),
+    ] = False,
+    deadline: Annotated[
+        float | None,
+        typer.Option(
+            "--deadline",
+            help="Stop after this many seconds; unfinished domains are "
+            "reported as unchecked.",
+            min=0,
+        ),
+    ] = None,
+    dedupe: Annotated[
+        str | None,
+        typer.Option(
+            "--dedupe",
+            help="Skip repeated domains: 'exact' (spills to disk) or "
+            "'bloom' (fixed memory, may skip a few unique domains).",
+            show_default=False,
+        ),
+    ] = None,
+    dedupe_error_rate: Annotated[
+        float,
+        typer.Option(
+            "--dedupe-error-rate",
+            help="False-positive rate of --dedupe bloom (between 0 and 1).",
+        ),
+    ] = 0.001,
+    stats: Annotated[
+        bool,
+        typer.Option(
+            "--stats",
+            help="Print aggregate statistics (status counts, blocked ratio "
+            "by TLD and domain, latency, errors) after the scan.",
+        ),
+    ] = False,
+    memtrace: Annotated[
+        bool,
+        typer.Option(
+            "--memtrace",
+            help="Trace memory allocations and report the peak, the top "
+            "allocation sites and the memory per domain (slows the scan).",
+        ),
+    ] = False,
+    sink: Annotated[
+        list[str] | None,
+        typer.Option(
+            "--sink",
+            help="Also write every result to a sink: jsonl:PATH, sqlite:PATH, "
+            "an http(s):// webhook URL or stdout. May be repeated.",
+            show_default=False,
+        ),
+    ] = None,
+    resolvers: Annotated[
+        str | None,
+        typer.Option(
+            "--resolver",
+            help="Comma-separated test resolvers for --control "
+            "(default: the system's resolvers).",
+            show_default=False,
+        ),
+    ] = None,
+    control: Annotated[
+        str | None,
+        typer.Option(
+            "--control",
+            help="Comma-separated control resolvers; answers from the test "
+            "resolvers that disagree with them are reported as tampered.",
+            show_default=False,
+        ),
+    ] = None,
+) -> None:
+    """Check filtering status from a [green]domain file[/green].
+
+    The file should contain one domain name per line.
+    Lines starting with # are treated as comments and ignored.
+    Empty lines are also ignored. An optional numeric second column
+    (e.g. [italic]example.com,10[/italic]) sets the domain's priority.
+    Compressed files are decompressed on the fly, and [cyan]-[/cyan] reads
+    the list from standard input.
+
+    With [cyan]--journal[/cyan], completed results are appended to a JSON
+    Lines file in batches, and [cyan]--resume[/cyan] continues an
+    interrupted scan from that journal.
+
+    With [cyan]--deadline[/cyan], the most important domains are checked
+    first: higher priorities, then domains whose status recently changed
+    or that were blocked according to the journal.
+
+    With [cyan]--control[/cyan], answers are compared with trusted
+    control resolvers and disagreements are reported as tampered.
+
+    With [cyan]--dedupe[/cyan], repeated domains are checked once, using
+    a fixed amount of memory however long the list is.
+
+    Examples:
+        check-filter file domains.txt
+        check-filter file /path/to/my_domains.txt
+        check-filter file domains.txt --journal scan.jsonl --resume
+        check-filter file domains.txt --journal scan.jsonl --deadline 600
+        zcat feed.txt.gz | check-filter file -
+        check-filter file feed.txt --dedupe bloom
+        check-filter file sample.txt --memtrace
+        check-filter file domains.txt --sink sqlite:scan.db --sink stdout
+    """
+    if resume and journal is None:
+        console.print("[red]--resume requires --journal.[/red]")
+        raise typer.Exit(code=1)
+    if dedupe is not None and dedupe not in ("exact", "bloom"):
+        console.print("[red]--dedupe must be 'exact' or 'bloom'.[/red]")
+        raise typer.Exit(code=1)
+    if not 0 < dedupe_error_rate < 1:
+        console.print("[red]--dedupe-error-rate must be between 0 and 1.[/red]")
         raise typer.Exit(code=1)
 
-    valid, invalid = utils.validate_domains(domain_names)
-    _handle_validation_errors(invalid)
+    with _human_output(sink):
+        source = "standard input" if path == "-" else path
+        rich_print(
+            f"[yellow]Reading domains from [italic]{source}[/italic] ...[/yellow]"
+        )
+
+        tracer = _memory_tracer(memtrace)
+        valid, invalid, priorities = _read_domain_file(path, dedupe, dedupe_error_rate)
+
+        rich_print(
+            f"[yellow]Checking {len(valid) + len(invalid)} domain(s) ...[/yellow]"
+        )
+
+        _handle_validation_errors(invalid)
+
+        scheduler = _scheduler(priorities, deadline, journal)
+        scan_stats = _scan_stats(stats)
+        checker = _differential_checker(resolvers, control)
+        sinks = _sinks(sink)
+
+        if journal is not None and resume:
+            from check_filter.journal import CompletedIndex
+
+            completed = CompletedIndex.from_journal(journal)
+            valid = [d for d in valid if d not in completed]
+            rich_print(
+                f"[yellow]Resuming: {len(completed)} domain(s) already in journal, "
+                f"{len(valid)} remaining ...[/yellow]"
+            )
+            if not valid:
+                _report_memory(tracer, [])
+                return
+
+        with _scan_journal(journal) as scan_journal:
+            results = _run_scan(
+                valid,
+                sinks,
+                checker=checker,
+                journal=scan_journal,
+                time_budget=deadline,
+                scheduler=scheduler,
+                stats=scan_stats,
+            )
+        _report_scan(results, scan_stats, tracer)
+
+
+@app.command(epilog=__epilog__)
+def recheck(
+    journal: Annotated[
+        Path,
+        typer.Argument(
+            help="Journal of a previous scan (written with --journal)",
+            exists=True,
+            file_okay=True,
+            dir_okay=False,
+            readable=True,
+            resolve_path=True,
+            show_default=False,
+        ),
+    ],
+    *,
+    max_age: Annotated[
+        float,
+        typer.Option(
+            "--max-age",
+            help="Recheck results older than this many seconds.",
+            min=0,
+        ),
+    ] = 86400,
+    use_ttl: Annotated[
+        bool,
+        typer.Option(
+            "--use-ttl",
+            help="Use each answer's recorded TTL instead of --max-age.",
+        ),
+    ] = False,
+    budget: Annotated[
+        float | None,
+        typer.Option(
+            "--budget",
+            help="Stop rechecking after this many seconds.",
+            min=0,
+        ),
+    ] = None,
+) -> None:
+    """[green]Incrementally recheck[/green] a previous scan.
 
-    asyncio.run(utils.print_result(valid))
+    Only domains whose previous result has expired, or that were Error or
+    Unknown, are queried again. Fresh results are appended to the journal
+    and only domains whose status changed are printed.
+
+    Examples:
+        check-filter recheck scan.jsonl
+        check-filter recheck scan.jsonl --max-age 3600 --budget 600
+    """
+    import asyncio
+
+    from check_filter.check import get_default_checker
+    from check_filter.incremental import load_previous
+    from check_filter.journal import ScanJournal
+
+    previous = load_previous(journal)
+    if not previous:
+        console.print("[red]No results found in the journal![/red]")
+        raise typer.Exit(code=1)
+
+    rich_print(f"[yellow]Rechecking {len(previous)} known domain(s) ...[/yellow]")
+
+    with ScanJournal(journal) as scan_journal:
+        transitions = asyncio.run(
+            get_default_checker().arecheck(
+                previous,
+                max_age=max_age,
+                use_ttl=use_ttl,
+                time_budget=budget,
+                journal=scan_journal,
+            )
+        )
+
+    if not transitions:
+        rich_print("[green]No status changes.[/green]")
+        return
+
+    for change in transitions:
+        rich_print(
+            f"{change.domain}: {change.previous.value} -> [bold]{change.current.value}[/bold]"
+        )
 
 
 @app.command(epilog=__epilog__)
-def file(
+def watch(
     path: Annotated[
         Path,
         typer.Argument(
@@ -116,41 +776,252 @@ def file(
             show_default=False,
         ),
     ],
+    *,
+    interval: Annotated[
+        float,
+        typer.Option(
+            "--interval",
+            "-i",
+            help="Seconds between two checks of the same domain.",
+            min=1,
+        ),
+    ] = 300.0,
+    jitter: Annotated[
+        float,
+        typer.Option(
+            "--jitter",
+            help="Random shift of each check, as a fraction of its slot.",
+            min=0,
+            max=1,
+        ),
+    ] = 0.5,
+    refresh_ahead: Annotated[
+        float,
+        typer.Option(
+            "--refresh-ahead",
+            help="Refresh hot entries after this fraction of their TTL (0 = off).",
+            min=0,
+            max=0.99,
+        ),
+    ] = 0.8,
 ) -> None:
-    """Check filtering status from a [green]domain file[/green].
+    """[green]Watch[/green] a domain file and report status changes.
 
-    The file should contain one domain name per line.
-    Lines starting with # are treated as comments and ignored.
-    Empty lines are also ignored.
+    Checks are spread evenly across the interval instead of bursting the
+    whole list at once. Only domains whose status changes are printed.
+    Results are cached for their DNS TTL, and entries checked repeatedly
+    are refreshed in the background before they expire.
+    Press Ctrl+C to stop.
 
     Examples:
-        check-filter file domains.txt
-        check-filter file /path/to/my_domains.txt
+        check-filter watch domains.txt
+        check-filter watch domains.txt --interval 600 --jitter 0.2
     """
-    rich_print(f"[yellow]Reading domains from [italic]{path}[/italic] ...[/yellow]")
+    utils = _utils()
 
-    try:
-        domain_names: list[str] = utils.read_domains_from_file(str(path))
-    except FileNotFoundError:
-        console.print(f"[red]File not found: {path}[/red]")
-        raise typer.Exit(code=1) from None
-    except PermissionError:
-        console.print(f"[red]Permission denied: {path}[/red]")
-        raise typer.Exit(code=1) from None
-    except Exception as e:
-        console.print(f"[red]Error reading file: {e}[/red]")
-        raise typer.Exit(code=1) from None
+    import asyncio
+
+    from check_filter.cache import ResultCache
+    from check_filter.check import DomainChecker
+    from check_filter.watch import DomainWatcher
+
+    domain_names = utils.read_domains_from_file(str(path))
+    valid, invalid = utils.validate_domains(domain_names)
+    _handle_validation_errors(invalid)
 
-    if not domain_names:
+    if not valid:
         console.print("[red]No domains found in the file![/red]")
         raise typer.Exit(code=1)
 
-    rich_print(f"[yellow]Checking {len(domain_names)} domain(s) ...[/yellow]")
+    checker = DomainChecker(cache=ResultCache(refresh_ahead=refresh_ahead or None))
+    watcher = DomainWatcher(checker, valid, interval=interval, jitter=jitter)
+    rich_print(
+        f"[yellow]Watching {len(watcher.domains)} domain(s), one check every "
+        f"{watcher.slot:.2f}s ...[/yellow]"
+    )
 
-    valid, invalid = utils.validate_domains(domain_names)
-    _handle_validation_errors(invalid)
+    async def _watch() -> None:
+        async with checker:
+            async for change in watcher.watch():
+                rich_print(
+                    f"[dim]{time.strftime('%Y-%m-%d %H:%M:%S')}[/dim] "
+                    f"{change.domain}: {change.previous.value} -> "
+                    f"[bold]{change.current.value}[/bold]"
+                )
+
+    asyncio.run(_watch())
+
+
+def _print_domain_history(
+    store: HistoryStore, domain_name: str, wanted: FilterStatus | None, limit: int
+) -> None:
+    """Print a domain's latest status, when it became ``wanted`` and its changes."""
+    utils = _utils()
+
+    state = store.latest(domain_name.lower())
+    if state is None:
+        console.print(f"[red]No history for {domain_name}![/red]")
+        raise typer.Exit(code=1)
+    utils.print_domain_state(state)
+    if wanted is not None:
+        became = store.became(state.domain, wanted)
+        rich_print(
+            f"Became {wanted.value}: "
+            f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(became))}"
+            if became is not None
+            else f"Never seen {wanted.value}."
+        )
+    utils.print_changes(store.timeline(state.domain, limit=limit))
+
+
+@app.command(epilog=__epilog__)
+def history(
+    database: Annotated[
+        Path,
+        typer.Argument(
+            help="History database (written with --sink sqlite:PATH)",
+            file_okay=True,
+            dir_okay=False,
+            resolve_path=True,
+            show_default=False,
+        ),
+    ],
+    domain_name: Annotated[
+        str | None,
+        typer.Argument(
+            metavar="DOMAIN",
+            help="Show the history of this domain.",
+            show_default=False,
+        ),
+    ] = None,
+    *,
+    changed: Annotated[
+        str | None,
+        typer.Option(
+            "--changed",
+            help="List status changes within this period (e.g. 30m, 24h, 7d).",
+            show_default=False,
+        ),
+    ] = None,
+    status: Annotated[
+        str | None,
+        typer.Option(
+            "--status",
+            help="Only consider changes to this status (e.g. blocked).",
+            show_default=False,
+        ),
+    ] = None,
+    limit: Annotated[
+        int,
+        typer.Option("--limit", "-n", help="Maximum number of changes shown.", min=1),
+    ] = 100,
+) -> None:
+    """Query the [green]result history[/green] of previous scans.
+
+    Without further arguments, shows how many domains are in each status.
+    With a DOMAIN, shows its latest status and when it changed; with
+    --changed, lists the domains whose status changed recently.
+
+    Examples:
+        check-filter history results.db
+        check-filter history results.db github.com --status blocked
+        check-filter history results.db --changed 24h --status blocked
+    """
+    utils = _utils()
+
+    import sqlite3
+
+    from check_filter.check import FilterStatus
+    from check_filter.history import HistoryStore, parse_duration
+
+    try:
+        wanted = FilterStatus(status.lower()) if status else None
+        since = time.time() - parse_duration(changed) if changed else None
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(code=1) from e
+
+    try:
+        with HistoryStore(database, readonly=True) as store:
+            if domain_name is not None:
+                _print_domain_history(store, domain_name, wanted, limit)
+            elif since is not None:
+                utils.print_changes(
+                    store.changed_since(since, status=wanted, limit=limit),
+                    title=f"Status Changes in the Last {changed}",
+                )
+            else:
+                utils.print_history_summary(store.status_counts())
+    except sqlite3.Error as e:
+        console.print(f"[red]Cannot read history from {database}: {e}[/red]")
+        raise typer.Exit(code=1) from e
+
+
+@app.command(epilog=__epilog__)
+def serve(
+    *,
+    host: Annotated[
+        str,
+        typer.Option("--host", help="Address to listen on."),
+    ] = "127.0.0.1",
+    port: Annotated[
+        int,
+        typer.Option("--port", "-p", help="TCP port to listen on.", min=0),
+    ] = 8053,
+    cache_size: Annotated[
+        int,
+        typer.Option("--cache-size", help="Maximum number of cached results.", min=1),
+    ] = 100_000,
+    refresh_ahead: Annotated[
+        float,
+        typer.Option(
+            "--refresh-ahead",
+            help="Refresh hot entries after this fraction of their TTL (0 = off).",
+            min=0,
+            max=0.99,
+        ),
+    ] = 0.8,
+) -> None:
+    """Run a local [green]HTTP/JSON service[/green].
+
+    One checker, resolver and result cache serve every client, and
+    concurrent requests for the same domain share a single DNS query.
+    Frequently requested entries are refreshed in the background before
+    they expire.
+
+    Endpoints:
+        GET  /check?domain=NAME   check one domain
+        POST /check               check a batch, streamed back as NDJSON
+        GET  /health              liveness, check and cache statistics
+
+    Examples:
+        check-filter serve
+        check-filter serve --host 0.0.0.0 --port 8080
+    """
+    import asyncio
+
+    from check_filter.cache import ResultCache
+    from check_filter.check import DomainChecker
+    from check_filter.server import CheckServer
+
+    server = CheckServer(
+        DomainChecker(
+            cache=ResultCache(
+                max_entries=cache_size, refresh_ahead=refresh_ahead or None
+            )
+        ),
+        host=host,
+        port=port,
+    )
+
+    async def _serve() -> None:
+        await server.start()
+        rich_print(
+            f"[green]Serving on [bold]http://{host}:{server.port}[/bold][/green]"
+        )
+        await server.serve_forever()
 
-    asyncio.run(utils.print_result(valid))
+    asyncio.run(_serve())
 
 
 @app.callback(invoke_without_command=True)
@@ -0,0 +1,294 @@
+"""Memory-bounded deduplication of streaming domain inputs.
+
+Deduplicating a feed of hundreds of millions of lines with a ``set``
+needs gigabytes of memory. The deduplicators in this module filter a
+stream of domains lazily, in input order, with a fixed memory budget:
+
+* :class:`ExactDeduplicator` remembers every domain in a temporary SQLite
+  database whose page cache is capped; pages beyond the cap spill to a
+  temporary file that is deleted on close. No unique domain is ever lost.
+* :class:`BloomDeduplicator` uses a Bloom filter sized for an expected
+  number of domains and a false-positive rate. It never writes to disk,
+  but a small fraction of unique domains (about ``error_rate``) is
+  wrongly skipped as a duplicate.
+
+Both count the duplicates they skip in :attr:`stats`.
+
+Example:
+    >>> with ExactDeduplicator() as dedupe:
+    ...     async for result in checker.acheck_iter(dedupe.filter(domains)):
+    ...         print(result.domain, result.status.value)
+    >>> print(dedupe.stats.duplicates)
+"""
+
+from __future__ import annotations
+
+import abc
+import hashlib
+import logging
+import math
+import sqlite3
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from types import TracebackType
+
+logger = logging.getLogger(__name__)
+
+# Deduplication modes accepted by make_deduplicator
+MODES = ("exact", "bloom")
+
+# Default memory budget of the exact deduplicator's page cache (bytes)
+DEFAULT_MAX_MEMORY = 64 << 20
+
+# Default number of distinct domains a Bloom filter is sized for
+DEFAULT_CAPACITY = 10_000_000
+
+# Default Bloom filter false-positive rate
+DEFAULT_ERROR_RATE = 0.001
+
+# Number of inserts between commits of the exact deduplicator's database
+_COMMIT_INTERVAL = 10_000
+
+
+@dataclass
+class DedupeStats:
+    """Counters describing a deduplicator's work.
+
+    Attributes:
+        unique: Domains passed through.
+        duplicates: Domains skipped as already seen.
+    """
+
+    unique: int = 0
+    duplicates: int = 0
+
+
+class _Deduplicator(abc.ABC):
+    """Shared streaming interface of the deduplicators."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.stats = DedupeStats()
+
+    @abc.abstractmethod
+    def _add(self, domain: str) -> bool:
+        """Remember a domain; return True if it was not seen before."""
+
+    def add(self, domain: str) -> bool:
+        """Remember a domain and count it.
+
+        Args:
+            domain: Normalized domain name.
+
+        Returns:
+            True if the domain is new, False if it is a duplicate.
+        """
+        if self._add(domain):
+            self.stats.unique += 1
+            return True
+        self.stats.duplicates += 1
+        return False
+
+    def filter(self, domains: Iterable[str]) -> Iterator[str]:
+        """Yield the first occurrence of every domain, in input order.
+
+        Args:
+            domains: Normalized domain names.
+
+        Yields:
+            Domains not seen before.
+        """
+        add = self.add
+        for domain in domains:
+            if add(domain):
+                yield domain
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        """Release the resources held by the deduplicator."""
+
+    def __enter__(self) -> _Deduplicator:
+        """Return the deduplicator for use in a ``with`` block."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close the deduplicator."""
+        self.close()
+
+
+class ExactDeduplicator(_Deduplicator):
+    """Exact deduplicator backed by a temporary on-disk SQLite database.
+
+    The database lives in the system temporary directory (honouring
+    ``TMPDIR``) and is deleted when the deduplicator is closed.
+    """
+
+    def __init__(self, max_memory: int = DEFAULT_MAX_MEMORY) -> None:
+        """Initialize the deduplicator.
+
+        Args:
+            max_memory: Upper bound for the database page cache in bytes.
+                Seen domains beyond this are spilled to disk.
+        """
+        if max_memory < 1:
+            raise ValueError("max_memory must be at least 1")
+        super().__init__()
+
+        # An empty file name gives a private temporary database on disk.
+        self._db = sqlite3.connect("")
+        self._db.execute(f"PRAGMA cache_size = -{max(max_memory >> 10, 1)}")
+        self._db.execute("PRAGMA journal_mode = OFF")
+        self._db.execute("PRAGMA synchronous = OFF")
+        self._db.execute("CREATE TABLE seen (domain TEXT PRIMARY KEY) WITHOUT ROWID")
+        self._cursor = self._db.cursor()
+        self._pending = 0
+
+    def _add(self, domain: str) -> bool:
+        """Insert a domain unless it is already in the database."""
+        self._cursor.execute("INSERT OR IGNORE INTO seen VALUES (?)", (domain,))
+        self._pending += 1
+        if self._pending >= _COMMIT_INTERVAL:
+            self._db.commit()
+            self._pending = 0
+        return self._cursor.rowcount == 1
+
+    def close(self) -> None:
+        """Close and delete the temporary database."""
+        self._db.close()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter of strings.
+
+    Bit positions are derived from one BLAKE2b digest per item by double
+    hashing, so adding an item costs a single hash computation.
+    """
+
+    def __init__(
+        self, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE
+    ) -> None:
+        """Initialize an empty filter.
+
+        Args:
+            capacity: Number of distinct items the filter is sized for.
+                The false-positive rate rises above ``error_rate`` once
+                more items are added.
+            error_rate: Target false-positive rate at ``capacity`` items.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory used by the bit array in bytes."""
+        return len(self._bits)
+
+    def _positions(self, item: str) -> Iterator[int]:
+        """Yield the bit positions of an item."""
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        size = self.size
+        for index in range(self.hashes):
+            yield (first + index * step) % size
+
+    def __contains__(self, item: str) -> bool:
+        """Return True if the item may have been added."""
+        bits = self._bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+    def add(self, item: str) -> bool:
+        """Add an item.
+
+        Returns:
+            True if the item was definitely not in the filter before.
+        """
+        bits = self._bits
+        new = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+            if self.count == self.capacity + 1:
+                logger.warning(
+                    "Bloom filter exceeded its capacity of %d; the "
+                    "false-positive rate is now above %g",
+                    self.capacity,
+                    self.error_rate,
+                )
+        return new
+
+
+class BloomDeduplicator(_Deduplicator):
+    """Probabilistic deduplicator using a fixed-size Bloom filter.
+
+    Memory use is fixed at about ``1.44 * log2(1 / error_rate)`` bits per
+    domain of capacity (roughly 18 MiB for ten million domains at 0.1%).
+    """
+
+    def __init__(
+        self, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE
+    ) -> None:
+        """Initialize the deduplicator.
+
+        Args:
+            capacity: Expected number of distinct domains.
+            error_rate: Fraction of unique domains that may be wrongly
+                skipped as duplicates.
+        """
+        super().__init__()
+        self.bloom = BloomFilter(capacity, error_rate)
+
+    def _add(self, domain: str) -> bool:
+        """Add a domain to the filter."""
+        return self.bloom.add(domain)
+
+    def close(self) -> None:
+        """Do nothing; the filter is held in memory only."""
+
+
+def make_deduplicator(
+    mode: str,
+    max_memory: int = DEFAULT_MAX_MEMORY,
+    capacity: int = DEFAULT_CAPACITY,
+    error_rate: float = DEFAULT_ERROR_RATE,
+) -> ExactDeduplicator | BloomDeduplicator:
+    """Create a deduplicator by mode name.
+
+    Args:
+        mode: ``"exact"`` or ``"bloom"``.
+        max_memory: Page cache budget of the exact mode in bytes.
+        capacity: Expected distinct domains for the Bloom mode.
+        error_rate: False-positive rate of the Bloom mode.
+
+    Returns:
+        A new deduplicator.
+
+    Raises:
+        ValueError: If the mode is unknown.
+    """
+    if mode == "exact":
+        return ExactDeduplicator(max_memory=max_memory)
+    if mode == "bloom":
+        return BloomDeduplicator(capacity=capacity, error_rate=error_rate)
+    raise ValueError(f"Unknown dedupe mode {mode!r}; expected one of {MODES}")
@@ -0,0 +1,214 @@
+"""Differential comparison of test and control resolvers.
+
+Matching answers against known blocking IPs misses resolvers that tamper
+with answers in other ways: a different sinkhole address, a forged
+NXDOMAIN, or the address of a transparent proxy. :class:`DifferentialChecker`
+asks a set of *test* resolvers (for example the ISP's) and a set of
+*control* resolvers (for example a public resolver reached over an
+untampered path) for every domain and reports disagreement as
+:attr:`~check_filter.check.FilterStatus.TAMPERED`.
+
+All resolvers of both sets are queried concurrently, so a check costs
+about the latency of the slowest resolver rather than the sum.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from dns import asyncresolver
+
+from check_filter.check import CheckResult, DomainChecker, FilterStatus
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+logger = logging.getLogger(__name__)
+
+# Prefix lengths within which two addresses count as the same network
+# (answers from one CDN often differ only in the last octets)
+IPV4_PREFIX = 24
+IPV6_PREFIX = 48
+
+# Negative answer classes a tampering resolver may forge
+_DENIALS = frozenset({"nxdomain", "no_answer"})
+
+
+@dataclass(frozen=True)
+class ComparisonResult(CheckResult):
+    """Result of a differential check.
+
+    ``ips`` holds the test resolvers' answers. ``ttl``, ``error`` and
+    ``error_class`` describe the test side as for a regular check.
+
+    Attributes:
+        control_ips: Addresses returned by the control resolvers.
+        control_error_class: Failure class of the control side when no
+            control resolver answered, None otherwise.
+    """
+
+    control_ips: frozenset[str] = field(default_factory=frozenset)
+    control_error_class: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the result to a JSON-serializable dictionary."""
+        data = super().to_dict()
+        data["control_ips"] = sorted(self.control_ips)
+        data["control_error_class"] = self.control_error_class
+        return data
+
+
+def _network(address: str) -> ipaddress.IPv4Network | ipaddress.IPv6Network:
+    """Return the network an address belongs to for comparison."""
+    ip = ipaddress.ip_address(address)
+    prefix = IPV4_PREFIX if ip.version == 4 else IPV6_PREFIX
+    return ipaddress.ip_network(f"{ip}/{prefix}", strict=False)
+
+
+def answers_agree(test: frozenset[str], control: frozenset[str]) -> bool:
+    """Return True if two answer sets plausibly describe the same host.
+
+    They agree when they share an address or a network (see
+    ``IPV4_PREFIX`` and ``IPV6_PREFIX``).
+
+    Args:
+        test: Addresses from a test resolver.
+        control: Addresses from the control resolvers.
+    """
+    if test & control:
+        return True
+    return not {_network(ip) for ip in test}.isdisjoint(_network(ip) for ip in control)
+
+
+def system_nameservers() -> list[str]:
+    """Return the nameservers configured for this host (resolv.conf)."""
+    return [str(nameserver) for nameserver in asyncresolver.Resolver().nameservers]
+
+
+class DifferentialChecker(DomainChecker):
+    """Checks domains by comparing test resolvers with control resolvers.
+
+    A domain is:
+
+    * BLOCKED if a test resolver returns a known blocking IP;
+    * TAMPERED if a test resolver's answer disagrees with the control
+      answer, or a test resolver denies a name the control resolves;
+    * otherwise classified from the test answers like a regular check.
+
+    When no control resolver answers, nothing can be compared and the
+    test answers alone decide. Everything else (caching, single-flight,
+    retries, time budgets, the sync API) works as for DomainChecker.
+
+    Example:
+        >>> checker = DifferentialChecker(
+        ...     test_nameservers=["10.0.0.1", "10.0.0.2"],
+        ...     control_nameservers=["9.9.9.9"],
+        ... )
+        >>> result = await checker.acheck("example.com")
+        >>> print(result.status.value, result.ips, result.control_ips)
+    """
+
+    def __init__(
+        self,
+        test_nameservers: Sequence[str],
+        control_nameservers: Sequence[str],
+        timeout: float = 5.0,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the checker.
+
+        Args:
+            test_nameservers: Resolvers suspected of tampering.
+            control_nameservers: Trusted resolvers to compare against.
+            timeout: DNS query timeout in seconds.
+            **kwargs: Further DomainChecker options (``blocked_ips``,
+                ``cache``, ``dual_stack``, ...). ``nameservers`` and
+                ``transport`` are not supported.
+        """
+        if not test_nameservers or not control_nameservers:
+            raise ValueError("test and control nameservers must not be empty")
+        if "nameservers" in kwargs or "transport" in kwargs:
+            raise TypeError("DifferentialChecker takes no nameservers or transport")
+
+        super().__init__(nameservers=list(test_nameservers), timeout=timeout, **kwargs)
+        self.test_resolvers = [self._single(ns, timeout) for ns in test_nameservers]
+        self.control_resolvers = [
+            self._single(ns, timeout) for ns in control_nameservers
+        ]
+
+    @staticmethod
+    def _single(nameserver: str, timeout: float) -> asyncresolver.Resolver:
+        """Create a resolver that queries one nameserver."""
+        single = asyncresolver.Resolver(configure=False)
+        single.nameservers = [nameserver]
+        single.lifetime = timeout
+        return single
+
+    async def _resolve(self, domain: str, dns_resolver: Any = None) -> ComparisonResult:
+        """Query every test and control resolver concurrently and compare.
+
+        Args:
+            domain: Domain name to resolve.
+            dns_resolver: Resolver to test instead of the test resolvers;
+                its answers are still compared against the control
+                resolvers.
+        """
+        resolve = super()._resolve
+        test = self.test_resolvers if dns_resolver is None else [dns_resolver]
+        results = await asyncio.gather(
+            *(resolve(domain, r) for r in test + self.control_resolvers)
+        )
+        split = len(test)
+        return self._compare(domain, results[:split], results[split:])
+
+    def _compare(
+        self,
+        domain: str,
+        test: Sequence[CheckResult],
+        control: Sequence[CheckResult],
+    ) -> ComparisonResult:
+        """Classify a domain from its test and control answers."""
+        test_ips = frozenset().union(*(r.ips for r in test))
+        control_ips = frozenset().union(*(r.ips for r in control))
+        merged = self._merge_families(domain, test)
+        control_error = None if control_ips else self._merge_families(domain, control)
+
+        status = merged.status
+        error, error_class = merged.error, merged.error_class
+        if test_ips & self.blocked_ips:
+            status = FilterStatus.BLOCKED
+        elif control_ips:
+            answered = [r for r in test if r.ips]
+            denied = [r for r in test if r.error_class in _DENIALS]
+            if any(not answers_agree(r.ips, control_ips) for r in answered):
+                status = FilterStatus.TAMPERED
+                error, error_class = None, None
+            elif denied:
+                status = FilterStatus.TAMPERED
+                error = f"Denied by a test resolver: {denied[0].error}"
+                error_class = denied[0].error_class
+
+        if status is FilterStatus.TAMPERED:
+            logger.info(
+                "Answers for %s disagree: test %s, control %s",
+                domain,
+                sorted(test_ips),
+                sorted(control_ips),
+            )
+
+        return ComparisonResult(
+            domain=domain,
+            status=status,
+            ips=test_ips,
+            error=error,
+            ttl=merged.ttl,
+            error_class=error_class,
+            control_ips=control_ips,
+            control_error_class=(
+                control_error.error_class if control_error is not None else None
+            ),
+        )
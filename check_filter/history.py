@@ -0,0 +1,377 @@
+"""Indexed SQLite history of scan results.
+
+:class:`HistoryStore` keeps every result in a SQLite database so it
+survives the terminal. Writes are batched into one transaction each, and
+the database runs in WAL mode so queries can run while a scan writes.
+
+Besides the raw ``results`` table (indexed on ``(domain, checked_at)``
+and ``status``), the store maintains two small tables as results arrive:
+
+* ``latest`` holds the last conclusive status of every domain;
+* ``changes`` logs every status transition with its time.
+
+Questions like "when did X become blocked" or "which domains changed in
+the last 24 hours" are answered from ``changes`` through its indexes, so
+they stay fast however many results have been stored. As in
+:mod:`check_filter.incremental`, ERROR and UNCHECKED results say nothing
+about filtering: they are stored but never count as a change. UNCHECKED
+results are not stored at all.
+
+Example:
+    >>> with HistoryStore("history.db") as store:
+    ...     store.add_many(results)
+    ...     print(store.became("example.com", FilterStatus.BLOCKED))
+    ...     print(store.changed_since(time.time() - 86400))
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import sqlite3
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from check_filter.check import FilterStatus
+from check_filter.journal import result_record
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from types import TracebackType
+
+    from check_filter.check import CheckResult
+
+logger = logging.getLogger(__name__)
+
+# Default number of rows returned by queries
+DEFAULT_LIMIT = 100
+
+# Statuses that carry no information about filtering
+_INCONCLUSIVE = frozenset({FilterStatus.ERROR, FilterStatus.UNCHECKED})
+
+# Maximum number of bound parameters per lookup query
+_LOOKUP_CHUNK = 500
+
+# Duration suffixes accepted by parse_duration, in seconds
+_DURATION_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+_DURATION = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*$", re.IGNORECASE)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS results (
+        domain TEXT NOT NULL,
+        status TEXT NOT NULL,
+        ips TEXT NOT NULL,
+        error TEXT,
+        error_class TEXT,
+        ttl INTEGER,
+        elapsed REAL,
+        checked_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS results_domain_time ON results (domain, checked_at)",
+    "CREATE INDEX IF NOT EXISTS results_status ON results (status)",
+    """
+    CREATE TABLE IF NOT EXISTS latest (
+        domain TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        checked_at REAL NOT NULL,
+        changed_at REAL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS changes (
+        domain TEXT NOT NULL,
+        previous TEXT,
+        current TEXT NOT NULL,
+        changed_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS changes_time ON changes (changed_at)",
+    "CREATE INDEX IF NOT EXISTS changes_domain_time ON changes (domain, changed_at)",
+)
+
+
+def parse_duration(text: str) -> float:
+    """Parse a duration such as ``90``, ``30m``, ``24h`` or ``7d``.
+
+    Args:
+        text: A number with an optional unit (s, m, h, d or w).
+
+    Returns:
+        The duration in seconds.
+
+    Raises:
+        ValueError: If the text is not a duration.
+    """
+    match = _DURATION.match(text)
+    if match is None:
+        raise ValueError(f"Invalid duration {text!r}; expected e.g. 90, 30m, 24h or 7d")
+    return float(match.group(1)) * _DURATION_UNITS[match.group(2).lower()]
+
+
+@dataclass(frozen=True)
+class StatusChange:
+    """A recorded status transition of a domain.
+
+    Attributes:
+        domain: The domain that changed.
+        previous: Conclusive status before the change, or None for the
+            first conclusive result of the domain.
+        current: Status after the change.
+        changed_at: Unix timestamp of the check that saw the change.
+    """
+
+    domain: str
+    previous: FilterStatus | None
+    current: FilterStatus
+    changed_at: float
+
+
+@dataclass(frozen=True)
+class DomainState:
+    """The latest conclusive status of a domain.
+
+    Attributes:
+        domain: The domain.
+        status: Its last conclusive status.
+        checked_at: Unix timestamp of that check.
+        changed_at: Unix timestamp of the last change, if it ever changed.
+    """
+
+    domain: str
+    status: FilterStatus
+    checked_at: float
+    changed_at: float | None
+
+
+class HistoryStore:
+    """SQLite store of scan results with a status change log.
+
+    The connection may be used from any thread, but only by one thread
+    at a time.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], readonly: bool = False) -> None:
+        """Open (or create) the store.
+
+        Args:
+            path: Path of the database file.
+            readonly: Open an existing database for queries only.
+
+        Raises:
+            sqlite3.DatabaseError: If a read-only database is missing or is
+                not a history database.
+        """
+        self.path = os.fspath(path)
+        self.readonly = readonly
+        if readonly:
+            uri = f"file:{self.path}?mode=ro"
+            self._db = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            try:
+                # A file that is not a history database only fails on use.
+                self._db.execute("SELECT 1 FROM latest LIMIT 1").fetchone()
+            except sqlite3.Error:
+                self._db.close()
+                raise
+            return
+
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        with self._db:
+            for statement in _SCHEMA:
+                self._db.execute(statement)
+
+    def _known(self, domains: Iterable[str]) -> dict[str, FilterStatus]:
+        """Return the latest conclusive status of the given domains."""
+        pending = list(domains)
+        known: dict[str, FilterStatus] = {}
+        for start in range(0, len(pending), _LOOKUP_CHUNK):
+            chunk = pending[start : start + _LOOKUP_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            for domain, status in self._db.execute(
+                f"SELECT domain, status FROM latest WHERE domain IN ({marks})", chunk
+            ):
+                known[domain] = FilterStatus(status)
+        return known
+
+    def add_many(self, results: Iterable[CheckResult]) -> int:
+        """Store a batch of results in one transaction.
+
+        Args:
+            results: Results to store; UNCHECKED ones are skipped.
+
+        Returns:
+            Number of status changes recorded.
+        """
+        rows: list[tuple[Any, ...]] = []
+        observed: list[tuple[str, FilterStatus, float]] = []
+        for result in results:
+            if result.status is FilterStatus.UNCHECKED:
+                continue
+            record = result_record(result)
+            rows.append(
+                (
+                    record["domain"],
+                    record["status"],
+                    json.dumps(record["ips"]),
+                    record["error"],
+                    record["error_class"],
+                    record["ttl"],
+                    record["elapsed"],
+                    record["checked_at"],
+                )
+            )
+            if result.status not in _INCONCLUSIVE:
+                observed.append((result.domain, result.status, record["checked_at"]))
+
+        known = self._known({domain for domain, _, _ in observed})
+        changes: list[tuple[Any, ...]] = []
+        latest: dict[str, tuple[Any, ...]] = {}
+        for domain, status, checked_at in observed:
+            before = known.get(domain)
+            changed_at = None
+            if before is not status:
+                changes.append(
+                    (domain, before.value if before else None, status.value, checked_at)
+                )
+                if before is not None:
+                    changed_at = checked_at
+            known[domain] = status
+            previous_change = latest.get(domain, (None,) * 4)[3]
+            latest[domain] = (
+                domain,
+                status.value,
+                checked_at,
+                changed_at or previous_change,
+            )
+
+        with self._db:
+            self._db.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._db.executemany("INSERT INTO changes VALUES (?, ?, ?, ?)", changes)
+            self._db.executemany(
+                "INSERT INTO latest VALUES (?, ?, ?, ?) ON CONFLICT (domain) DO UPDATE "
+                "SET status = excluded.status, checked_at = excluded.checked_at, "
+                "changed_at = COALESCE(excluded.changed_at, latest.changed_at)",
+                list(latest.values()),
+            )
+        logger.debug("Stored %d result(s) and %d change(s)", len(rows), len(changes))
+        return len(changes)
+
+    def add(self, result: CheckResult) -> int:
+        """Store one result; see :meth:`add_many`."""
+        return self.add_many([result])
+
+    @staticmethod
+    def _change(row: tuple[Any, ...]) -> StatusChange:
+        """Build a StatusChange from a ``changes`` row."""
+        domain, previous, current, changed_at = row
+        return StatusChange(
+            domain=domain,
+            previous=FilterStatus(previous) if previous is not None else None,
+            current=FilterStatus(current),
+            changed_at=changed_at,
+        )
+
+    def latest(self, domain: str) -> DomainState | None:
+        """Return the latest conclusive status of a domain, if known."""
+        row = self._db.execute(
+            "SELECT domain, status, checked_at, changed_at FROM latest WHERE domain = ?",
+            (domain,),
+        ).fetchone()
+        if row is None:
+            return None
+        return DomainState(row[0], FilterStatus(row[1]), row[2], row[3])
+
+    def timeline(self, domain: str, limit: int = DEFAULT_LIMIT) -> list[StatusChange]:
+        """Return the status changes of a domain, newest first."""
+        rows = self._db.execute(
+            "SELECT domain, previous, current, changed_at FROM changes "
+            "WHERE domain = ? ORDER BY changed_at DESC LIMIT ?",
+            (domain, limit),
+        )
+        return [self._change(row) for row in rows]
+
+    def became(self, domain: str, status: FilterStatus) -> float | None:
+        """Return when a domain last became ``status``, or None if never."""
+        row = self._db.execute(
+            "SELECT MAX(changed_at) FROM changes WHERE domain = ? AND current = ?",
+            (domain, status.value),
+        ).fetchone()
+        return row[0] if row else None
+
+    def changed_since(
+        self,
+        since: float,
+        status: FilterStatus | None = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> list[StatusChange]:
+        """Return the status changes at or after a time, newest first.
+
+        First results of new domains are not changes and are left out.
+
+        Args:
+            since: Unix timestamp.
+            status: Only return changes to this status.
+            limit: Maximum number of changes returned.
+        """
+        query = (
+            "SELECT domain, previous, current, changed_at FROM changes "
+            "WHERE changed_at >= ? AND previous IS NOT NULL"
+        )
+        params: list[Any] = [since]
+        if status is not None:
+            query += " AND current = ?"
+            params.append(status.value)
+        query += " ORDER BY changed_at DESC LIMIT ?"
+        params.append(limit)
+        return [self._change(row) for row in self._db.execute(query, params)]
+
+    def checks(self, domain: str, limit: int = DEFAULT_LIMIT) -> list[dict[str, Any]]:
+        """Return the stored results of a domain, newest first."""
+        rows = self._db.execute(
+            "SELECT domain, status, ips, error, error_class, ttl, elapsed, checked_at "
+            "FROM results WHERE domain = ? ORDER BY checked_at DESC LIMIT ?",
+            (domain, limit),
+        )
+        columns = (
+            "domain",
+            "status",
+            "ips",
+            "error",
+            "error_class",
+            "ttl",
+            "elapsed",
+            "checked_at",
+        )
+        records = [dict(zip(columns, row, strict=True)) for row in rows]
+        for record in records:
+            record["ips"] = json.loads(record["ips"])
+        return records
+
+    def status_counts(self) -> dict[FilterStatus, int]:
+        """Return the number of domains per latest conclusive status."""
+        rows = self._db.execute("SELECT status, COUNT(*) FROM latest GROUP BY status")
+        return {FilterStatus(status): count for status, count in rows}
+
+    def close(self) -> None:
+        """Close the database."""
+        self._db.close()
+
+    def __enter__(self) -> HistoryStore:
+        """Return the store for use in a ``with`` block."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close the store."""
+        self.close()
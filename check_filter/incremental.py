@@ -0,0 +1,237 @@
+"""Incremental re-checking against a previous scan.
+
+Most domains keep their filtering status from one scan to the next. This
+module loads the latest result per domain from a previous scan (a
+:class:`~check_filter.journal.ScanJournal` file or any mapping), selects
+only the entries that are due for a recheck and reports the domains whose
+status actually changed.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from check_filter.check import CheckResult, FilterStatus
+from check_filter.journal import iter_records
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from check_filter.check import DomainChecker
+    from check_filter.journal import ScanJournal
+
+logger = logging.getLogger(__name__)
+
+# Default age after which a previous result is rechecked (one day)
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+# Default number of rechecks in flight at once
+DEFAULT_CONCURRENCY = 100
+
+# Statuses that are always rechecked regardless of their age
+RETRY_STATUSES = frozenset(
+    {FilterStatus.ERROR, FilterStatus.UNKNOWN, FilterStatus.UNCHECKED}
+)
+
+# Statuses that carry no information about filtering
+_INCONCLUSIVE = frozenset({FilterStatus.ERROR, FilterStatus.UNCHECKED})
+
+
+@dataclass(frozen=True)
+class PreviousEntry:
+    """The last known result for a domain.
+
+    Attributes:
+        status: Filtering status recorded by the previous scan.
+        checked_at: Unix timestamp of the previous check.
+        ttl: TTL of the previous answer in seconds, if known.
+        changed_at: Unix timestamp of the last check whose status differed
+            from the one before it, if the history shows a change.
+        conclusive: Last status that was neither ERROR nor UNCHECKED, or
+            None if the history has none. Defaults to ``status`` when that
+            is conclusive.
+    """
+
+    status: FilterStatus
+    checked_at: float
+    ttl: int | None = None
+    changed_at: float | None = None
+    conclusive: FilterStatus | None = None
+
+    def __post_init__(self) -> None:
+        """Default ``conclusive`` to a conclusive ``status``."""
+        if self.conclusive is None and self.status not in _INCONCLUSIVE:
+            object.__setattr__(self, "conclusive", self.status)
+
+
+@dataclass(frozen=True)
+class StatusTransition:
+    """A domain whose filtering status changed since the previous scan.
+
+    Attributes:
+        domain: The domain that changed.
+        previous: Last conclusive status recorded by previous scans.
+        current: Status observed now.
+        result: The fresh CheckResult.
+    """
+
+    domain: str
+    previous: FilterStatus
+    current: FilterStatus
+    result: CheckResult
+
+
+def load_previous(path: str | os.PathLike[str]) -> dict[str, PreviousEntry]:
+    """Load the latest entry per domain from a scan journal.
+
+    Later records for the same domain override earlier ones, so a journal
+    that has been appended to by several runs yields the newest state.
+    The time of the most recent status change is kept as ``changed_at``;
+    ERROR and UNCHECKED records say nothing about the status and neither
+    count as a change nor reset it.
+
+    Args:
+        path: Path to a journal written by ScanJournal.
+
+    Returns:
+        Mapping of domain to its latest PreviousEntry.
+    """
+    previous: dict[str, PreviousEntry] = {}
+    conclusive: dict[str, FilterStatus] = {}
+    for record in iter_records(path):
+        try:
+            status = FilterStatus(record["status"])
+        except (KeyError, ValueError):
+            continue
+        domain = record["domain"]
+        checked_at = float(record.get("checked_at") or 0.0)
+        last = previous.get(domain)
+        changed_at = last.changed_at if last is not None else None
+        if status not in _INCONCLUSIVE:
+            before = conclusive.get(domain)
+            if before is not None and before is not status:
+                changed_at = checked_at
+            conclusive[domain] = status
+
+        previous[domain] = PreviousEntry(
+            status=status,
+            checked_at=checked_at,
+            ttl=record.get("ttl"),
+            changed_at=changed_at,
+            conclusive=conclusive.get(domain),
+        )
+    return previous
+
+
+def due_domains(
+    previous: Mapping[str, PreviousEntry],
+    max_age: float = DEFAULT_MAX_AGE,
+    use_ttl: bool = False,
+    now: float | None = None,
+) -> list[str]:
+    """Select the domains that need to be rechecked.
+
+    ERROR and UNKNOWN entries are always due. Other entries are due once
+    their age exceeds ``max_age`` (or their answer TTL when ``use_ttl`` is
+    set and a TTL was recorded). With ``use_ttl``, UNKNOWN entries that
+    recorded a negative-caching TTL (RFC 2308) are treated the same way,
+    so dead domains are not queried again until that TTL expires. Failed
+    entries come first, then the remaining ones from oldest to newest, so a
+    time budget is spent on the most useful checks.
+
+    Args:
+        previous: Mapping of domain to its previous entry.
+        max_age: Maximum age in seconds before a result is rechecked.
+        use_ttl: If True, an entry's recorded TTL replaces ``max_age``.
+        now: Current Unix time. Defaults to ``time.time()``.
+
+    Returns:
+        Domains to recheck, in priority order.
+    """
+    now = time.time() if now is None else now
+    due: list[tuple[bool, float, str]] = []
+
+    for domain, entry in previous.items():
+        negative = entry.status is FilterStatus.UNKNOWN and entry.ttl is not None
+        failed = entry.status in RETRY_STATUSES and not (use_ttl and negative)
+        lifetime = entry.ttl if use_ttl and entry.ttl is not None else max_age
+        if failed or now - entry.checked_at >= lifetime:
+            due.append((not failed, entry.checked_at, domain))
+
+    due.sort()
+    return [domain for _, _, domain in due]
+
+
+def _transition(
+    previous: PreviousEntry, result: CheckResult
+) -> StatusTransition | None:
+    """Return a transition if the status changed meaningfully.
+
+    Only conclusive statuses are compared: a failed recheck, or a history
+    of nothing but failures, says nothing about the filtering status.
+    """
+    before = previous.conclusive
+    if before is None or result.status in _INCONCLUSIVE or result.status is before:
+        return None
+    return StatusTransition(
+        domain=result.domain,
+        previous=before,
+        current=result.status,
+        result=result,
+    )
+
+
+async def arecheck(
+    checker: DomainChecker,
+    previous: Mapping[str, PreviousEntry],
+    *,
+    max_age: float = DEFAULT_MAX_AGE,
+    use_ttl: bool = False,
+    time_budget: float | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    journal: ScanJournal | None = None,
+) -> list[StatusTransition]:
+    """Recheck due entries of a previous scan and report status changes.
+
+    Args:
+        checker: The DomainChecker used for the new queries.
+        previous: Mapping of domain to its previous entry.
+        max_age: Maximum age in seconds before a result is rechecked.
+        use_ttl: If True, an entry's recorded TTL replaces ``max_age``.
+        time_budget: Optional wall-clock budget in seconds. No new checks
+            are started after it elapses and checks still in flight are
+            cancelled; the domains left unchecked keep their entries.
+        concurrency: Maximum number of checks in flight.
+        journal: Optional journal receiving every fresh result, so the
+            next incremental run sees updated timestamps.
+
+    Returns:
+        Status transitions, in completion order.
+
+    Raises:
+        ValueError: If ``concurrency`` is below 1.
+    """
+    transitions: list[StatusTransition] = []
+    checked = 0
+    async for result in checker.acheck_iter(
+        due_domains(previous, max_age, use_ttl),
+        concurrency=concurrency,
+        time_budget=time_budget,
+    ):
+        # Domains the time budget left unchecked keep their previous entry.
+        if result.status is FilterStatus.UNCHECKED:
+            continue
+        checked += 1
+        if journal is not None:
+            journal.append(result)
+        entry = previous.get(result.domain)
+        transition = _transition(entry, result) if entry is not None else None
+        if transition is not None:
+            transitions.append(transition)
+
+    logger.debug("Rechecked %d domain(s)", checked)
+    return transitions
@@ -0,0 +1,195 @@
+"""Streaming readers for domain list inputs.
+
+Domain feeds are often large, compressed and delivered through pipes.
+:func:`iter_domains` reads a list from a file path or from standard input
+(``-``), decompresses gzip, bzip2 and Zstandard data on the fly and yields
+one domain per line, so the decompressed list is never written to disk
+or held in memory as a whole.
+
+The compression format is taken from the file extension, or detected
+from the first bytes of the stream (which is the only option for stdin).
+Zstandard support needs either Python 3.14's ``compression.zstd`` or the
+``zstandard`` package.
+
+Large plain files can instead be memory-mapped and validated in parallel
+with :func:`check_filter.validation.validate_file`; :func:`is_mappable`
+tells whether an input qualifies.
+"""
+
+from __future__ import annotations
+
+import bz2
+import contextlib
+import gzip
+import io
+import logging
+import os
+import stat
+import sys
+from typing import IO, TYPE_CHECKING, Any, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+logger = logging.getLogger(__name__)
+
+# Path that selects standard input
+STDIN = "-"
+
+# Size of the read buffer for domain inputs (bytes)
+READ_BUFFER_SIZE = 1 << 20
+
+# Plain files at least this large are parsed from a memory map (bytes)
+MAP_MIN_SIZE = 64 << 20
+
+# Compression formats by file extension
+_EXTENSIONS = {
+    ".gz": "gzip",
+    ".gzip": "gzip",
+    ".bz2": "bz2",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+}
+
+# Compression formats by leading magic bytes
+_MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
+
+
+def detect_compression(name: str, head: bytes) -> str | None:
+    """Return the compression format of an input, if any.
+
+    Args:
+        name: File name (or ``-`` for stdin); its extension wins.
+        head: The first bytes of the stream.
+
+    Returns:
+        ``"gzip"``, ``"bz2"``, ``"zstd"`` or None for plain text.
+    """
+    extension = os.path.splitext(name)[1].lower()
+    if extension in _EXTENSIONS:
+        return _EXTENSIONS[extension]
+    for magic, compression in _MAGIC:
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def _zstd_reader(binary: IO[bytes]) -> IO[bytes]:
+    """Return a streaming Zstandard decompressor for a binary stream."""
+    try:
+        from compression import zstd  # type: ignore[import-not-found]
+
+        return zstd.ZstdFile(binary)  # type: ignore[no-any-return]
+    except ImportError:
+        pass
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError:
+        raise RuntimeError(
+            "Reading .zst input requires the 'zstandard' package "
+            "(pip install zstandard)"
+        ) from None
+    reader = zstandard.ZstdDecompressor().stream_reader(binary, closefd=False)
+    return cast("IO[bytes]", io.BufferedReader(reader, READ_BUFFER_SIZE))
+
+
+def _decompress(binary: IO[bytes], compression: str | None) -> IO[bytes]:
+    """Wrap a binary stream in a streaming decompressor."""
+    if compression == "gzip":
+        return cast("IO[bytes]", gzip.GzipFile(fileobj=binary, mode="rb"))
+    if compression == "bz2":
+        return cast("IO[bytes]", bz2.BZ2File(binary))
+    if compression == "zstd":
+        return _zstd_reader(binary)
+    return binary
+
+
+def is_mappable(path: str | os.PathLike[str], min_size: int = MAP_MIN_SIZE) -> bool:
+    """Return True if an input should be parsed from a memory map.
+
+    Only regular, uncompressed files of at least ``min_size`` bytes
+    qualify; stdin, pipes and compressed files are always streamed.
+
+    Args:
+        path: Path to the input, or ``-`` for stdin.
+        min_size: Smallest file size worth mapping, in bytes.
+    """
+    name = os.fspath(path)
+    if name == STDIN:
+        return False
+    try:
+        info = os.stat(name)
+    except OSError:
+        return False
+    if not stat.S_ISREG(info.st_mode) or info.st_size < min_size:
+        return False
+    with open(name, "rb") as fh:
+        return detect_compression(name, fh.read(4)) is None
+
+
+@contextlib.contextmanager
+def open_domain_source(path: str | os.PathLike[str]) -> Iterator[IO[str]]:
+    """Open a domain list for streaming text reads.
+
+    Standard input is never closed, so that a caller can keep using it.
+
+    Args:
+        path: Path to a plain or compressed file, or ``-`` for stdin.
+
+    Yields:
+        A text stream of the decompressed content.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        PermissionError: If the file cannot be read.
+        RuntimeError: If a needed decompressor is not available.
+    """
+    name = os.fspath(path)
+    owned = name != STDIN
+    binary: Any
+    if owned:
+        binary = open(name, "rb", buffering=READ_BUFFER_SIZE)  # noqa: SIM115
+    else:
+        binary = sys.stdin.buffer
+        if not hasattr(binary, "peek"):
+            binary = io.BufferedReader(binary, READ_BUFFER_SIZE)
+
+    stream: Any = None
+    text: io.TextIOWrapper | None = None
+    try:
+        compression = detect_compression(name, binary.peek(4)[:4])
+        logger.debug("Reading %s (compression: %s)", name, compression or "none")
+        stream = _decompress(binary, compression)
+        text = io.TextIOWrapper(stream, encoding="utf-8")
+        yield text
+    finally:
+        # Decompressors never close the stream they wrap, and stdin must
+        # stay open, so every layer is released explicitly.
+        if text is not None:
+            text.detach()
+        if stream is not None and stream is not binary:
+            stream.close()
+        if owned:
+            binary.close()
+
+
+def iter_domains(path: str | os.PathLike[str]) -> Iterator[str]:
+    """Yield domain names from a file or stdin, one per line.
+
+    Empty lines and lines starting with ``#`` are skipped.
+
+    Args:
+        path: Path to a plain or compressed file, or ``-`` for stdin.
+
+    Yields:
+        Stripped lines, in input order.
+    """
+    with open_domain_source(path) as source:
+        for line in source:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
@@ -0,0 +1,246 @@
+"""Append-only checkpoint journal for resumable scans.
+
+Completed results are appended to a JSON Lines file in batches. The
+journal doubles as the scan's output: every line is a self-contained
+record produced by :meth:`CheckResult.to_dict` plus a ``checked_at``
+timestamp. An interrupted scan can be resumed by skipping every domain
+that already has a record in the journal.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import logging
+import os
+import time
+from array import array
+from bisect import bisect_left
+from typing import IO, TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from types import TracebackType
+
+    from check_filter.check import CheckResult
+
+logger = logging.getLogger(__name__)
+
+# Default number of results buffered before they are written out
+DEFAULT_FLUSH_EVERY = 1000
+
+# Number of keys sorted as Python ints at a time when building an index
+SORT_CHUNK = 1 << 16
+
+
+def domain_key(domain: str) -> int:
+    """Return a stable 64-bit key for a domain name."""
+    digest = hashlib.blake2b(domain.lower().encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def result_record(result: CheckResult) -> dict[str, Any]:
+    """Return the journal record of a result: its dict plus ``checked_at``."""
+    record = result.to_dict()
+    record["checked_at"] = round(time.time(), 3)
+    return record
+
+
+def iter_records(path: str | os.PathLike[str]) -> Iterator[dict[str, Any]]:
+    """Iterate over the records stored in a journal file.
+
+    Lines that cannot be decoded (for example a record torn by a crash
+    mid-write) are skipped with a warning.
+
+    Args:
+        path: Path to the journal file.
+
+    Yields:
+        Each decoded record, in file order.
+    """
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning("Skipping corrupt journal line %d in %s", lineno, path)
+                continue
+            if isinstance(record, dict) and "domain" in record:
+                yield record
+
+
+def _sorted_unique(keys: array[int]) -> array[int]:
+    """Return the distinct keys in ascending order.
+
+    Sorting the whole array at once would box every key as a Python int.
+    Instead, chunks of ``SORT_CHUNK`` keys are sorted into arrays of their
+    own and merged, so only one chunk is boxed at a time.
+
+    Args:
+        keys: Keys in any order, possibly with duplicates.
+
+    Returns:
+        A new array of the sorted, deduplicated keys.
+    """
+    runs = [
+        array("Q", sorted(keys[start : start + SORT_CHUNK]))
+        for start in range(0, len(keys), SORT_CHUNK)
+    ]
+    unique: array[int] = array("Q")
+    previous = None
+    for key in heapq.merge(*runs):
+        if key != previous:
+            unique.append(key)
+            previous = key
+    return unique
+
+
+class CompletedIndex:
+    """Compact membership index of domains already present in a journal.
+
+    Domains are stored as sorted 64-bit hashes in an ``array``, costing
+    8 bytes per entry instead of a Python string object per domain.
+    """
+
+    def __init__(self, keys: array[int]) -> None:
+        """Initialize the index from an array of domain keys."""
+        self._keys: array[int] = _sorted_unique(keys)
+
+    @classmethod
+    def from_journal(cls, path: str | os.PathLike[str]) -> CompletedIndex:
+        """Build an index from an existing journal file.
+
+        Args:
+            path: Path to the journal file. A missing file yields an
+                empty index.
+
+        Returns:
+            A CompletedIndex covering every domain in the journal.
+        """
+        keys: array[int] = array("Q")
+        if os.path.exists(path):
+            for record in iter_records(path):
+                keys.append(domain_key(record["domain"]))
+        return cls(keys)
+
+    def __contains__(self, domain: object) -> bool:
+        """Check whether a domain has a journal record."""
+        if not isinstance(domain, str):
+            return False
+        key = domain_key(domain)
+        pos = bisect_left(self._keys, key)
+        return pos < len(self._keys) and self._keys[pos] == key
+
+    def __len__(self) -> int:
+        """Return the number of distinct domains in the index."""
+        return len(self._keys)
+
+
+class ScanJournal:
+    """Append-only JSON Lines journal of completed check results.
+
+    Results are buffered in memory and written out every ``flush_every``
+    appends, on :meth:`flush` and when the journal is closed.
+
+    Example:
+        >>> with ScanJournal("scan.jsonl") as journal:
+        ...     journal.append(result)
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        flush_every: int = DEFAULT_FLUSH_EVERY,
+        fsync: bool = False,
+    ) -> None:
+        """Open a journal for appending.
+
+        Args:
+            path: Path of the journal file. Created if missing.
+            flush_every: Number of results buffered between writes.
+            fsync: If True, fsync the file after each batch so written
+                records survive a power loss, not just a process crash.
+        """
+        if flush_every < 1:
+            raise ValueError("flush_every must be at least 1")
+
+        self.path = os.fspath(path)
+        self.flush_every = flush_every
+        self.fsync = fsync
+        self.written = 0
+        self._buffer: list[str] = []
+        # The file stays open until close(); see __enter__/__exit__.
+        # pylint: disable-next=consider-using-with
+        self._file: IO[str] | None = open(  # noqa: SIM115
+            self.path, "a+", encoding="utf-8"
+        )
+        self._repair_tail()
+
+    def _repair_tail(self) -> None:
+        """Terminate a torn final line so new records start cleanly."""
+        assert self._file is not None
+        size = self._file.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        with open(self.path, "rb") as raw:
+            raw.seek(size - 1)
+            if raw.read(1) != b"\n":
+                self._file.write("\n")
+
+    @property
+    def closed(self) -> bool:
+        """Return True if the journal has been closed."""
+        return self._file is None
+
+    def append(self, result: CheckResult) -> None:
+        """Add a completed result to the journal.
+
+        Args:
+            result: The result to record.
+        """
+        record = result_record(result)
+        self._buffer.append(json.dumps(record, separators=(",", ":")))
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered results to disk."""
+        if self._file is None:
+            raise ValueError("I/O operation on closed journal")
+        if not self._buffer:
+            return
+
+        self._file.write("\n".join(self._buffer) + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+        self.written += len(self._buffer)
+        logger.debug("Flushed %d result(s) to %s", len(self._buffer), self.path)
+        self._buffer.clear()
+
+    def close(self) -> None:
+        """Flush pending results and close the journal."""
+        if self._file is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> ScanJournal:
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close the journal, flushing pending results."""
+        self.close()
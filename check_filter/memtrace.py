@@ -0,0 +1,222 @@
+"""Memory profiling of scans with tracemalloc.
+
+:class:`MemoryTracer` traces Python allocations while a scan runs. A
+background thread samples the traced memory at a fixed interval and
+takes a tracemalloc snapshot whenever memory reaches a new high, so the
+report shows where memory went when usage peaked: result objects in
+``check_filter/check.py``, asyncio tasks in ``asyncio/tasks.py``, table
+rows in ``rich/table.py``, validation state, and so on.
+
+Tracing slows allocations down noticeably and every snapshot briefly
+pauses the scan, so this is a diagnostic mode, not something to leave on.
+
+Example:
+    >>> with MemoryTracer() as tracer:
+    ...     results = await checker.acheck_many(domains)
+    >>> report = tracer.report(domains=len(results))
+    >>> print(report.peak, report.bytes_per_domain)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+logger = logging.getLogger(__name__)
+
+# Default seconds between memory samples
+DEFAULT_INTERVAL = 1.0
+
+# Default number of allocation sites reported
+DEFAULT_TOP = 10
+
+# Default number of stack frames stored per allocation
+DEFAULT_FRAMES = 1
+
+# Allocations made by the tracer itself, excluded from reports
+_EXCLUDED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+@dataclass(frozen=True)
+class AllocationSite:
+    """Memory held by one source line or file.
+
+    Attributes:
+        location: ``package/module.py:line`` or ``package/module.py``.
+        size: Bytes allocated there and still alive.
+        count: Memory blocks allocated there and still alive.
+    """
+
+    location: str
+    size: int
+    count: int
+
+
+@dataclass
+class MemoryReport:
+    """Summary of a traced run.
+
+    Attributes:
+        peak: Highest traced memory during the run, in bytes.
+        current: Traced memory when tracing stopped, in bytes.
+        samples: (seconds since start, traced bytes) pairs.
+        top_lines: Source lines holding the most memory at the peak.
+        top_files: Files holding the most memory at the peak.
+        domains: Number of domains checked during the run.
+    """
+
+    peak: int
+    current: int
+    samples: list[tuple[float, int]] = field(default_factory=list)
+    top_lines: list[AllocationSite] = field(default_factory=list)
+    top_files: list[AllocationSite] = field(default_factory=list)
+    domains: int = 0
+
+    @property
+    def bytes_per_domain(self) -> float | None:
+        """Return the peak memory per checked domain, or None."""
+        return self.peak / self.domains if self.domains else None
+
+
+def _short_path(filename: str) -> str:
+    """Return the last two components of a source path."""
+    parts = os.path.normpath(filename).split(os.sep)
+    return "/".join(parts[-2:])
+
+
+# Options plus the state shared with the sampler thread under one lock
+class MemoryTracer:  # pylint: disable=too-many-instance-attributes
+    """Samples traced memory and snapshots its peak while a scan runs.
+
+    If tracemalloc is already tracing (for example with ``python -X
+    tracemalloc``), it is left running when the tracer stops.
+    """
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_INTERVAL,
+        top: int = DEFAULT_TOP,
+        frames: int = DEFAULT_FRAMES,
+    ) -> None:
+        """Initialize the tracer.
+
+        Args:
+            interval: Seconds between memory samples.
+            top: Number of allocation sites to report.
+            frames: Stack frames stored per allocation; more frames cost
+                more memory but attribute allocations to their callers.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if top < 1 or frames < 1:
+            raise ValueError("top and frames must be at least 1")
+
+        self.interval = interval
+        self.top = top
+        self.frames = frames
+        self.samples: list[tuple[float, int]] = []
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._snapshot_size = -1
+        self._peak = 0
+        self._current = 0
+        self._owned = False
+        self._started = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start tracing and sampling."""
+        if self._thread is not None:
+            raise RuntimeError("tracer already started")
+        self._owned = not tracemalloc.is_tracing()
+        if self._owned:
+            tracemalloc.start(self.frames)
+        tracemalloc.reset_peak()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="memtrace", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Sample until stopped."""
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self) -> None:
+        """Record the traced memory and snapshot it at a new high."""
+        if not tracemalloc.is_tracing():
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            self.samples.append((time.perf_counter() - self._started, current))
+            self._current = current
+            self._peak = max(self._peak, peak)
+            if current > self._snapshot_size:
+                self._snapshot = tracemalloc.take_snapshot().filter_traces(_EXCLUDED)
+                self._snapshot_size = current
+
+    def stop(self) -> None:
+        """Stop sampling, take a final sample and stop tracing."""
+        if self._thread is None or self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        if self._owned and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        logger.debug("Memory tracing stopped; peak %d bytes", self._peak)
+
+    def report(self, domains: int = 0) -> MemoryReport:
+        """Return the report of the traced run.
+
+        Args:
+            domains: Number of domains checked, for ``bytes_per_domain``.
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            report = MemoryReport(
+                peak=self._peak,
+                current=self._current,
+                samples=list(self.samples),
+                domains=domains,
+            )
+        if snapshot is None:
+            return report
+
+        for key_type, target in (
+            ("lineno", report.top_lines),
+            ("filename", report.top_files),
+        ):
+            for stat in snapshot.statistics(key_type)[: self.top]:
+                frame = stat.traceback[0]
+                location = _short_path(frame.filename)
+                if key_type == "lineno":
+                    location = f"{location}:{frame.lineno}"
+                target.append(AllocationSite(location, stat.size, stat.count))
+        return report
+
+    def __enter__(self) -> MemoryTracer:
+        """Start tracing for a ``with`` block."""
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Stop tracing."""
+        self.stop()
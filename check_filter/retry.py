@@ -0,0 +1,162 @@
+"""Deferred retries for transient check failures.
+
+A timeout or an unreachable nameserver in the middle of a large scan is
+usually caused by momentary load, not by the domain. Retrying it
+immediately competes with the rest of the scan for the same overloaded
+resolver, so :class:`RetryQueue` instead parks transient failures and
+hands them back to :meth:`~check_filter.check.DomainChecker.acheck_iter`
+after a backoff, once the main input is exhausted or the load is low.
+
+Retries draw from their own budget so a bad network cannot make a scan
+run forever.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from check_filter.check import CheckResult
+
+# Default total number of attempts per domain (first try included)
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Default delay before the first retry (seconds); doubled on every retry
+DEFAULT_BACKOFF = 1.0
+
+
+@dataclass
+class RetryStats:
+    """Counters describing the retry queue's work.
+
+    Attributes:
+        deferred: Failures queued for a later retry.
+        recovered: Retried checks that no longer failed transiently.
+        exhausted: Transient failures given up on (attempts or budget).
+    """
+
+    deferred: int = 0
+    recovered: int = 0
+    exhausted: int = 0
+
+
+@dataclass(order=True)
+class _Deferred:
+    """A queued retry, ordered by due time."""
+
+    due: float
+    seq: int
+    attempt: int = field(compare=False)
+    result: CheckResult = field(compare=False)
+
+
+class RetryQueue:
+    """Queue of transient failures awaiting a later retry.
+
+    Example:
+        >>> retries = RetryQueue(max_attempts=3, budget=10_000)
+        >>> async for result in checker.acheck_iter(domains, retries=retries):
+        ...     print(result.domain, result.status.value)
+        >>> print(retries.stats)
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        budget: int | None = None,
+        backoff: float = DEFAULT_BACKOFF,
+    ) -> None:
+        """Initialize the queue.
+
+        Args:
+            max_attempts: Total attempts per domain, including the first.
+            budget: Maximum number of retries for the whole scan, or None
+                for no limit.
+            backoff: Seconds before the first retry of a domain; doubled
+                for each further attempt.
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if budget is not None and budget < 0:
+            raise ValueError("budget must not be negative")
+        if backoff < 0:
+            raise ValueError("backoff must not be negative")
+
+        self.max_attempts = max_attempts
+        self.budget = budget
+        self.backoff = backoff
+        self.stats = RetryStats()
+        self._heap: list[_Deferred] = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        """Return the number of queued retries."""
+        return len(self._heap)
+
+    @property
+    def remaining_budget(self) -> int | None:
+        """Return how many more retries may be queued, or None if unlimited."""
+        if self.budget is None:
+            return None
+        return max(self.budget - self.stats.deferred, 0)
+
+    def offer(self, result: CheckResult, attempt: int, now: float) -> bool:
+        """Queue a result for retry if it failed transiently.
+
+        Args:
+            result: The result of a check.
+            attempt: Zero-based attempt number that produced the result.
+            now: Current loop time.
+
+        Returns:
+            True if the domain was queued (and the result should not be
+            reported yet), False if the result is final.
+        """
+        if not result.is_transient:
+            if attempt:
+                self.stats.recovered += 1
+            return False
+
+        if attempt + 1 >= self.max_attempts or self.remaining_budget == 0:
+            self.stats.exhausted += 1
+            return False
+
+        due = now + self.backoff * 2**attempt
+        heapq.heappush(
+            self._heap,
+            _Deferred(due, next(self._seq), attempt + 1, result),
+        )
+        self.stats.deferred += 1
+        return True
+
+    def next_due(self) -> float | None:
+        """Return the loop time at which the next retry is due, if any."""
+        return self._heap[0].due if self._heap else None
+
+    def pop_due(self, now: float) -> tuple[str, int] | None:
+        """Remove and return the next retry that is due.
+
+        Args:
+            now: Current loop time.
+
+        Returns:
+            A ``(domain, attempt)`` tuple, or None if nothing is due.
+        """
+        if not self._heap or self._heap[0].due > now:
+            return None
+        item = heapq.heappop(self._heap)
+        return item.result.domain, item.attempt
+
+    def drain(self) -> list[CheckResult]:
+        """Remove every queued retry and return the last result of each.
+
+        Used when a scan runs out of time: the deferred domains are
+        reported with the failure that got them queued.
+        """
+        results = [item.result for item in sorted(self._heap)]
+        self._heap.clear()
+        self.stats.exhausted += len(results)
+        return results
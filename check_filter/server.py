@@ -0,0 +1,337 @@
+"""Long-running HTTP/JSON service around DomainChecker.
+
+The service keeps one DomainChecker (and therefore one resolver, one
+result cache and one single-flight table) alive for all clients, so
+repeated lookups avoid Python start-up, checker construction and DNS
+round-trips.
+
+Endpoints:
+    GET  /health                 Liveness, check and cache statistics.
+    GET  /check?domain=NAME      Check one domain, returns a JSON object.
+    POST /check                  Check a batch. The body is either a JSON
+                                 object ``{"domains": [...]}`` or one domain
+                                 per line. Results are streamed back as
+                                 NDJSON in completion order.
+
+Only the small subset of HTTP/1.1 needed by these endpoints is
+implemented (keep-alive, Content-Length request bodies and chunked
+responses); put a real reverse proxy in front if it must face untrusted
+networks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qs, urlsplit
+
+from check_filter.check import DEFAULT_CONCURRENCY
+from check_filter.validation import check_domain
+
+if TYPE_CHECKING:
+    from check_filter.check import DomainChecker
+
+logger = logging.getLogger(__name__)
+
+# Default listen address
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8053
+
+# Request limits
+MAX_HEADER_LINES = 100
+MAX_BODY_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_BATCH = 100_000
+
+
+class HTTPError(Exception):
+    """An error that maps directly to an HTTP error response."""
+
+    def __init__(self, status: HTTPStatus, message: str | None = None) -> None:
+        """Initialize the error with a status and optional message."""
+        super().__init__(message or status.phrase)
+        self.status = status
+        self.message = message or status.phrase
+
+
+class _Request:
+    """A parsed HTTP request."""
+
+    def __init__(
+        self,
+        method: str,
+        target: str,
+        version: str,
+        headers: dict[str, str],
+        body: bytes,
+    ) -> None:
+        url = urlsplit(target)
+        self.method = method
+        self.path = url.path
+        self.query = parse_qs(url.query)
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+    @property
+    def keep_alive(self) -> bool:
+        """Return True if the connection should stay open."""
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+
+class CheckServer:
+    """Asyncio HTTP server exposing DomainChecker over JSON.
+
+    Example:
+        >>> server = CheckServer(DomainChecker(cache=ResultCache()))
+        >>> await server.start()
+        >>> await server.serve_forever()
+    """
+
+    def __init__(
+        self,
+        checker: DomainChecker,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+            checker: The shared DomainChecker serving all clients.
+            host: Address to listen on.
+            port: TCP port to listen on. Use 0 for an ephemeral port.
+            max_batch: Maximum number of domains in one batch request.
+            concurrency: Maximum checks in flight per batch request.
+        """
+        self.checker = checker
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self.concurrency = concurrency
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        """Start listening for connections."""
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port
+        )
+        sockname = self._server.sockets[0].getsockname()
+        self.port = sockname[1]
+        logger.info("Listening on http://%s:%d", self.host, self.port)
+
+    async def serve_forever(self) -> None:
+        """Start the server if needed and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    async def aclose(self) -> None:
+        """Stop accepting connections and close the listener."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> CheckServer:
+        """Start the server on entering the context."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Stop the server on leaving the context."""
+        await self.aclose()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve requests on one connection until it is closed."""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as e:
+                    await self._send_json(writer, e.status, {"error": e.message})
+                    break
+                if request is None:
+                    break
+
+                try:
+                    await self._dispatch(request, writer)
+                except HTTPError as e:
+                    await self._send_json(writer, e.status, {"error": e.message})
+
+                if not request.keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            logger.debug("Client disconnected")
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> _Request | None:
+        """Read one request, or return None when the client closes."""
+        line = await reader.readline()
+        if not line:
+            return None
+
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line") from None
+
+        headers: dict[str, str] = {}
+        for _ in range(MAX_HEADER_LINES):
+            header = await reader.readline()
+            if header in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = header.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length") from None
+        if length < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+
+        body = await reader.readexactly(length) if length else b""
+        return _Request(method.upper(), target, version, headers, body)
+
+    async def _dispatch(self, request: _Request, writer: asyncio.StreamWriter) -> None:
+        """Route a request to its handler."""
+        if request.path == "/health":
+            if request.method != "GET":
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+            await self._send_json(writer, HTTPStatus.OK, self._health())
+        elif request.path == "/check":
+            if request.method == "GET":
+                await self._check_one(request, writer)
+            elif request.method == "POST":
+                await self._check_batch(request, writer)
+            else:
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+        else:
+            raise HTTPError(HTTPStatus.NOT_FOUND)
+
+    def _health(self) -> dict[str, Any]:
+        """Return liveness information, check and cache statistics."""
+        stats = self.checker.stats
+        health: dict[str, Any] = {
+            "status": "ok",
+            "checks": {
+                "total": stats.checks,
+                "queries": stats.queries,
+                "shared": stats.shared,
+            },
+        }
+        cache = self.checker.cache
+        if cache is not None:
+            health["cache"] = {
+                "entries": len(cache),
+                "hits": cache.stats.hits,
+                "misses": cache.stats.misses,
+            }
+        return health
+
+    async def _check_one(self, request: _Request, writer: asyncio.StreamWriter) -> None:
+        """Handle ``GET /check?domain=NAME``."""
+        domain = request.query.get("domain", [""])[0]
+        normalized, reason = check_domain(domain)
+        if normalized is None:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, reason)
+
+        result = await self.checker.acheck(normalized)
+        await self._send_json(writer, HTTPStatus.OK, result.to_dict())
+
+    def _parse_batch(self, request: _Request) -> list[str]:
+        """Extract the domain list from a batch request body."""
+        content_type = request.headers.get("content-type", "")
+        text = request.body.decode("utf-8", errors="replace")
+
+        if "json" in content_type or text.lstrip().startswith("{"):
+            try:
+                payload = json.loads(text)
+                domains = payload["domains"]
+            except (ValueError, KeyError, TypeError):
+                raise HTTPError(
+                    HTTPStatus.BAD_REQUEST, 'Expected {"domains": [...]}'
+                ) from None
+            if not isinstance(domains, list):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "domains must be a list")
+        else:
+            domains = [line.strip() for line in text.splitlines() if line.strip()]
+
+        if len(domains) > self.max_batch:
+            raise HTTPError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f"Batch exceeds {self.max_batch} domains",
+            )
+        return [d if isinstance(d, str) else "" for d in domains]
+
+    async def _check_batch(
+        self, request: _Request, writer: asyncio.StreamWriter
+    ) -> None:
+        """Handle ``POST /check`` by streaming NDJSON results."""
+        domains = self._parse_batch(request)
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: application/x-ndjson\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+
+        valid: list[str] = []
+        lines: list[bytes] = []
+        for domain in domains:
+            normalized, reason = check_domain(domain)
+            if normalized is None:
+                record = {"domain": domain, "status": "invalid", "error": reason}
+                lines.append(json.dumps(record).encode() + b"\n")
+            else:
+                valid.append(normalized)
+        if lines:
+            await self._send_chunk(writer, b"".join(lines))
+
+        results = self.checker.acheck_iter(valid, concurrency=self.concurrency)
+        try:
+            async for result in results:
+                line = json.dumps(result.to_dict()).encode() + b"\n"
+                await self._send_chunk(writer, line)
+        finally:
+            await results.aclose()
+
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    @staticmethod
+    async def _send_chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+        """Write one chunk of a chunked response, honoring backpressure."""
+        writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+        await writer.drain()
+
+    @staticmethod
+    async def _send_json(
+        writer: asyncio.StreamWriter, status: HTTPStatus, payload: dict[str, Any]
+    ) -> None:
+        """Write a complete JSON response."""
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
@@ -0,0 +1,463 @@
+"""Pluggable result sinks with batched, bounded writes.
+
+Results of a scan can be fanned out to any number of sinks besides the
+terminal table:
+
+* :class:`JSONLSink` appends journal records to a JSON Lines file;
+* :class:`SQLiteSink` stores results in a SQLite history database (see
+  :mod:`check_filter.history`);
+* :class:`WebhookSink` POSTs batches as JSON to an HTTP endpoint;
+* :class:`StdoutSink` writes JSON lines to standard output.
+
+:class:`ResultFanOut` runs every sink on its own task behind a bounded
+queue. Results are collected into batches of up to ``batch_size`` (or
+whatever arrived within ``flush_interval``) and written one batch at a
+time. When a sink falls behind, its queue fills up and the scan waits for
+it, so a slow sink limits the scan rate instead of growing memory.
+
+Example:
+    >>> sinks = [JSONLSink("scan.jsonl"), SQLiteSink("scan.db")]
+    >>> async with ResultFanOut(sinks) as fan_out:
+    ...     async for result in fan_out.tee(checker.acheck_iter(domains)):
+    ...         print(result.domain, result.status.value)
+"""
+
+from __future__ import annotations
+
+import abc
+import asyncio
+import json
+import logging
+import os
+import sys
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+from check_filter.journal import result_record
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterable, AsyncIterator, Sequence
+    from types import TracebackType
+
+    from check_filter.check import CheckResult
+
+logger = logging.getLogger(__name__)
+
+# Default maximum number of results written in one batch
+DEFAULT_BATCH_SIZE = 500
+
+# Default maximum number of results queued per sink
+DEFAULT_MAX_QUEUE = 10_000
+
+# Default seconds a partial batch waits for more results
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# Default seconds allowed for one webhook request
+DEFAULT_WEBHOOK_TIMEOUT = 10.0
+
+# Marks the end of a sink's queue
+_CLOSE = object()
+
+
+class SinkError(Exception):
+    """A result sink failed; the original error is the cause."""
+
+
+def _dumps(record: dict[str, Any]) -> str:
+    """Serialize a record compactly."""
+    return json.dumps(record, separators=(",", ":"))
+
+
+class ResultSink(abc.ABC):
+    """Destination for batches of check results."""
+
+    name = "sink"
+
+    @abc.abstractmethod
+    async def write(self, results: list[CheckResult]) -> None:
+        """Write a batch of results."""
+
+    @abc.abstractmethod
+    async def aclose(self) -> None:
+        """Release the resources held by the sink."""
+
+
+class JSONLSink(ResultSink):
+    """Appends journal records (see ``journal.result_record``) to a file."""
+
+    name = "jsonl"
+
+    def __init__(self, path: str | os.PathLike[str], fsync: bool = False) -> None:
+        """Open the file for appending.
+
+        Args:
+            path: Path of the JSON Lines file. Created if missing.
+            fsync: If True, fsync the file after each batch.
+        """
+        self.path = os.fspath(path)
+        self.fsync = fsync
+        # The file stays open until aclose().
+        # pylint: disable-next=consider-using-with
+        self._file: IO[str] = open(self.path, "a", encoding="utf-8")  # noqa: SIM115
+
+    def _write(self, lines: list[str]) -> None:
+        """Write lines and flush them to the OS (in a worker thread)."""
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    async def write(self, results: list[CheckResult]) -> None:
+        """Append a batch of records."""
+        lines = [_dumps(result_record(result)) for result in results]
+        await asyncio.to_thread(self._write, lines)
+
+    async def aclose(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+
+class StdoutSink(ResultSink):
+    """Writes journal records as JSON lines to a text stream."""
+
+    name = "stdout"
+
+    def __init__(self, stream: IO[str] | None = None) -> None:
+        """Initialize the sink.
+
+        Args:
+            stream: Text stream to write to. Defaults to ``sys.stdout``
+                at write time.
+        """
+        self.stream = stream
+
+    async def write(self, results: list[CheckResult]) -> None:
+        """Write a batch of records."""
+        stream = self.stream or sys.stdout
+        stream.write("".join(_dumps(result_record(r)) + "\n" for r in results))
+        stream.flush()
+
+    async def aclose(self) -> None:
+        """Do nothing; the stream belongs to the caller."""
+
+
+class SQLiteSink(ResultSink):
+    """Stores results in a :class:`~check_filter.history.HistoryStore`."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Open (or create) the history database.
+
+        Args:
+            path: Path of the database file.
+        """
+        from check_filter.history import HistoryStore
+
+        self.path = os.fspath(path)
+        self.store = HistoryStore(self.path)
+
+    async def write(self, results: list[CheckResult]) -> None:
+        """Store a batch of results in one transaction."""
+        # Batches are written one at a time, so the store is never used
+        # by two threads at once.
+        await asyncio.to_thread(self.store.add_many, results)
+
+    async def aclose(self) -> None:
+        """Close the database."""
+        self.store.close()
+
+
+class WebhookSink(ResultSink):
+    """POSTs each batch as ``{"results": [...]}`` to an HTTP(S) URL.
+
+    Every batch is sent on a new connection; a response status other
+    than 2xx fails the sink.
+    """
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = DEFAULT_WEBHOOK_TIMEOUT) -> None:
+        """Initialize the sink.
+
+        Args:
+            url: ``http://`` or ``https://`` URL to POST to.
+            timeout: Seconds allowed per request.
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Invalid webhook URL: {url!r}")
+        self.url = url
+        self.timeout = timeout
+        self._tls = parts.scheme == "https"
+        self._host = parts.hostname
+        self._port = parts.port or (443 if self._tls else 80)
+        self._target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self._netloc = parts.netloc
+
+    async def _post(self, body: bytes) -> int:
+        """Send one request and return the response status code."""
+        reader, writer = await asyncio.open_connection(
+            self._host, self._port, ssl=True if self._tls else None
+        )
+        try:
+            head = (
+                f"POST {self._target} HTTP/1.1\r\n"
+                f"Host: {self._netloc}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            )
+            writer.write(head.encode("ascii") + body)
+            await writer.drain()
+            status_line = await reader.readline()
+        finally:
+            writer.close()
+        parts = status_line.split()
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise ConnectionError(f"Malformed response from {self.url}")
+        return int(parts[1])
+
+    async def write(self, results: list[CheckResult]) -> None:
+        """POST a batch of records."""
+        body = _dumps({"results": [result_record(r) for r in results]}).encode()
+        status = await asyncio.wait_for(self._post(body), self.timeout)
+        if not 200 <= status < 300:
+            raise ConnectionError(f"{self.url} answered HTTP {status}")
+
+    async def aclose(self) -> None:
+        """Do nothing; every batch is sent on its own connection."""
+
+
+def make_sink(spec: str) -> ResultSink:
+    """Create a sink from a command-line specification.
+
+    Args:
+        spec: ``jsonl:PATH``, ``sqlite:PATH``, an ``http://`` or
+            ``https://`` URL, or ``stdout``.
+
+    Raises:
+        ValueError: If the specification is not recognized.
+    """
+    kind, _, target = spec.partition(":")
+    if spec in ("stdout", "-"):
+        return StdoutSink()
+    if kind in ("http", "https"):
+        return WebhookSink(spec)
+    if kind == "jsonl" and target:
+        return JSONLSink(target)
+    if kind == "sqlite" and target:
+        return SQLiteSink(target)
+    raise ValueError(
+        f"Unknown sink {spec!r}; expected jsonl:PATH, sqlite:PATH, a URL or stdout"
+    )
+
+
+@dataclass
+class SinkStats:
+    """Counters of one sink.
+
+    Attributes:
+        written: Results written.
+        batches: Batches written.
+        dropped: Results discarded after the sink failed.
+    """
+
+    written: int = 0
+    batches: int = 0
+    dropped: int = 0
+
+
+class _SinkWorker:
+    """Feeds one sink from a bounded queue on its own task."""
+
+    def __init__(
+        self,
+        sink: ResultSink,
+        batch_size: int,
+        max_queue: int,
+        flush_interval: float,
+    ) -> None:
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stats = SinkStats()
+        self.error: BaseException | None = None
+        self.queue: asyncio.Queue[Any] = asyncio.Queue(max_queue)
+        self.task = asyncio.create_task(self._run(), name=f"sink-{sink.name}")
+
+    async def put(self, result: CheckResult) -> None:
+        """Queue a result, waiting while the queue is full."""
+        self.raise_error()
+        await self.queue.put(result)
+
+    def raise_error(self) -> None:
+        """Raise SinkError if the sink has failed."""
+        if self.error is not None:
+            raise SinkError(
+                f"{self.sink.name} sink failed: {self.error}"
+            ) from self.error
+
+    async def _next_batch(self) -> tuple[list[CheckResult], bool]:
+        """Wait for the next batch; return it and whether the queue ended."""
+        loop = asyncio.get_running_loop()
+        first = await self.queue.get()
+        if first is _CLOSE:
+            return [], True
+        batch = [first]
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                item = self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                try:
+                    item = await asyncio.wait_for(
+                        self.queue.get(), max(deadline - loop.time(), 0)
+                    )
+                except asyncio.TimeoutError:
+                    break
+            if item is _CLOSE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _run(self) -> None:
+        """Write batches until the queue is closed."""
+        done = False
+        while not done:
+            batch, done = await self._next_batch()
+            if not batch:
+                continue
+            if self.error is not None:
+                # Keep draining so producers never block on a dead sink.
+                self.stats.dropped += len(batch)
+                continue
+            try:
+                await self.sink.write(batch)
+            # Sinks are pluggable and may fail in any way; a failure must
+            # stop only this sink, never the scan feeding it.
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error("Result sink %s failed: %s", self.sink.name, e)
+                self.error = e
+                self.stats.dropped += len(batch)
+            else:
+                self.stats.written += len(batch)
+                self.stats.batches += 1
+
+    async def aclose(self) -> None:
+        """Write what is queued, stop the task and close the sink."""
+        try:
+            await self.queue.put(_CLOSE)
+            await self.task
+        finally:
+            await self.sink.aclose()
+
+
+class ResultFanOut:
+    """Writes every result to several sinks, each on its own task.
+
+    Memory is bounded by ``max_queue + batch_size`` results per sink. If a
+    sink fails, later puts and :meth:`aclose` raise SinkError, and results
+    still queued for it are dropped.
+    """
+
+    def __init__(
+        self,
+        sinks: Sequence[ResultSink],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        """Initialize the fan-out; workers start on :meth:`start`.
+
+        Args:
+            sinks: Sinks that receive every result.
+            batch_size: Maximum number of results per write.
+            max_queue: Maximum number of results queued per sink.
+            flush_interval: Seconds a partial batch waits for more results.
+        """
+        if batch_size < 1 or max_queue < 1:
+            raise ValueError("batch_size and max_queue must be at least 1")
+        if flush_interval < 0:
+            raise ValueError("flush_interval must not be negative")
+
+        self.sinks = list(sinks)
+        self.batch_size = batch_size
+        self.max_queue = max_queue
+        self.flush_interval = flush_interval
+        self._workers: list[_SinkWorker] = []
+        self._closed = False
+
+    @property
+    def stats(self) -> list[SinkStats]:
+        """Return the counters of every started sink, in sink order."""
+        return [worker.stats for worker in self._workers]
+
+    def start(self) -> None:
+        """Start one worker task per sink on the running loop."""
+        if self._workers:
+            raise RuntimeError("fan-out already started")
+        self._workers = [
+            _SinkWorker(sink, self.batch_size, self.max_queue, self.flush_interval)
+            for sink in self.sinks
+        ]
+
+    async def put(self, result: CheckResult) -> None:
+        """Queue a result for every sink, waiting for full queues.
+
+        Raises:
+            SinkError: If a sink has failed.
+        """
+        for worker in self._workers:
+            await worker.put(result)
+
+    async def tee(
+        self, results: AsyncIterable[CheckResult]
+    ) -> AsyncIterator[CheckResult]:
+        """Yield results from a stream after queueing them for every sink.
+
+        Args:
+            results: Result stream, e.g. ``DomainChecker.acheck_iter``.
+        """
+        async for result in results:
+            await self.put(result)
+            yield result
+
+    async def aclose(self) -> None:
+        """Write all queued results and close every sink.
+
+        Every sink is closed, even when another one fails to close; the
+        first failure is raised afterwards.
+
+        Raises:
+            SinkError: If a sink failed.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        outcomes = await asyncio.gather(
+            *(worker.aclose() for worker in self._workers), return_exceptions=True
+        )
+        for worker, outcome in zip(self._workers, outcomes, strict=True):
+            worker.raise_error()
+            if isinstance(outcome, Exception):
+                raise SinkError(
+                    f"{worker.sink.name} sink failed to close: {outcome}"
+                ) from outcome
+            if isinstance(outcome, BaseException):
+                raise outcome
+
+    async def __aenter__(self) -> ResultFanOut:
+        """Start the workers for an ``async with`` block."""
+        self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Flush and close every sink."""
+        await self.aclose()
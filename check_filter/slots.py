@@ -0,0 +1,140 @@
+"""Bounded pool of in-flight checks behind ``DomainChecker.acheck_iter``.
+
+:class:`CheckSlots` owns the tasks of one ``acheck_iter`` call: it starts
+checks as slots free up, honours per-domain start times, hands transient
+failures to a :class:`~check_filter.retry.RetryQueue`, and cancels what is
+still in flight when a time budget runs out.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine, Iterable, Iterator, Mapping
+
+    from check_filter.check import CheckResult
+    from check_filter.retry import RetryQueue
+
+
+class CheckSlots:
+    """Checks in flight for one ``acheck_iter`` call, fed from its input.
+
+    Fresh domains are pulled from the input only when a slot is free, so
+    the number of tasks stays bounded by ``concurrency``. Deferred retries
+    take a slot once the input is exhausted or fewer than half of the
+    slots are busy.
+    """
+
+    def __init__(
+        self,
+        check: Callable[[str], Coroutine[Any, Any, CheckResult]],
+        domains: Iterable[str],
+        concurrency: int,
+        retries: RetryQueue | None,
+        not_before: Mapping[str, float] | None,
+    ) -> None:
+        self.check = check
+        self.pending = iter(domains)
+        self.concurrency = concurrency
+        self.retries = retries
+        self.not_before = not_before
+        self.loop = asyncio.get_running_loop()
+        self.exhausted = False
+        # Next domain from the input, waiting for a slot or its start time
+        self.held: str | None = None
+        self.in_flight: dict[asyncio.Task[CheckResult], tuple[str, int]] = {}
+
+    @property
+    def idle(self) -> bool:
+        """Return True if deferred retries may take a free slot."""
+        return self.exhausted or len(self.in_flight) < self.concurrency // 2
+
+    def finished(self) -> bool:
+        """Return True once every domain and retry has been checked."""
+        return (
+            not self.in_flight
+            and self.held is None
+            and (self.retries is None or self.retries.next_due() is None)
+        )
+
+    def _start(self, domain: str, attempt: int) -> None:
+        task = asyncio.create_task(self.check(domain))
+        self.in_flight[task] = (domain, attempt)
+
+    def fill(self) -> float | None:
+        """Start checks while slots are free.
+
+        Returns:
+            The time the held domain may start, if it is only waiting for
+            that time.
+        """
+        retries, not_before = self.retries, self.not_before
+        while len(self.in_flight) < self.concurrency:
+            retry = retries.pop_due(self.loop.time()) if retries and self.idle else None
+            if retry is not None:
+                self._start(*retry)
+                continue
+            if self.held is None and not self.exhausted:
+                self.held = next(self.pending, None)
+                self.exhausted = self.held is None
+            if self.held is None:
+                return None
+            start_at = not_before.get(self.held) if not_before else None
+            if start_at is not None and start_at > self.loop.time():
+                return start_at
+            self._start(self.held, 0)
+            self.held = None
+        return None
+
+    def timeout(self, start_at: float | None, deadline: float | None) -> float | None:
+        """Return how long to wait for the next event, or None to wait for a check.
+
+        A due retry cannot start while the slots are taken (or held back
+        for fresh domains), so only wake up for it once it could.
+        """
+        next_due = self.retries.next_due() if self.retries else None
+        if not self.idle or len(self.in_flight) >= self.concurrency:
+            next_due = None
+        wake = min(t for t in (start_at, next_due, deadline, math.inf) if t is not None)
+        return None if wake == math.inf else max(wake - self.loop.time(), 0)
+
+    async def completed(self, timeout: float | None) -> list[CheckResult]:
+        """Wait up to ``timeout`` and return the results ready to yield.
+
+        Transient failures accepted by the retry queue are held back.
+        """
+        if not self.in_flight:
+            await asyncio.sleep(timeout or 0)
+            return []
+
+        done, _ = await asyncio.wait(
+            self.in_flight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        results = []
+        for task in done:
+            _, attempt = self.in_flight.pop(task)
+            result = task.result()
+            if self.retries is None or not self.retries.offer(
+                result, attempt, self.loop.time()
+            ):
+                results.append(result)
+        return results
+
+    async def cancel(self) -> list[str]:
+        """Cancel the checks in flight and return their domains."""
+        stopped = [domain for domain, _ in self.in_flight.values()]
+        for task in self.in_flight:
+            task.cancel()
+        if self.in_flight:
+            await asyncio.gather(*self.in_flight, return_exceptions=True)
+        self.in_flight.clear()
+        return stopped
+
+    def remaining(self) -> Iterator[str]:
+        """Yield the domains of the input that were never started."""
+        if self.held is not None:
+            yield self.held
+        yield from self.pending
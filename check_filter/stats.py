@@ -0,0 +1,353 @@
+"""Streaming aggregate statistics for scans.
+
+:class:`ScanStats` summarizes a scan as its results stream in, without
+keeping the results themselves:
+
+* counts per :class:`~check_filter.check.FilterStatus`;
+* the blocked ratio overall, per TLD and per registrable domain;
+* a lookup latency distribution kept in a :class:`QuantileSketch`;
+* the most frequent error classes.
+
+Memory is constant per group, and the number of registrable-domain
+groups is capped. Statistics from several scans or worker processes can
+be combined with :meth:`ScanStats.merge`.
+
+Example:
+    >>> stats = ScanStats()
+    >>> async for result in checker.acheck_iter(domains):
+    ...     stats.add(result)
+    >>> print(f"{stats.blocked_ratio:.1%} blocked")
+"""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+from check_filter.check import FilterStatus
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from check_filter.check import CheckResult
+
+# Default relative accuracy of latency quantiles
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+# Default maximum number of buckets kept by a quantile sketch
+DEFAULT_MAX_BUCKETS = 2048
+
+# Default maximum number of registrable domains tracked individually
+DEFAULT_MAX_GROUPS = 100_000
+
+# Group that collects registrable domains beyond the group limit
+OTHER_GROUP = "(other)"
+
+# Latency quantiles reported by ScanStats.to_dict
+REPORTED_QUANTILES = (0.5, 0.9, 0.99)
+
+# Second-level labels under which names are registered one level deeper
+# (e.g. example.co.ir); a compact stand-in for the Public Suffix List
+_SECOND_LEVEL_LABELS = frozenset(
+    {"ac", "co", "com", "edu", "gov", "id", "net", "or", "org", "sch"}
+)
+
+
+def registrable_domain(domain: str) -> str:
+    """Return the registrable part of a domain name.
+
+    Uses a heuristic instead of the Public Suffix List: the last two
+    labels, or the last three when the second-level label is a common
+    registry category under a two-letter country code (``co.uk``,
+    ``ac.ir``, ``com.br``, ...).
+
+    Args:
+        domain: Normalized domain name.
+
+    Returns:
+        The registrable domain, e.g. ``"example.co.ir"``.
+
+    Example:
+        >>> registrable_domain("www.example.co.ir")
+        'example.co.ir'
+    """
+    labels = domain.rstrip(".").split(".")
+    depth = 2
+    if len(labels) > 2 and len(labels[-1]) == 2 and labels[-2] in _SECOND_LEVEL_LABELS:
+        depth = 3
+    return ".".join(labels[-depth:])
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded relative error.
+
+    Values are counted in logarithmically sized buckets, so every
+    reported quantile is within ``relative_accuracy`` of the true value
+    (in the style of DDSketch). Two sketches with the same accuracy merge
+    by adding their bucket counts. When more than ``max_buckets`` buckets
+    are needed, the lowest ones are collapsed, which only affects the
+    accuracy of the smallest values.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_buckets: int = DEFAULT_MAX_BUCKETS,
+    ) -> None:
+        """Initialize an empty sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of quantiles (0-1).
+            max_buckets: Maximum number of buckets kept.
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        if max_buckets < 1:
+            raise ValueError("max_buckets must be at least 1")
+
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: Counter[int] = Counter()
+        self.zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """Add a non-negative value to the sketch."""
+        if value < 0:
+            raise ValueError("value must not be negative")
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value == 0:
+            self.zeros += 1
+            return
+        self._buckets[math.ceil(math.log(value) / self._log_gamma)] += 1
+        if len(self._buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        """Merge the lowest buckets until the bucket limit is respected."""
+        keys = sorted(self._buckets)
+        excess = len(keys) - self.max_buckets
+        target = keys[excess]
+        for key in keys[:excess]:
+            self._buckets[target] += self._buckets.pop(key)
+
+    def merge(self, other: QuantileSketch) -> None:
+        """Add the values of another sketch with the same accuracy."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("cannot merge sketches with different accuracy")
+        self._buckets.update(other.buckets)
+        if len(self._buckets) > self.max_buckets:
+            self._collapse()
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def buckets(self) -> Mapping[int, int]:
+        """Return a read-only view of the value count per bucket index."""
+        return MappingProxyType(self._buckets)
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the added values, or None if empty."""
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """Return an estimate of the ``q`` quantile, or None if empty.
+
+        Args:
+            q: Quantile between 0 and 1, e.g. 0.99.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if not self.count:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if rank < seen:
+                estimate = 2 * self._gamma**key / (self._gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+
+@dataclass
+class GroupStats:
+    """Blocked ratio counters of one group (a TLD or registrable domain).
+
+    Attributes:
+        total: Results in the group.
+        blocked: BLOCKED results in the group.
+        free: FREE results in the group.
+    """
+
+    total: int = 0
+    blocked: int = 0
+    free: int = 0
+
+    @property
+    def blocked_ratio(self) -> float | None:
+        """Return BLOCKED / (BLOCKED + FREE), or None if nothing resolved."""
+        resolved = self.blocked + self.free
+        return self.blocked / resolved if resolved else None
+
+    def merge(self, other: GroupStats) -> None:
+        """Add the counters of another group."""
+        self.total += other.total
+        self.blocked += other.blocked
+        self.free += other.free
+
+
+class ScanStats:
+    """Aggregate statistics of a scan, updated one result at a time.
+
+    The blocked ratio of a group is taken over the domains that resolved
+    (FREE or BLOCKED); errors and unknown names are counted separately.
+    """
+
+    def __init__(
+        self,
+        max_groups: int = DEFAULT_MAX_GROUPS,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+    ) -> None:
+        """Initialize empty statistics.
+
+        Args:
+            max_groups: Maximum number of registrable domains tracked
+                individually; later ones are counted under
+                ``OTHER_GROUP``.
+            relative_accuracy: Relative accuracy of latency quantiles.
+        """
+        self.max_groups = max_groups
+        self.statuses: Counter[FilterStatus] = Counter()
+        self.error_classes: Counter[str] = Counter()
+        self.tlds: dict[str, GroupStats] = {}
+        self.registrable: dict[str, GroupStats] = {}
+        self.latency = QuantileSketch(relative_accuracy)
+
+    @property
+    def total(self) -> int:
+        """Return the number of results added."""
+        return sum(self.statuses.values())
+
+    @property
+    def blocked_ratio(self) -> float | None:
+        """Return the overall BLOCKED / (BLOCKED + FREE) ratio."""
+        resolved = (
+            self.statuses[FilterStatus.BLOCKED] + self.statuses[FilterStatus.FREE]
+        )
+        return self.statuses[FilterStatus.BLOCKED] / resolved if resolved else None
+
+    def _group(self, groups: dict[str, GroupStats], key: str) -> GroupStats:
+        """Return the counters of a group, creating it within the limit."""
+        group = groups.get(key)
+        if group is None:
+            if len(groups) >= self.max_groups:
+                key = OTHER_GROUP
+            group = groups.setdefault(key, GroupStats())
+        return group
+
+    def add(self, result: CheckResult) -> None:
+        """Add one result to the statistics."""
+        status = result.status
+        self.statuses[status] += 1
+        if result.error_class is not None:
+            self.error_classes[result.error_class] += 1
+        if result.elapsed is not None:
+            self.latency.add(result.elapsed)
+        if not result.domain:
+            return
+
+        tld = result.domain.rsplit(".", 1)[-1]
+        for group in (
+            self.tlds.setdefault(tld, GroupStats()),
+            self._group(self.registrable, registrable_domain(result.domain)),
+        ):
+            group.total += 1
+            if status is FilterStatus.BLOCKED:
+                group.blocked += 1
+            elif status is FilterStatus.FREE:
+                group.free += 1
+
+    def update(self, results: Iterable[CheckResult]) -> None:
+        """Add many results to the statistics."""
+        for result in results:
+            self.add(result)
+
+    def merge(self, other: ScanStats) -> None:
+        """Add the statistics of another scan (or another worker)."""
+        self.statuses.update(other.statuses)
+        self.error_classes.update(other.error_classes)
+        self.latency.merge(other.latency)
+        for key, group in other.tlds.items():
+            self.tlds.setdefault(key, GroupStats()).merge(group)
+        for key, group in other.registrable.items():
+            self._group(self.registrable, key).merge(group)
+
+    def top_groups(
+        self, groups: dict[str, GroupStats], limit: int = 10
+    ) -> list[tuple[str, GroupStats]]:
+        """Return the groups with the most blocked results.
+
+        Args:
+            groups: ``tlds`` or ``registrable``.
+            limit: Number of groups to return.
+        """
+        ranked = sorted(
+            groups.items(), key=lambda item: (-item[1].blocked, -item[1].total)
+        )
+        return ranked[:limit]
+
+    def to_dict(self, limit: int = 10) -> dict[str, Any]:
+        """Return a JSON-serializable summary.
+
+        Args:
+            limit: Number of TLDs, registrable domains and error classes
+                to include.
+        """
+
+        def groups(source: dict[str, GroupStats]) -> dict[str, dict[str, Any]]:
+            return {
+                key: {
+                    "total": group.total,
+                    "blocked": group.blocked,
+                    "blocked_ratio": group.blocked_ratio,
+                }
+                for key, group in self.top_groups(source, limit)
+            }
+
+        return {
+            "total": self.total,
+            "statuses": {
+                status.value: self.statuses[status] for status in FilterStatus
+            },
+            "blocked_ratio": self.blocked_ratio,
+            "tlds": groups(self.tlds),
+            "registrable_domains": groups(self.registrable),
+            "latency": {
+                "count": self.latency.count,
+                "mean": self.latency.mean,
+                **{
+                    f"p{round(q * 100)}": self.latency.quantile(q)
+                    for q in REPORTED_QUANTILES
+                },
+            },
+            "errors": dict(self.error_classes.most_common(limit)),
+        }
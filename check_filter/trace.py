@@ -0,0 +1,296 @@
+"""Record and replay DNS traces for offline benchmarking.
+
+Benchmarks against live resolvers are noisy: latencies drift, answers
+change and rate limits kick in. This module captures the raw responses
+of a real scan once and serves them again later, without the network:
+
+* :class:`RecordingTransport` wraps any
+  :class:`~check_filter.transport.Transport` and writes every response
+  (as DNS wire format) with its latency to a trace file. Timeouts and
+  connection failures are recorded too.
+* :class:`ReplayTransport` answers queries from a trace, after the
+  recorded latency multiplied by ``speed``, so scans see real-world
+  answer shapes and a real latency distribution. ``speed=0`` answers
+  immediately.
+
+A trace is a JSON Lines file, gzip-compressed when its name ends in
+``.gz``: a header line followed by one record per query.
+
+Example:
+    >>> transport = RecordingTransport(
+    ...     PooledUDPTransport(["1.1.1.1"]), "scan.trace.gz"
+    ... )
+    >>> async with DomainChecker(transport=transport) as checker:
+    ...     await checker.acheck_many(domains)
+    >>> replay = ReplayTransport("scan.trace.gz", speed=0.5)
+    >>> async with DomainChecker(transport=replay) as checker:
+    ...     await checker.acheck_many(domains)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import gzip
+import json
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING, Any
+
+import dns.message
+import dns.rdatatype
+
+from check_filter.inputs import open_domain_source
+
+if TYPE_CHECKING:
+    from check_filter.transport import Transport
+
+logger = logging.getLogger(__name__)
+
+# Identifies trace files and their layout version
+TRACE_FORMAT = "check-filter-trace"
+TRACE_VERSION = 1
+
+# Failure kinds a record may hold instead of a response
+TIMEOUT = "timeout"
+CONNECTION_ERROR = "error"
+
+
+@dataclass(frozen=True)
+class TraceRecord:
+    """One recorded query.
+
+    Attributes:
+        qname: Queried name, lower-case and fully qualified.
+        rdtype: Queried record type, e.g. ``"A"``.
+        latency: Seconds until the response (or failure) arrived.
+        wire: Response in DNS wire format, or None on failure.
+        error: ``TIMEOUT`` or ``CONNECTION_ERROR`` on failure.
+    """
+
+    qname: str
+    rdtype: str
+    latency: float
+    wire: bytes | None = None
+    error: str | None = None
+
+    @property
+    def key(self) -> tuple[str, str]:
+        """Return the (qname, rdtype) pair the record answers."""
+        return self.qname, self.rdtype
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the record to a JSON-serializable dictionary."""
+        data: dict[str, Any] = {
+            "qname": self.qname,
+            "rdtype": self.rdtype,
+            "latency": round(self.latency, 6),
+        }
+        if self.wire is not None:
+            data["wire"] = base64.b64encode(self.wire).decode("ascii")
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TraceRecord:
+        """Create a record from a dictionary produced by :meth:`to_dict`."""
+        wire = data.get("wire")
+        return cls(
+            qname=data["qname"],
+            rdtype=data["rdtype"],
+            latency=float(data["latency"]),
+            wire=base64.b64decode(wire) if wire is not None else None,
+            error=data.get("error"),
+        )
+
+
+def _question_key(request: dns.message.Message) -> tuple[str, str]:
+    """Return the (qname, rdtype) pair of a query."""
+    question = request.question[0]
+    return question.name.to_text().lower(), dns.rdatatype.to_text(question.rdtype)
+
+
+def load_trace(
+    path: str | os.PathLike[str],
+) -> tuple[dict[str, Any], list[TraceRecord]]:
+    """Read a trace file.
+
+    Args:
+        path: Path to a plain or compressed trace file.
+
+    Returns:
+        Tuple of (header, records in recording order).
+
+    Raises:
+        ValueError: If the file is not a trace of a supported version.
+    """
+    with open_domain_source(path) as source:
+        header = json.loads(source.readline() or "null")
+        if not isinstance(header, dict) or header.get("format") != TRACE_FORMAT:
+            raise ValueError(f"{os.fspath(path)} is not a DNS trace")
+        if header.get("version") != TRACE_VERSION:
+            raise ValueError(f"Unsupported trace version {header.get('version')!r}")
+        records = [
+            TraceRecord.from_dict(json.loads(line)) for line in source if line.strip()
+        ]
+    return header, records
+
+
+class RecordingTransport:
+    """Transport wrapper that records every exchange to a trace file."""
+
+    def __init__(self, transport: Transport, path: str | os.PathLike[str]) -> None:
+        """Open the trace file and write its header.
+
+        Args:
+            transport: Transport that sends the queries.
+            path: Trace file to create; gzip-compressed if it ends in ``.gz``.
+        """
+        self.transport = transport
+        self.path = os.fspath(path)
+        self.records = 0
+        self._file: IO[str]
+        if self.path.endswith(".gz"):
+            self._file = gzip.open(self.path, "wt", encoding="utf-8")  # noqa: SIM115
+        else:
+            # The file stays open until aclose(), like the gzip stream above.
+            # pylint: disable-next=consider-using-with
+            self._file = open(self.path, "w", encoding="utf-8")  # noqa: SIM115
+        self._write(
+            {
+                "format": TRACE_FORMAT,
+                "version": TRACE_VERSION,
+                "created": time.time(),
+                "nameservers": list(transport.nameservers),
+            }
+        )
+
+    @property
+    def nameservers(self) -> list[str]:
+        """Return the nameservers of the wrapped transport."""
+        return self.transport.nameservers
+
+    def _write(self, data: dict[str, Any]) -> None:
+        """Append one JSON line to the trace."""
+        self._file.write(json.dumps(data, separators=(",", ":")) + "\n")
+
+    def _record(
+        self, request: dns.message.Message, latency: float, **kwargs: Any
+    ) -> None:
+        """Append the record of one exchange."""
+        qname, rdtype = _question_key(request)
+        self._write(TraceRecord(qname, rdtype, latency, **kwargs).to_dict())
+        self.records += 1
+
+    async def query(self, request: dns.message.Message) -> dns.message.Message:
+        """Send a query through the wrapped transport and record it."""
+        start = time.perf_counter()
+        try:
+            response = await self.transport.query(request)
+        except asyncio.TimeoutError:
+            self._record(request, time.perf_counter() - start, error=TIMEOUT)
+            raise
+        except (ConnectionError, OSError):
+            self._record(request, time.perf_counter() - start, error=CONNECTION_ERROR)
+            raise
+        self._record(request, time.perf_counter() - start, wire=response.to_wire())
+        return response
+
+    async def aclose(self) -> None:
+        """Close the wrapped transport and finish the trace file."""
+        try:
+            await self.transport.aclose()
+        finally:
+            if not self._file.closed:
+                self._file.close()
+                logger.info(
+                    "Recorded %d DNS exchange(s) to %s", self.records, self.path
+                )
+
+
+@dataclass
+class ReplayStats:
+    """Counters of a replay.
+
+    Attributes:
+        replayed: Queries answered from the trace.
+        missing: Queries with no record in the trace.
+    """
+
+    replayed: int = 0
+    missing: int = 0
+
+
+class ReplayTransport:
+    """Transport that answers queries from a recorded trace.
+
+    A name queried several times during recording is replayed with its
+    recorded exchanges in turn, starting over after the last one. Queries
+    missing from the trace fail with ConnectionError and are counted in
+    :attr:`stats`.
+    """
+
+    def __init__(
+        self,
+        trace: str | os.PathLike[str],
+        speed: float = 1.0,
+    ) -> None:
+        """Load a trace.
+
+        Args:
+            trace: Path to a trace file written by RecordingTransport.
+            speed: Factor applied to recorded latencies; 0.5 replays twice
+                as fast, 0 answers immediately.
+        """
+        if speed < 0:
+            raise ValueError("speed must not be negative")
+
+        header, records = load_trace(trace)
+        self.nameservers: list[str] = list(header.get("nameservers") or ["replay"])
+        self.speed = speed
+        self.stats = ReplayStats()
+        self._records: dict[tuple[str, str], deque[TraceRecord]] = {}
+        for record in records:
+            self._records.setdefault(record.key, deque()).append(record)
+
+    def __len__(self) -> int:
+        """Return the number of distinct questions in the trace."""
+        return len(self._records)
+
+    def latencies(self) -> list[float]:
+        """Return the recorded latencies of every exchange, in seconds."""
+        return [record.latency for queue in self._records.values() for record in queue]
+
+    async def query(self, request: dns.message.Message) -> dns.message.Message:
+        """Answer a query with its next recorded exchange.
+
+        Raises:
+            asyncio.TimeoutError: If the recorded exchange timed out.
+            ConnectionError: If it failed, or the question is not in the trace.
+        """
+        queue = self._records.get(_question_key(request))
+        if not queue:
+            self.stats.missing += 1
+            raise ConnectionError(f"{request.question[0].name} is not in the trace")
+
+        record = queue[0]
+        queue.rotate(-1)
+        self.stats.replayed += 1
+        if self.speed:
+            await asyncio.sleep(record.latency * self.speed)
+
+        if record.error == TIMEOUT:
+            raise asyncio.TimeoutError
+        if record.wire is None:
+            raise ConnectionError(f"Recorded failure for {request.question[0].name}")
+
+        response = dns.message.from_wire(record.wire)
+        response.id = request.id
+        return response
+
+    async def aclose(self) -> None:
+        """Release nothing; a replay holds no connections."""
@@ -0,0 +1,850 @@
+"""Pluggable DNS transports for DomainChecker.
+
+By default DomainChecker sends queries through dnspython's async
+resolver, which uses UDP and opens a separate TCP connection for every
+truncated reply. On networks that drop or throttle UDP this is slow, and
+at high query rates a burst of replies can overflow the kernel's default
+socket buffer, so this module provides alternative transports:
+
+* :class:`PooledTCPTransport` keeps a small pool of persistent
+  DNS-over-TCP (RFC 7766) or DNS-over-TLS (RFC 7858) connections per
+  nameserver and pipelines many length-prefixed queries over each one.
+  Responses are matched to queries by message ID, so they may arrive in
+  any order.
+* :class:`PooledUDPTransport` spreads queries over a fixed pool of UDP
+  sockets bound to random source ports, with enlarged receive and send
+  buffers and a limit on outstanding queries per socket. It counts the
+  replies the kernel dropped separately from queries that timed out.
+* :class:`TransportResolver` adapts any :class:`Transport` to the
+  ``resolve(qname, rdtype)`` interface DomainChecker expects, raising the
+  same dnspython exceptions as the stock resolver.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import errno
+import ipaddress
+import logging
+import os
+import random
+import socket
+import ssl
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Protocol
+
+import dns.flags
+import dns.message
+import dns.rcode
+from dns import exception, resolver
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+logger = logging.getLogger(__name__)
+
+# Default ports
+DEFAULT_TCP_PORT = 53
+DEFAULT_TLS_PORT = 853
+
+# Default pool settings
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_PIPELINE = 128
+DEFAULT_IDLE_TIMEOUT = 30.0
+DEFAULT_CONNECT_TIMEOUT = 5.0
+
+# Default UDP pool settings
+DEFAULT_UDP_PORT = 53
+DEFAULT_UDP_SOCKETS = 4
+DEFAULT_MAX_OUTSTANDING = 256
+DEFAULT_UDP_TIMEOUT = 2.0
+DEFAULT_UDP_ATTEMPTS = 2
+
+# Default socket buffer sizes (bytes); the kernel caps them at
+# net.core.rmem_max / net.core.wmem_max
+DEFAULT_RCVBUF = 4 << 20
+DEFAULT_SNDBUF = 1 << 20
+
+# Range of random source ports and attempts to find a free one
+_SOURCE_PORTS = (1024, 65535)
+_BIND_ATTEMPTS = 16
+
+# Per-socket UDP statistics of the Linux kernel, by address family
+_PROC_NET_UDP = {socket.AF_INET: "/proc/net/udp", socket.AF_INET6: "/proc/net/udp6"}
+
+
+class Transport(Protocol):
+    """Sends DNS query messages and returns the matching responses."""
+
+    nameservers: list[str]
+
+    async def query(self, request: dns.message.Message) -> dns.message.Message:
+        """Send a query and return its response."""
+
+    async def aclose(self) -> None:
+        """Release all resources held by the transport."""
+
+
+class _PipelinedConnection:
+    """One persistent stream connection carrying pipelined queries."""
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        idle_timeout: float,
+    ) -> None:
+        self._reader = reader
+        self._writer = writer
+        self._idle_timeout = idle_timeout
+        self._write_lock = asyncio.Lock()
+        self._pending: dict[
+            int, tuple[dns.message.Message, asyncio.Future[dns.message.Message]]
+        ] = {}
+        self._idle_handle: asyncio.TimerHandle | None = None
+        self._closed = False
+        self._read_task = asyncio.create_task(self._read_loop())
+        self._arm_idle_timer()
+
+    @classmethod
+    async def open(
+        cls,
+        host: str,
+        port: int,
+        ssl_context: ssl.SSLContext | None,
+        server_hostname: str | None,
+        *,
+        idle_timeout: float,
+        connect_timeout: float,
+    ) -> _PipelinedConnection:
+        """Connect to a nameserver."""
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                host,
+                port,
+                ssl=ssl_context,
+                server_hostname=server_hostname if ssl_context else None,
+            ),
+            connect_timeout,
+        )
+        logger.debug(
+            "Opened %s connection to %s:%d", "TLS" if ssl_context else "TCP", host, port
+        )
+        return cls(reader, writer, idle_timeout)
+
+    @property
+    def closed(self) -> bool:
+        """Return True once the connection can no longer be used."""
+        return self._closed
+
+    @property
+    def load(self) -> int:
+        """Return the number of queries awaiting a response."""
+        return len(self._pending)
+
+    def _arm_idle_timer(self) -> None:
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+        self._idle_handle = asyncio.get_running_loop().call_later(
+            self._idle_timeout, self._on_idle
+        )
+
+    def _on_idle(self) -> None:
+        if not self._pending:
+            logger.debug("Closing idle DNS connection")
+            self.close()
+
+    async def query(self, request: dns.message.Message) -> dns.message.Message:
+        """Send a query over this connection and wait for its response."""
+        if self._closed:
+            raise ConnectionError("DNS connection is closed")
+
+        while request.id in self._pending:
+            request.id = random.randint(0, 0xFFFF)
+
+        future: asyncio.Future[dns.message.Message] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._pending[request.id] = (request, future)
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+
+        try:
+            wire = request.to_wire()
+            async with self._write_lock:
+                self._writer.write(len(wire).to_bytes(2, "big") + wire)
+                await self._writer.drain()
+            return await future
+        finally:
+            self._pending.pop(request.id, None)
+            if not self._pending and not self._closed:
+                self._arm_idle_timer()
+
+    async def _read_loop(self) -> None:
+        error: Exception = ConnectionError("DNS connection closed by server")
+        try:
+            while True:
+                length = int.from_bytes(await self._reader.readexactly(2), "big")
+                wire = await self._reader.readexactly(length)
+                try:
+                    response = dns.message.from_wire(wire)
+                except exception.DNSException as e:
+                    logger.debug("Discarding malformed DNS response: %s", e)
+                    continue
+
+                entry = self._pending.get(response.id)
+                if entry is None:
+                    logger.debug("Discarding unexpected response id %d", response.id)
+                    continue
+                request, future = entry
+                if not future.done() and request.is_response(response):
+                    future.set_result(response)
+        except asyncio.IncompleteReadError:
+            pass
+        except (ConnectionError, OSError) as e:
+            error = ConnectionError(f"DNS connection failed: {e}")
+        finally:
+            self._fail_pending(error)
+            self.close()
+
+    def _fail_pending(self, error: Exception) -> None:
+        for _, future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def close(self) -> None:
+        """Close the connection and fail any queries still waiting."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._idle_handle is not None:
+            self._idle_handle.cancel()
+        self._fail_pending(ConnectionError("DNS connection closed"))
+        self._writer.close()
+        if self._read_task is not asyncio.current_task():
+            self._read_task.cancel()
+
+    async def aclose(self) -> None:
+        """Close the connection and wait for it to shut down."""
+        self.close()
+        with contextlib.suppress(asyncio.CancelledError, ConnectionError, OSError):
+            await self._read_task
+        with contextlib.suppress(ConnectionError, OSError, ssl.SSLError):
+            await self._writer.wait_closed()
+
+
+class PooledTCPTransport:
+    """Pooled, pipelined DNS-over-TCP or DNS-over-TLS transport.
+
+    Each nameserver gets up to ``pool_size`` persistent connections, and
+    each connection carries up to ``max_pipeline`` outstanding queries.
+    Connections are opened lazily, closed after ``idle_timeout`` seconds
+    without outstanding queries and transparently re-established when the
+    server closes them.
+
+    Example:
+        >>> transport = PooledTCPTransport(["1.1.1.1"], tls=True,
+        ...                                server_hostname="one.one.one.one")
+        >>> checker = DomainChecker(transport=transport)
+    """
+
+    # One keyword-only parameter per tuning knob, each documented below
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        nameservers: Sequence[str],
+        *,
+        port: int | None = None,
+        tls: bool = False,
+        ssl_context: ssl.SSLContext | None = None,
+        server_hostname: str | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        max_pipeline: int = DEFAULT_MAX_PIPELINE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+    ) -> None:
+        """Initialize the transport.
+
+        Args:
+            nameservers: Nameserver addresses, tried in order.
+            port: Server port. Defaults to 53, or 853 with TLS.
+            tls: If True, use DNS-over-TLS.
+            ssl_context: Custom SSL context for TLS. Defaults to a
+                verifying context from ``ssl.create_default_context()``.
+            server_hostname: Name used for TLS certificate verification.
+                Defaults to the nameserver address.
+            pool_size: Maximum connections per nameserver.
+            max_pipeline: Outstanding queries per connection before
+                another connection is opened.
+            idle_timeout: Seconds before an unused connection is closed.
+            connect_timeout: Seconds allowed for connecting.
+        """
+        if not nameservers:
+            raise ValueError("At least one nameserver is required")
+        if pool_size < 1 or max_pipeline < 1:
+            raise ValueError("pool_size and max_pipeline must be at least 1")
+
+        tls = tls or ssl_context is not None
+        self.nameservers = list(nameservers)
+        self.port = port or (DEFAULT_TLS_PORT if tls else DEFAULT_TCP_PORT)
+        self.ssl_context = (
+            (ssl_context or ssl.create_default_context()) if tls else None
+        )
+        self.server_hostname = server_hostname
+        self.pool_size = pool_size
+        self.max_pipeline = max_pipeline
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self._pools: dict[str, list[_PipelinedConnection]] = {
+            ns: [] for ns in self.nameservers
+        }
+        self._connecting: dict[str, asyncio.Task[_PipelinedConnection]] = {}
+
+    @property
+    def tls(self) -> bool:
+        """Return True if the transport uses DNS-over-TLS."""
+        return self.ssl_context is not None
+
+    def connections(self, nameserver: str) -> int:
+        """Return the number of open connections to a nameserver."""
+        return sum(not conn.closed for conn in self._pools.get(nameserver, ()))
+
+    async def _connection(self, nameserver: str) -> _PipelinedConnection:
+        """Pick the least loaded connection, opening one when saturated."""
+        while True:
+            pool = [conn for conn in self._pools[nameserver] if not conn.closed]
+            self._pools[nameserver] = pool
+
+            best = min(pool, key=lambda conn: conn.load, default=None)
+            if best is not None and (
+                best.load < self.max_pipeline or len(pool) >= self.pool_size
+            ):
+                return best
+
+            # Share one in-progress connect between concurrent callers, then
+            # re-evaluate: the new connection may already be saturated.
+            task = self._connecting.get(nameserver)
+            if task is None:
+                task = asyncio.create_task(self._open(nameserver))
+                self._connecting[nameserver] = task
+            await asyncio.shield(task)
+
+    async def _open(self, nameserver: str) -> _PipelinedConnection:
+        """Open a new connection and add it to the pool."""
+        try:
+            conn = await _PipelinedConnection.open(
+                nameserver,
+                self.port,
+                self.ssl_context,
+                self.server_hostname or nameserver,
+                idle_timeout=self.idle_timeout,
+                connect_timeout=self.connect_timeout,
+            )
+            self._pools[nameserver].append(conn)
+            return conn
+        finally:
+            self._connecting.pop(nameserver, None)
+
+    async def query(self, request: dns.message.Message) -> dns.message.Message:
+        """Send a query, trying each nameserver in order.
+
+        A query whose connection drops is retried once on a fresh
+        connection before moving on to the next nameserver.
+
+        Raises:
+            ConnectionError: If no nameserver could answer.
+        """
+        errors: list[str] = []
+        for nameserver in self.nameservers:
+            for _ in range(2):
+                try:
+                    conn = await self._connection(nameserver)
+                    return await conn.query(request)
+                except (ConnectionError, OSError, asyncio.TimeoutError) as e:
+                    errors.append(f"{nameserver}: {e or type(e).__name__}")
+        raise ConnectionError("; ".join(errors))
+
+    async def aclose(self) -> None:
+        """Close every pooled connection."""
+        for task in list(self._connecting.values()):
+            task.cancel()
+        self._connecting.clear()
+        conns = [conn for pool in self._pools.values() for conn in pool]
+        for pool in self._pools.values():
+            pool.clear()
+        await asyncio.gather(*(conn.aclose() for conn in conns))
+
+
+@dataclass
+class UDPStats:
+    """Counters describing a UDP transport's traffic.
+
+    Attributes:
+        sent: Queries sent.
+        received: Responses matched to a waiting query.
+        timeouts: Queries that got no response in time.
+        unmatched: Datagrams that matched no waiting query (late replies
+            to timed-out queries, or spoofing attempts).
+        truncated: Truncated responses (handed to the fallback, if any).
+        kernel_drops: Datagrams the kernel dropped because a socket's
+            receive buffer was full, or None where the platform does not
+            report it. Timeouts beyond this count were lost upstream.
+    """
+
+    sent: int = 0
+    received: int = 0
+    timeouts: int = 0
+    unmatched: int = 0
+    truncated: int = 0
+    kernel_drops: int | None = None
+
+
+class _UDPProtocol(asyncio.DatagramProtocol):
+    """Forwards datagram events to the owning socket."""
+
+    def __init__(self, owner: _UDPSocket) -> None:
+        self._owner = owner
+
+    def datagram_received(self, data: bytes, addr: tuple[Any, ...]) -> None:
+        self._owner.received(data, addr)
+
+    def error_received(self, exc: Exception) -> None:
+        logger.debug("UDP socket error: %s", exc)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        if exc is not None:
+            logger.debug("UDP socket lost: %s", exc)
+        self._owner.close()
+
+
+def _address_key(host: str) -> str:
+    """Return the canonical text form of an IP address."""
+    return ipaddress.ip_address(host.split("%", 1)[0]).compressed
+
+
+def _bind_random_port(sock: socket.socket, rng: random.Random) -> None:
+    """Bind a socket to a random unprivileged source port."""
+    # An empty host is the wildcard address of either family
+    host = ""
+    for _ in range(_BIND_ATTEMPTS):
+        try:
+            sock.bind((host, rng.randint(*_SOURCE_PORTS)))
+            return
+        except OSError as e:
+            if e.errno not in (errno.EADDRINUSE, errno.EACCES):
+                raise
+    # Fall back to the kernel's (also randomized) ephemeral port choice.
+    sock.bind((host, 0))
+
+
+class _UDPSocket:
+    """One UDP socket with its own table of outstanding queries."""
+
+    def __init__(self, sock: socket.socket, stats: UDPStats) -> None:
+        self.sock = sock
+        self.port: int = sock.getsockname()[1]
+        self._stats = stats
+        self._transport: asyncio.DatagramTransport | None = None
+        self._pending: dict[
+            tuple[int, str, int],
+            tuple[dns.message.Message, asyncio.Future[dns.message.Message]],
+        ] = {}
+        self._closed = False
+
+    @classmethod
+    async def open(
+        cls,
+        family: int,
+        rcvbuf: int | None,
+        sndbuf: int | None,
+        stats: UDPStats,
+        rng: random.Random,
+    ) -> _UDPSocket:
+        """Create, tune and bind a socket and attach it to the loop."""
+        sock = socket.socket(family, socket.SOCK_DGRAM)
+        try:
+            if rcvbuf:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+            if sndbuf:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf)
+            _bind_random_port(sock, rng)
+            udp = cls(sock, stats)
+            loop = asyncio.get_running_loop()
+            udp._transport, _ = await loop.create_datagram_endpoint(
+                lambda: _UDPProtocol(udp), sock=sock
+            )
+        except BaseException:
+            sock.close()
+            raise
+
+        if rcvbuf and sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) < rcvbuf:
+            logger.warning(
+                "UDP receive buffer capped at %d bytes (requested %d); "
+                "raise net.core.rmem_max to avoid drops",
+                sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF),
+                rcvbuf,
+            )
+        logger.debug("Opened UDP socket on port %d", udp.port)
+        return udp
+
+    @property
+    def closed(self) -> bool:
+        """Return True once the socket can no longer be used."""
+        return self._closed
+
+    @property
+    def load(self) -> int:
+        """Return the number of queries awaiting a response."""
+        return len(self._pending)
+
+    async def query(
+        self, request: dns.message.Message, host: str, port: int, timeout: float
+    ) -> dns.message.Message:
+        """Send a query to a nameserver and wait for its response."""
+        if self._closed or self._transport is None:
+            raise ConnectionError("UDP socket is closed")
+
+        key = (request.id, _address_key(host), port)
+        while key in self._pending:
+            request.id = random.randint(0, 0xFFFF)
+            key = (request.id, key[1], port)
+
+        future: asyncio.Future[dns.message.Message] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._pending[key] = (request, future)
+        try:
+            self._transport.sendto(request.to_wire(), (host, port))
+            self._stats.sent += 1
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self._stats.timeouts += 1
+            raise
+        finally:
+            self._pending.pop(key, None)
+
+    def received(self, data: bytes, addr: tuple[Any, ...]) -> None:
+        """Match a datagram to the query waiting for it."""
+        try:
+            response = dns.message.from_wire(data)
+            key = (response.id, _address_key(addr[0]), addr[1])
+        except (exception.DNSException, ValueError) as e:
+            logger.debug("Discarding malformed UDP datagram: %s", e)
+            self._stats.unmatched += 1
+            return
+
+        entry = self._pending.get(key)
+        if entry is None or entry[1].done() or not entry[0].is_response(response):
+            self._stats.unmatched += 1
+            return
+        self._stats.received += 1
+        entry[1].set_result(response)
+
+    def kernel_drops(self) -> int | None:
+        """Return the datagrams the kernel dropped on this socket, if known."""
+        path = _PROC_NET_UDP.get(self.sock.family)
+        if path is None or self.sock.fileno() < 0:
+            return None
+        try:
+            inode = os.fstat(self.sock.fileno()).st_ino
+            with open(path, encoding="ascii") as fh:
+                next(fh)
+                for line in fh:
+                    fields = line.split()
+                    if int(fields[9]) == inode:
+                        return int(fields[12])
+        except (OSError, ValueError, IndexError, StopIteration):
+            return None
+        return None
+
+    def close(self) -> None:
+        """Close the socket and fail any queries still waiting."""
+        if self._closed:
+            return
+        self._closed = True
+        for _, future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("UDP socket closed"))
+        if self._transport is not None:
+            self._transport.close()
+        else:
+            self.sock.close()
+
+
+# Socket tuning options and per-family pool state are kept side by side
+class PooledUDPTransport:  # pylint: disable=too-many-instance-attributes
+    """DNS-over-UDP transport using a managed pool of sockets.
+
+    Each address family gets ``sockets`` UDP sockets, each bound to a
+    random source port and tuned with ``SO_RCVBUF``/``SO_SNDBUF``.
+    Queries go to a random socket that has fewer than
+    ``max_outstanding`` queries in flight; when every socket is full,
+    new queries wait. Spreading replies over several sockets and larger
+    buffers keeps bursts from overflowing the kernel queue, and the
+    random ports and message IDs make responses hard to spoof.
+
+    :attr:`stats` tells kernel drops (receive buffer overflows) apart
+    from replies that never arrived.
+
+    Example:
+        >>> transport = PooledUDPTransport(["8.8.8.8"], sockets=8)
+        >>> checker = DomainChecker(transport=transport)
+        >>> ...
+        >>> print(transport.stats)
+    """
+
+    # One keyword-only parameter per tuning knob, each documented below
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        nameservers: Sequence[str],
+        *,
+        port: int = DEFAULT_UDP_PORT,
+        sockets: int = DEFAULT_UDP_SOCKETS,
+        max_outstanding: int = DEFAULT_MAX_OUTSTANDING,
+        rcvbuf: int | None = DEFAULT_RCVBUF,
+        sndbuf: int | None = DEFAULT_SNDBUF,
+        timeout: float = DEFAULT_UDP_TIMEOUT,
+        attempts: int = DEFAULT_UDP_ATTEMPTS,
+        fallback: Transport | None = None,
+    ) -> None:
+        """Initialize the transport.
+
+        Args:
+            nameservers: Nameserver addresses, tried in order.
+            port: Server port.
+            sockets: Number of sockets per address family.
+            max_outstanding: Queries in flight per socket.
+            rcvbuf: ``SO_RCVBUF`` size in bytes, or None for the system
+                default.
+            sndbuf: ``SO_SNDBUF`` size in bytes, or None for the system
+                default.
+            timeout: Seconds to wait for each response.
+            attempts: Rounds through the nameserver list before giving
+                up; every round re-sends the query.
+            fallback: Optional stream transport (for example a
+                PooledTCPTransport) that re-sends truncated queries. It
+                is closed with this transport.
+        """
+        if not nameservers:
+            raise ValueError("At least one nameserver is required")
+        if sockets < 1 or max_outstanding < 1 or attempts < 1:
+            raise ValueError("sockets, max_outstanding and attempts must be at least 1")
+
+        self.nameservers = list(nameservers)
+        self.port = port
+        self.sockets = sockets
+        self.max_outstanding = max_outstanding
+        self.rcvbuf = rcvbuf
+        self.sndbuf = sndbuf
+        self.timeout = timeout
+        self.attempts = attempts
+        self.fallback = fallback
+        self._stats = UDPStats()
+        self._families = {
+            ns: socket.AF_INET6 if ":" in ns else socket.AF_INET
+            for ns in self.nameservers
+        }
+        self._pools: dict[int, list[_UDPSocket]] = {}
+        self._slots: dict[int, asyncio.Semaphore] = {}
+        self._opening: dict[int, asyncio.Lock] = {}
+        self._rng = random.SystemRandom()
+        self._retired_drops = 0
+
+    @property
+    def stats(self) -> UDPStats:
+        """Return a snapshot of the counters, including kernel drops."""
+        return replace(self._stats, kernel_drops=self.kernel_drops())
+
+    def kernel_drops(self) -> int | None:
+        """Return the datagrams the kernel dropped on this transport's sockets.
+
+        Returns:
+            The total since the sockets were opened, or None where the
+            platform does not expose per-socket drop counters.
+        """
+        counts = [
+            sock.kernel_drops()
+            for pool in self._pools.values()
+            for sock in pool
+            if not sock.closed
+        ]
+        known = [count for count in counts if count is not None]
+        if counts and not known:
+            return None
+        return self._retired_drops + sum(known)
+
+    def source_ports(self) -> list[int]:
+        """Return the local ports of the open sockets."""
+        return [
+            sock.port
+            for pool in self._pools.values()
+            for sock in pool
+            if not sock.closed
+        ]
+
+    async def _pool(self, family: int) -> list[_UDPSocket]:
+        """Return the open sockets of an address family, (re)opening them."""
+        pool = self._pools.get(family, [])
+        if len(pool) == self.sockets and not any(sock.closed for sock in pool):
+            return pool
+
+        lock = self._opening.setdefault(family, asyncio.Lock())
+        async with lock:
+            pool = [sock for sock in self._pools.get(family, []) if not sock.closed]
+            while len(pool) < self.sockets:
+                pool.append(
+                    await _UDPSocket.open(
+                        family, self.rcvbuf, self.sndbuf, self._stats, self._rng
+                    )
+                )
+            self._pools[family] = pool
+        return pool
+
+    async def _query_one(
+        self, request: dns.message.Message, nameserver: str
+    ) -> dns.message.Message:
+        """Send a query to one nameserver through the least busy sockets."""
+        family = self._families[nameserver]
+        slots = self._slots.get(family)
+        if slots is None:
+            slots = self._slots[family] = asyncio.Semaphore(
+                self.sockets * self.max_outstanding
+            )
+
+        async with slots:
+            pool = await self._pool(family)
+            free = [sock for sock in pool if sock.load < self.max_outstanding]
+            sock = self._rng.choice(free or pool)
+            return await sock.query(request, nameserver, self.port, self.timeout)
+
+    async def query(self, request: dns.message.Message) -> dns.message.Message:
+        """Send a query, trying each nameserver in order.
+
+        Raises:
+            asyncio.TimeoutError: If no nameserver answered in time.
+            ConnectionError: If the query could not be sent.
+        """
+        errors: list[str] = []
+        timed_out = True
+        for nameserver in self.nameservers * self.attempts:
+            try:
+                response = await self._query_one(request, nameserver)
+            except asyncio.TimeoutError:
+                errors.append(f"{nameserver}: timeout")
+                continue
+            except (ConnectionError, OSError) as e:
+                errors.append(f"{nameserver}: {e or type(e).__name__}")
+                timed_out = False
+                continue
+
+            if response.flags & dns.flags.TC:
+                self._stats.truncated += 1
+                if self.fallback is not None:
+                    return await self.fallback.query(request)
+            return response
+
+        if timed_out:
+            raise asyncio.TimeoutError("; ".join(errors))
+        raise ConnectionError("; ".join(errors))
+
+    async def aclose(self) -> None:
+        """Close every socket (and the fallback transport).
+
+        The per-family semaphores and locks are dropped too, so the
+        transport can be reused from another event loop.
+        """
+        drops = self.kernel_drops()
+        self._retired_drops = drops or 0
+        for pool in self._pools.values():
+            for sock in pool:
+                sock.close()
+        self._pools.clear()
+        self._slots.clear()
+        self._opening.clear()
+        if self.fallback is not None:
+            await self.fallback.aclose()
+
+
+class TransportResolver:
+    """Resolver facade that sends queries through a :class:`Transport`.
+
+    Mirrors the parts of ``dns.asyncresolver.Resolver`` used by
+    DomainChecker, including the exceptions it raises.
+    """
+
+    def __init__(self, transport: Transport, lifetime: float = 5.0) -> None:
+        """Initialize the resolver.
+
+        Args:
+            transport: Transport used to send queries.
+            lifetime: Total seconds allowed per resolution.
+        """
+        self.transport = transport
+        self.lifetime = lifetime
+
+    @property
+    def nameservers(self) -> list[str]:
+        """Return the nameservers of the underlying transport."""
+        return self.transport.nameservers
+
+    async def resolve(self, qname: str, rdtype: str = "A") -> resolver.Answer:
+        """Resolve a name and return the answer.
+
+        Raises:
+            dns.resolver.NXDOMAIN: If the name does not exist.
+            dns.resolver.NoAnswer: If there is no record of the type.
+            dns.resolver.NoNameservers: If the servers fail or are unreachable.
+            dns.exception.Timeout: If the lifetime expires.
+        """
+        request = dns.message.make_query(qname, rdtype)
+
+        try:
+            response = await asyncio.wait_for(
+                self.transport.query(request), self.lifetime
+            )
+        except asyncio.TimeoutError:
+            raise exception.Timeout(timeout=self.lifetime) from None
+        except (ConnectionError, OSError) as e:
+            raise resolver.NoNameservers(request=request, errors=[]) from e
+
+        return answer_from_response(request, response)
+
+
+def answer_from_response(
+    request: dns.message.Message,
+    response: dns.message.Message,
+    nameserver: str | None = None,
+) -> resolver.Answer:
+    """Convert a raw response into a resolver Answer.
+
+    Raises the same exceptions as ``dns.asyncresolver.Resolver.resolve``
+    for NXDOMAIN, error rcodes and empty answers.
+
+    Args:
+        request: The query that was sent.
+        response: The response received for it.
+        nameserver: Address of the server that answered, if known.
+    """
+    question = request.question[0]
+    rcode = response.rcode()
+    if rcode == dns.rcode.NXDOMAIN:
+        raise resolver.NXDOMAIN(
+            qnames=[question.name], responses={question.name: response}
+        )
+    if rcode != dns.rcode.NOERROR:
+        raise resolver.NoNameservers(
+            request=request,
+            errors=[(nameserver, False, 0, dns.rcode.to_text(rcode), response)],
+        )
+
+    answer = resolver.Answer(
+        question.name,
+        question.rdtype,
+        question.rdclass,
+        response,  # type: ignore[arg-type]
+        nameserver,
+    )
+    if answer.rrset is None:
+        raise resolver.NoAnswer(response=response)
+    return answer
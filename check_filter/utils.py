@@ -8,25 +8,64 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import re
+import time
 from typing import TYPE_CHECKING
 
-import validators
 from rich import print as rich_print
 from rich.live import Live
 from rich.table import Table
 
-from check_filter.check import CheckResult, DomainChecker, FilterStatus
+from check_filter.check import (
+    CheckResult,
+    DomainChecker,
+    FilterStatus,
+    get_default_checker,
+)
+from check_filter.inputs import iter_domains
+from check_filter.validation import (
+    DOMAIN_PATTERN,
+    REASON_EMPTY,
+    REASON_SYNTAX,
+    REASON_WHITESPACE,
+    check_domain,
+    validate_batch,
+    validate_file,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    import os
+    from collections.abc import AsyncIterator, Iterable
+
+    from check_filter.history import DomainState, StatusChange
+    from check_filter.journal import ScanJournal
+    from check_filter.memtrace import AllocationSite, MemoryReport
+    from check_filter.scheduler import PriorityScheduler
+    from check_filter.sinks import ResultFanOut
+    from check_filter.stats import ScanStats
+    from check_filter.validation import ValidationReport
+
+__all__ = [
+    # Moved to check_filter.validation; kept here for backward compatibility
+    "DOMAIN_PATTERN",
+    "MAX_REPORTED_INVALID",
+    "validate_domain",
+    "validate_domains",
+    "validate_domain_file",
+    "format_status",
+    "create_results_table",
+    "print_result",
+    "print_stats",
+    "print_memory_report",
+    "print_history_summary",
+    "print_domain_state",
+    "print_changes",
+    "read_domains_from_file",
+]
 
 logger = logging.getLogger(__name__)
 
-# Regex pattern for basic domain validation
-DOMAIN_PATTERN = re.compile(
-    r"^(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}$"
-)
+# Maximum number of invalid domains listed individually in verbose mode
+MAX_REPORTED_INVALID = 10
 
 
 def validate_domain(domain: str, verbose: bool = True) -> bool:
@@ -45,48 +84,75 @@ def validate_domain(domain: str, verbose: bool = True) -> bool:
         >>> validate_domain("invalid")
         False
     """
-    if not domain or not isinstance(domain, str):
-        if verbose:
-            rich_print("[red]Domain cannot be empty![/red]")
-        return False
-
-    domain = domain.strip()
+    _, reason = check_domain(domain)
 
-    if not domain:
-        if verbose:
+    if reason is not None and verbose:
+        if reason == REASON_EMPTY:
+            rich_print("[red]Domain cannot be empty![/red]")
+        elif reason == REASON_WHITESPACE:
             rich_print("[red]Domain cannot be empty or whitespace only![/red]")
-        return False
-
-    is_valid = validators.domain(domain)
-
-    if not is_valid and verbose:
-        rich_print(f"[red]The `{domain}` is not a valid domain name![/red]")
+        elif reason == REASON_SYNTAX:
+            rich_print(
+                f"[red]The `{str(domain).strip()}` is not a valid domain name![/red]"
+            )
+        else:
+            rich_print(f"[red]The `{str(domain).strip()}` is invalid: {reason}[/red]")
 
-    return bool(is_valid)
+    return reason is None
 
 
 def validate_domains(
-    domains: Iterable[str], verbose: bool = True
+    domains: Iterable[str], verbose: bool = True, processes: int = 1
 ) -> tuple[list[str], list[str]]:
     """Validate multiple domain names.
 
+    Valid domains are returned normalized (lowercase, IDNA-encoded).
+    Errors are collected and, in verbose mode, reported once as a summary
+    instead of printing a line per invalid domain.
+
     Args:
         domains: Iterable of domain names to validate.
-        verbose: If True, print error messages for invalid domains.
+        verbose: If True, print a summary of invalid domains.
+        processes: Number of worker processes used for validation.
 
     Returns:
         Tuple of (valid_domains, invalid_domains) lists.
     """
-    valid: list[str] = []
-    invalid: list[str] = []
+    report = validate_batch(domains, processes=processes)
+    if verbose:
+        _print_invalid(report)
+    return report.valid, report.invalid
 
-    for domain in domains:
-        if validate_domain(domain, verbose=verbose):
-            valid.append(domain.strip())
-        else:
-            invalid.append(domain.strip() if domain else "")
 
-    return valid, invalid
+def validate_domain_file(
+    path: str | os.PathLike[str], verbose: bool = True, processes: int | None = None
+) -> ValidationReport:
+    """Parse and validate a large plain domain file in parallel.
+
+    The file is memory-mapped and split between worker processes (see
+    :func:`check_filter.validation.validate_file`).
+
+    Args:
+        path: Path to an uncompressed domain file.
+        verbose: If True, print a summary of invalid domains.
+        processes: Number of worker processes; defaults to the CPU count.
+
+    Returns:
+        The ValidationReport, including priorities from a second column.
+    """
+    report = validate_file(path, processes=processes)
+    if verbose:
+        _print_invalid(report)
+    return report
+
+
+def _print_invalid(report: ValidationReport) -> None:
+    """Print the first invalid domains of a report and a count of the rest."""
+    for error in report.errors[:MAX_REPORTED_INVALID]:
+        rich_print(f"[red]The `{error.domain}` is invalid: {error.reason}[/red]")
+    remaining = len(report.errors) - MAX_REPORTED_INVALID
+    if remaining > 0:
+        rich_print(f"[red]... and {remaining} more invalid domain(s)[/red]")
 
 
 def format_status(result: CheckResult) -> tuple[str, str]:
@@ -103,6 +169,8 @@ def format_status(result: CheckResult) -> tuple[str, str]:
         FilterStatus.BLOCKED: ("[red]Blocked[/red] :x:", "[red]"),
         FilterStatus.ERROR: ("[yellow]Error[/yellow] :warning:", "[yellow]"),
         FilterStatus.UNKNOWN: ("[dim]Unknown[/dim] :question:", "[dim]"),
+        FilterStatus.UNCHECKED: ("[dim]Unchecked[/dim] :hourglass:", "[dim]"),
+        FilterStatus.TAMPERED: ("[magenta]Tampered[/magenta] :mag:", "[magenta]"),
     }
 
     status_text, domain_color = status_formats.get(
@@ -132,58 +200,266 @@ def create_results_table(title: str = "Check Result") -> Table:
     return table
 
 
-async def print_result(
+async def _as_completed(
+    checker: DomainChecker, domains: list[str]
+) -> AsyncIterator[CheckResult]:
+    """Start a check for every domain and yield results as they complete."""
+    tasks = {
+        asyncio.create_task(
+            checker.acheck(d),
+            name=f"check-{d}",
+        )
+        for d in domains
+    }
+    for future in asyncio.as_completed(tasks):
+        yield await future
+
+
+def _result_stream(
+    checker: DomainChecker,
+    domains: list[str],
+    time_budget: float | None,
+    scheduler: PriorityScheduler | None,
+) -> AsyncIterator[CheckResult]:
+    """Return the results of a scan in the order they should be shown."""
+    if time_budget is None and scheduler is None:
+        return _as_completed(checker, domains)
+    ordered = scheduler.order(domains) if scheduler is not None else domains
+    return checker.acheck_iter(ordered, time_budget=time_budget)
+
+
+# Every option is keyword-only and optional; see the Args section.
+async def print_result(  # pylint: disable=too-many-arguments
     domains: list[str],
     checker: DomainChecker | None = None,
     show_progress: bool = True,
+    *,
+    journal: ScanJournal | None = None,
+    time_budget: float | None = None,
+    scheduler: PriorityScheduler | None = None,
+    stats: ScanStats | None = None,
+    sinks: ResultFanOut | None = None,
 ) -> list[CheckResult]:
     """Check domains and print results in a formatted table.
 
     Args:
         domains: List of domain names to check.
-        checker: Optional DomainChecker instance. Creates one if not provided.
+        checker: Optional DomainChecker instance. Defaults to the shared
+            process-wide checker (see ``get_default_checker``).
         show_progress: If True, show live updates as results come in.
+        journal: Optional ScanJournal that records every completed result.
+        time_budget: Optional wall-clock budget in seconds. Domains not
+            checked in time are listed as unchecked (and not journaled).
+        scheduler: Optional PriorityScheduler deciding which domains are
+            checked first.
+        stats: Optional ScanStats updated as every result arrives.
+        sinks: Optional started ResultFanOut that receives every result.
+            A slow sink slows the scan down rather than buffering
+            without bound.
 
     Returns:
         List of CheckResult objects for all checked domains.
     """
     table = create_results_table()
-    domain_checker = checker or DomainChecker()
     results: list[CheckResult] = []
 
-    tasks = {
-        asyncio.create_task(
-            domain_checker.acheck(d),
-            name=f"check-{d}",
-        )
-        for d in domains
-    }
+    stream = _result_stream(
+        checker or get_default_checker(), domains, time_budget, scheduler
+    )
+    if sinks is not None:
+        stream = sinks.tee(stream)
+
+    def record(result: CheckResult) -> None:
+        results.append(result)
+        if journal is not None and result.status is not FilterStatus.UNCHECKED:
+            journal.append(result)
+        if stats is not None:
+            stats.add(result)
+
+        domain_text, status_text = format_status(result)
+        table.add_row(domain_text, status_text)
 
     if show_progress:
         with Live(table, auto_refresh=False) as live_table:
-            for future in asyncio.as_completed(tasks):
-                result = await future
-                results.append(result)
-
-                domain_text, status_text = format_status(result)
-                table.add_row(domain_text, status_text)
+            async for result in stream:
+                record(result)
                 live_table.refresh()
     else:
-        for future in asyncio.as_completed(tasks):
-            result = await future
-            results.append(result)
-
-            domain_text, status_text = format_status(result)
-            table.add_row(domain_text, status_text)
+        async for result in stream:
+            record(result)
 
         rich_print(table)
 
     return results
 
 
+def _ratio(value: float | None) -> str:
+    """Format a ratio as a percentage, or a dash if undefined."""
+    return "-" if value is None else f"{value:.1%}"
+
+
+def _milliseconds(value: float | None) -> str:
+    """Format a duration in seconds as milliseconds, or a dash if unknown."""
+    return "-" if value is None else f"{value * 1000:.1f} ms"
+
+
+def print_stats(stats: ScanStats, limit: int = 10) -> None:
+    """Print aggregate scan statistics as tables.
+
+    Args:
+        stats: Statistics collected during the scan.
+        limit: Number of TLDs, registrable domains and error classes shown.
+    """
+    summary = Table(title="Statistics")
+    summary.add_column("Metric", justify="left", no_wrap=True)
+    summary.add_column("Value", justify="right", no_wrap=True)
+    summary.add_row("Domains", str(stats.total))
+    for status in FilterStatus:
+        if stats.statuses[status]:
+            summary.add_row(status.value.capitalize(), str(stats.statuses[status]))
+    summary.add_row("Blocked ratio", _ratio(stats.blocked_ratio))
+    if stats.latency.count:
+        summary.add_row("Mean latency", _milliseconds(stats.latency.mean))
+        for q in (0.5, 0.9, 0.99):
+            summary.add_row(
+                f"p{round(q * 100)} latency", _milliseconds(stats.latency.quantile(q))
+            )
+    rich_print(summary)
+
+    for title, groups in (
+        ("Blocked by TLD", stats.tlds),
+        ("Blocked by Registrable Domain", stats.registrable),
+    ):
+        top = [item for item in stats.top_groups(groups, limit) if item[1].blocked]
+        if not top:
+            continue
+        table = Table(title=title)
+        table.add_column("Name", justify="left", no_wrap=True)
+        table.add_column("Blocked", justify="right", no_wrap=True)
+        table.add_column("Total", justify="right", no_wrap=True)
+        table.add_column("Ratio", justify="right", no_wrap=True)
+        for name, group in top:
+            table.add_row(
+                name, str(group.blocked), str(group.total), _ratio(group.blocked_ratio)
+            )
+        rich_print(table)
+
+    if stats.error_classes:
+        table = Table(title="Top Errors")
+        table.add_column("Error", justify="left", no_wrap=True)
+        table.add_column("Count", justify="right", no_wrap=True)
+        for error_class, count in stats.error_classes.most_common(limit):
+            table.add_row(error_class, str(count))
+        rich_print(table)
+
+
+def _size(value: float | None) -> str:
+    """Format a number of bytes with a binary unit, or a dash if unknown."""
+    if value is None:
+        return "-"
+    for unit in ("B", "KiB", "MiB"):
+        if abs(value) < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+def print_memory_report(report: MemoryReport) -> None:
+    """Print the result of a memory trace as tables.
+
+    Args:
+        report: Report returned by ``MemoryTracer.report``.
+    """
+    summary = Table(title="Memory")
+    summary.add_column("Metric", justify="left", no_wrap=True)
+    summary.add_column("Value", justify="right", no_wrap=True)
+    summary.add_row("Peak", _size(report.peak))
+    summary.add_row("At end", _size(report.current))
+    summary.add_row("Domains", str(report.domains))
+    summary.add_row("Peak per domain", _size(report.bytes_per_domain))
+    rich_print(summary)
+
+    sections: tuple[tuple[str, list[AllocationSite]], ...] = (
+        ("Top Allocation Sites", report.top_lines),
+        ("Memory by File", report.top_files),
+    )
+    for title, sites in sections:
+        if not sites:
+            continue
+        table = Table(title=title)
+        table.add_column("Location", justify="left", no_wrap=True)
+        table.add_column("Size", justify="right", no_wrap=True)
+        table.add_column("Blocks", justify="right", no_wrap=True)
+        for site in sites:
+            table.add_row(site.location, _size(site.size), str(site.count))
+        rich_print(table)
+
+
+def _timestamp(value: float | None) -> str:
+    """Format a Unix timestamp as local time, or a dash if unknown."""
+    if value is None:
+        return "-"
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(value))
+
+
+def print_history_summary(counts: dict[FilterStatus, int]) -> None:
+    """Print the number of domains per latest status in a history store.
+
+    Args:
+        counts: Result of ``HistoryStore.status_counts``.
+    """
+    table = Table(title="History")
+    table.add_column("Status", justify="left", no_wrap=True)
+    table.add_column("Domains", justify="right", no_wrap=True)
+    for status in FilterStatus:
+        if counts.get(status):
+            table.add_row(status.value.capitalize(), str(counts[status]))
+    table.add_row("Total", str(sum(counts.values())))
+    rich_print(table)
+
+
+def print_domain_state(state: DomainState) -> None:
+    """Print the latest known status of a domain.
+
+    Args:
+        state: Result of ``HistoryStore.latest``.
+    """
+    rich_print(
+        f"{state.domain}: [bold]{state.status.value}[/bold] "
+        f"(checked {_timestamp(state.checked_at)}, "
+        f"changed {_timestamp(state.changed_at)})"
+    )
+
+
+def print_changes(changes: list[StatusChange], title: str = "Status Changes") -> None:
+    """Print status changes from a history store as a table.
+
+    Args:
+        changes: Changes returned by ``HistoryStore`` queries.
+        title: Title of the table.
+    """
+    table = Table(title=title)
+    table.add_column("Time", justify="left", no_wrap=True)
+    table.add_column("Domain", justify="left", no_wrap=True)
+    table.add_column("From", justify="left", no_wrap=True)
+    table.add_column("To", justify="left", no_wrap=True)
+    for change in changes:
+        table.add_row(
+            _timestamp(change.changed_at),
+            change.domain,
+            change.previous.value if change.previous else "-",
+            change.current.value,
+        )
+    rich_print(table)
+
+
 def read_domains_from_file(path: str) -> list[str]:
     """Read domain names from a file.
 
+    Compressed files (.gz, .bz2, .zst) are decompressed on the fly and
+    ``-`` reads from standard input; see :func:`check_filter.inputs.iter_domains`
+    for a lazy variant.
+
     Args:
         path: Path to the file containing domain names (one per line).
 
@@ -194,10 +470,4 @@ def read_domains_from_file(path: str) -> list[str]:
         FileNotFoundError: If the file does not exist.
         PermissionError: If the file cannot be read.
     """
-    with open(path, encoding="utf-8") as f:
-        domains = [
-            line.strip()
-            for line in f
-            if line.strip() and not line.strip().startswith("#")
-        ]
-    return domains
+    return list(iter_domains(path))
@@ -0,0 +1,165 @@
+"""Continuous observation of a domain list.
+
+:class:`DomainWatcher` rechecks every domain once per interval, spreading
+the checks evenly over the interval (with jitter) instead of bursting the
+whole list at once, and yields an event only when a domain's
+:class:`~check_filter.check.FilterStatus` changes.
+
+Memory use is bounded by the size of the domain list: the watcher keeps
+one status per domain and at most ``max_in_flight`` pending checks, and
+never accumulates results or events.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import TYPE_CHECKING
+
+from check_filter.check import CheckResult, FilterStatus
+from check_filter.incremental import StatusTransition
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Iterator, Sequence
+
+    from check_filter.check import DomainChecker
+
+logger = logging.getLogger(__name__)
+
+# Default time between two checks of the same domain (seconds)
+DEFAULT_INTERVAL = 300.0
+
+# Default jitter as a fraction of the per-domain slot
+DEFAULT_JITTER = 0.5
+
+# Default maximum number of checks in flight
+DEFAULT_MAX_IN_FLIGHT = 256
+
+
+class DomainWatcher:
+    """Periodically recheck domains and report status transitions.
+
+    With ``n`` domains and an interval ``T``, one check starts roughly
+    every ``T / n`` seconds. Each start time is shifted by a random jitter
+    of up to ``jitter * T / n`` so that many watchers do not synchronize.
+
+    Example:
+        >>> watcher = DomainWatcher(DomainChecker(), domains, interval=600)
+        >>> async for change in watcher.watch():
+        ...     print(change.domain, change.previous, "->", change.current)
+    """
+
+    def __init__(
+        self,
+        checker: DomainChecker,
+        domains: Sequence[str],
+        *,
+        interval: float = DEFAULT_INTERVAL,
+        jitter: float = DEFAULT_JITTER,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        ignore_errors: bool = True,
+    ) -> None:
+        """Initialize the watcher.
+
+        Args:
+            checker: The DomainChecker used for all checks.
+            domains: Domains to keep under observation.
+            interval: Seconds between two checks of the same domain.
+            jitter: Random shift of each check as a fraction (0-1) of the
+                per-domain slot.
+            max_in_flight: Maximum number of checks running at once. When
+                reached, scheduling pauses until a check completes.
+            ignore_errors: If True, ERROR results keep the last known
+                status instead of producing a transition.
+        """
+        if not domains:
+            raise ValueError("domains must not be empty")
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter must be between 0 and 1")
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        self.checker = checker
+        self.domains = list(dict.fromkeys(domains))
+        self.interval = interval
+        self.jitter = jitter
+        self.max_in_flight = max_in_flight
+        self.ignore_errors = ignore_errors
+        self.statuses: dict[str, FilterStatus] = {}
+        self.checks = 0
+        self._random = random.Random()
+
+    @property
+    def slot(self) -> float:
+        """Return the time between two consecutive check starts."""
+        return self.interval / len(self.domains)
+
+    def _offset(self, index: int) -> float:
+        """Return the start offset of a domain within a round."""
+        spread = self.jitter * self.slot
+        return index * self.slot + self._random.uniform(0, spread)
+
+    def _observe(self, domain: str, result: CheckResult) -> StatusTransition | None:
+        """Record a result and return a transition if the status changed."""
+        self.checks += 1
+        if self.ignore_errors and result.status is FilterStatus.ERROR:
+            return None
+
+        previous = self.statuses.get(domain)
+        self.statuses[domain] = result.status
+        if previous is None or previous is result.status:
+            return None
+        return StatusTransition(
+            domain=domain,
+            previous=previous,
+            current=result.status,
+            result=result,
+        )
+
+    async def watch(
+        self, rounds: int | None = None
+    ) -> AsyncGenerator[StatusTransition, None]:
+        """Run the watch loop, yielding status transitions.
+
+        The first observation of each domain establishes its baseline and
+        does not produce an event.
+
+        Args:
+            rounds: Number of passes over the domain list, or None to run
+                until cancelled.
+
+        Yields:
+            StatusTransition objects as changes are detected.
+        """
+        loop = asyncio.get_running_loop()
+        start_times: dict[str, float] = {}
+
+        def schedule() -> Iterator[str]:
+            """Yield the domains round after round, recording their start times."""
+            round_start = loop.time()
+            completed_rounds = 0
+            while rounds is None or completed_rounds < rounds:
+                offsets = sorted(
+                    (self._offset(i), domain) for i, domain in enumerate(self.domains)
+                )
+                for offset, domain in offsets:
+                    start_times[domain] = round_start + offset
+                    yield domain
+
+                completed_rounds += 1
+                round_start += self.interval
+                if loop.time() > round_start:
+                    logger.warning(
+                        "Watch round took longer than the %.1fs interval", self.interval
+                    )
+                    round_start = loop.time()
+
+        async for result in self.checker.acheck_iter(
+            schedule(), concurrency=self.max_in_flight, not_before=start_times
+        ):
+            change = self._observe(result.domain, result)
+            if change is not None:
+                yield change
@@ -10,6 +10,16 @@ import pytest
 from check_filter import CheckResult, DomainChecker, FilterStatus
 
 
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Register command-line options of the test suite."""
+    parser.addoption(
+        "--update-perf-baselines",
+        action="store_true",
+        default=False,
+        help="Record new performance baselines instead of comparing with them.",
+    )
+
+
 @pytest.fixture
 def domain_checker() -> DomainChecker:
     """Create a DomainChecker instance for testing."""
@@ -0,0 +1,163 @@
+"""Tests for the cache module."""
+
+from unittest.mock import patch
+
+import pytest
+
+from check_filter import CheckResult, FilterStatus
+from check_filter.cache import ResultCache
+
+
+def _result(domain="example.com", status=FilterStatus.FREE, ttl=None):
+    return CheckResult(domain=domain, status=status, ttl=ttl)
+
+
+def _negative(domain="dead.com", ttl=300, error_class="nxdomain"):
+    return CheckResult(
+        domain=domain,
+        status=FilterStatus.UNKNOWN,
+        error="Domain does not exist",
+        ttl=ttl,
+        error_class=error_class,
+    )
+
+
+class TestResultCache:
+    """Tests for ResultCache class."""
+
+    def test_put_and_get(self):
+        """Test cached results are returned and counted as hits."""
+        cache = ResultCache()
+        result = _result()
+
+        cache.put(result)
+
+        assert cache.get("example.com") is result
+        assert cache.stats.hits == 1
+        assert cache.get("other.com") is None
+        assert cache.stats.misses == 1
+
+    def test_errors_not_cached(self):
+        """Test transient error results are not cached."""
+        cache = ResultCache()
+
+        cache.put(_result(status=FilterStatus.ERROR))
+
+        assert len(cache) == 0
+
+    def test_expiry_uses_clamped_ttl(self):
+        """Test entries expire after their clamped TTL."""
+        cache = ResultCache(min_ttl=10, max_ttl=100)
+
+        assert cache.lifetime(_result(ttl=1)) == 10
+        assert cache.lifetime(_result(ttl=50)) == 50
+        assert cache.lifetime(_result(ttl=5000)) == 100
+        assert cache.lifetime(_result()) == 100
+
+        with patch("check_filter.cache.time.monotonic", return_value=0.0):
+            cache.put(_result(ttl=50))
+        with patch("check_filter.cache.time.monotonic", return_value=49.0):
+            assert cache.get("example.com") is not None
+        with patch("check_filter.cache.time.monotonic", return_value=51.0):
+            assert cache.get("example.com") is None
+        assert len(cache) == 0
+
+    def test_negative_answers_cached(self):
+        """Test NXDOMAIN and NoAnswer results with an SOA TTL are cached."""
+        cache = ResultCache()
+        cache.put(_negative("dead.com"))
+        cache.put(_negative("noaddr.com", error_class="no_answer"))
+
+        assert cache.get("dead.com") is not None
+        assert cache.get("noaddr.com") is not None
+        assert cache.stats.negative_hits == 2
+
+    def test_negative_without_soa_not_cached(self):
+        """Test negative answers without a TTL are not cached (RFC 2308)."""
+        cache = ResultCache()
+
+        cache.put(_negative(ttl=None))
+        cache.put(_negative("other.com", error_class=None))
+
+        assert len(cache) == 0
+
+    def test_negative_lifetime_bounds(self):
+        """Test negative lifetimes use their own upper bound."""
+        cache = ResultCache(min_ttl=10, max_ttl=100, max_negative_ttl=50)
+
+        assert cache.lifetime(_negative(ttl=1)) == 10
+        assert cache.lifetime(_negative(ttl=3600)) == 50
+
+    def test_negative_caching_disabled(self):
+        """Test max_negative_ttl=0 disables negative caching."""
+        cache = ResultCache(max_negative_ttl=0)
+
+        cache.put(_negative())
+
+        assert len(cache) == 0
+
+    def test_claim_refresh_for_hot_ageing_entries(self):
+        """Test hot entries are claimed once after the refresh fraction."""
+        cache = ResultCache(min_ttl=0, refresh_ahead=0.5, refresh_min_hits=2)
+        with patch("check_filter.cache.time.monotonic", return_value=0.0):
+            cache.put(_result(ttl=100))
+            cache.get("example.com")
+
+        with patch("check_filter.cache.time.monotonic", return_value=60.0):
+            assert cache.claim_refresh("example.com") is False  # not hot yet
+            cache.get("example.com")
+            assert cache.claim_refresh("example.com") is True
+            assert cache.claim_refresh("example.com") is False  # already claimed
+
+            cache.release_refresh("example.com")
+            assert cache.claim_refresh("example.com") is True
+        assert cache.stats.refreshes == 2
+
+    def test_no_refresh_before_fraction_or_when_disabled(self):
+        """Test entries are not refreshed early or without refresh_ahead."""
+        enabled = ResultCache(min_ttl=0, refresh_ahead=0.5, refresh_min_hits=1)
+        disabled = ResultCache(min_ttl=0, refresh_min_hits=1)
+        with patch("check_filter.cache.time.monotonic", return_value=0.0):
+            for cache in (enabled, disabled):
+                cache.put(_result(ttl=100))
+                cache.get("example.com")
+
+        with patch("check_filter.cache.time.monotonic", return_value=40.0):
+            assert enabled.claim_refresh("example.com") is False
+        with patch("check_filter.cache.time.monotonic", return_value=90.0):
+            assert enabled.claim_refresh("example.com") is True
+            assert disabled.claim_refresh("example.com") is False
+
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted first."""
+        cache = ResultCache(max_entries=2)
+        cache.put(_result("a.com"))
+        cache.put(_result("b.com"))
+        cache.get("a.com")
+
+        cache.put(_result("c.com"))
+
+        assert cache.get("b.com") is None
+        assert cache.get("a.com") is not None
+        assert cache.stats.evictions == 1
+
+    def test_invalidate_and_clear(self):
+        """Test entries can be removed."""
+        cache = ResultCache()
+        cache.put(_result("a.com"))
+        cache.put(_result("b.com"))
+
+        cache.invalidate("a.com")
+        assert cache.get("a.com") is None
+
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_invalid_arguments(self):
+        """Test invalid configuration is rejected."""
+        with pytest.raises(ValueError):
+            ResultCache(max_entries=0)
+        with pytest.raises(ValueError):
+            ResultCache(min_ttl=10, max_ttl=1)
+        with pytest.raises(ValueError):
+            ResultCache(refresh_ahead=1.5)
@@ -1,16 +1,26 @@
 """Tests for the check module."""
 
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import dns.exception
+import dns.message
+import dns.rcode
 import dns.resolver
+import dns.rrset
 import pytest
 
 from check_filter import CheckResult, DomainChecker, FilterStatus
+from check_filter.cache import ResultCache
 from check_filter.check import (
     CI_NAMESERVER,
     DEFAULT_BLOCKED_IPS,
+    DEFAULT_BLOCKED_IPV6,
     DEFAULT_NAMESERVER,
+    _LoopThread,
 )
 
 
@@ -23,6 +33,7 @@ class TestFilterStatus:
         assert FilterStatus.BLOCKED.value == "blocked"
         assert FilterStatus.ERROR.value == "error"
         assert FilterStatus.UNKNOWN.value == "unknown"
+        assert FilterStatus.TAMPERED.value == "tampered"
 
 
 class TestCheckResult:
@@ -90,6 +101,19 @@ class TestCheckResult:
         assert domain == "blocked.com"
         assert is_free is False
 
+    def test_dict_round_trip(self):
+        """Test to_dict/from_dict round trip."""
+        result = CheckResult(
+            domain="example.com",
+            status=FilterStatus.BLOCKED,
+            ips=frozenset({"10.10.34.35", "10.10.34.34"}),
+        )
+        data = result.to_dict()
+
+        assert data["status"] == "blocked"
+        assert data["ips"] == ["10.10.34.34", "10.10.34.35"]
+        assert CheckResult.from_dict(data) == result
+
     def test_immutability(self):
         """Test that CheckResult is immutable (frozen)."""
         result = CheckResult(domain="example.com", status=FilterStatus.FREE)
@@ -266,6 +290,655 @@ class TestDomainChecker:
             assert all(isinstance(r, CheckResult) for r in results)
 
 
+class TestErrorIsolation:
+    """Tests for classified failures and batch isolation."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("error", "status", "error_class"),
+        [
+            (dns.resolver.NXDOMAIN(), FilterStatus.UNKNOWN, "nxdomain"),
+            (dns.resolver.NoAnswer(), FilterStatus.UNKNOWN, "no_answer"),
+            (dns.resolver.YXDOMAIN(), FilterStatus.ERROR, "yxdomain"),
+            (dns.resolver.NoNameservers(), FilterStatus.ERROR, "no_nameservers"),
+            (dns.exception.Timeout(), FilterStatus.ERROR, "timeout"),
+            (ConnectionResetError("reset"), FilterStatus.ERROR, "network"),
+            (dns.exception.FormError(), FilterStatus.ERROR, "dns"),
+            (RuntimeError("boom"), FilterStatus.ERROR, "internal"),
+        ],
+    )
+    async def test_every_failure_is_classified(self, error, status, error_class):
+        """Test resolver exceptions become classified results."""
+        checker = DomainChecker()
+        checker.resolver.resolve = AsyncMock(side_effect=error)
+
+        result = await checker.acheck("example.com")
+
+        assert result.status == status
+        assert result.error_class == error_class
+        assert result.error
+
+    @pytest.mark.asyncio
+    async def test_acheck_many_survives_failures(self):
+        """Test one failing domain does not abort the batch."""
+        checker = DomainChecker()
+        answer = MagicMock()
+        answer.__iter__ = lambda self: iter([MagicMock(address="1.2.3.4")])
+
+        async def resolve(domain, rdtype):
+            if domain == "bad.com":
+                raise RuntimeError("boom")
+            return answer
+
+        checker.resolver.resolve = AsyncMock(side_effect=resolve)
+
+        results = await checker.acheck_many(["a.com", "bad.com", "", "b.com"])
+
+        assert [r.status for r in results] == [
+            FilterStatus.FREE,
+            FilterStatus.ERROR,
+            FilterStatus.ERROR,
+            FilterStatus.FREE,
+        ]
+        assert results[2].error_class == "invalid"
+
+
+class TestNegativeCaching:
+    """Tests for RFC 2308 negative caching."""
+
+    @staticmethod
+    def _nxdomain(soa_ttl=3600, minimum=300):
+        """Build an NXDOMAIN error carrying an SOA in the authority section."""
+        query = dns.message.make_query("dead.example.com", "A")
+        response = dns.message.make_response(query)
+        response.set_rcode(dns.rcode.NXDOMAIN)
+        response.authority.append(
+            dns.rrset.from_text(
+                "example.com",
+                soa_ttl,
+                "IN",
+                "SOA",
+                f"ns.example.com. admin.example.com. 1 7200 900 1209600 {minimum}",
+            )
+        )
+        qname = query.question[0].name
+        return dns.resolver.NXDOMAIN(qnames=[qname], responses={qname: response})
+
+    @pytest.mark.asyncio
+    async def test_ttl_from_soa_minimum(self):
+        """Test the negative TTL is min(SOA TTL, SOA MINIMUM)."""
+        checker = DomainChecker()
+        checker.resolver.resolve = AsyncMock(side_effect=self._nxdomain(3600, 300))
+
+        result = await checker.acheck("dead.example.com")
+
+        assert result.status == FilterStatus.UNKNOWN
+        assert result.ttl == 300
+
+        checker.resolver.resolve = AsyncMock(side_effect=self._nxdomain(60, 300))
+        assert (await checker.acheck("dead2.example.com")).ttl == 60
+
+    @pytest.mark.asyncio
+    async def test_without_soa_has_no_ttl(self):
+        """Test negative answers without an SOA carry no TTL."""
+        checker = DomainChecker()
+        checker.resolver.resolve = AsyncMock(side_effect=dns.resolver.NXDOMAIN())
+
+        result = await checker.acheck("dead.example.com")
+
+        assert result.ttl is None
+
+    @pytest.mark.asyncio
+    async def test_negative_cache_hit_skips_network(self):
+        """Test a cached dead domain is answered without a query."""
+        checker = DomainChecker(cache=ResultCache())
+        checker.resolver.resolve = AsyncMock(side_effect=self._nxdomain())
+
+        first = await checker.acheck("dead.example.com")
+        second = await checker.acheck("dead.example.com")
+
+        assert second is first
+        assert checker.resolver.resolve.call_count == 1
+        assert checker.cache.stats.negative_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_default_checker_caches_negative_answers(self):
+        """Test the default checker serves a repeated NXDOMAIN from its cache."""
+        from check_filter import check
+
+        previous = check._default.checker
+        try:
+            check.set_default_checker(None)
+            checker = check.get_default_checker()
+            checker.resolver.resolve = AsyncMock(side_effect=self._nxdomain(3600, 300))
+
+            with patch("check_filter.cache.time.monotonic", return_value=0.0):
+                first = await checker.acheck("dead.example.com")
+            with patch("check_filter.cache.time.monotonic", return_value=299.0):
+                assert await checker.acheck("dead.example.com") is first
+            assert checker.resolver.resolve.call_count == 1
+
+            with patch("check_filter.cache.time.monotonic", return_value=301.0):
+                await checker.acheck("dead.example.com")
+            assert checker.resolver.resolve.call_count == 2
+        finally:
+            check.set_default_checker(previous)
+
+
+class TestSharedQueries:
+    """Tests for caching, single-flight and streaming checks."""
+
+    @pytest.mark.asyncio
+    async def test_single_flight(self):
+        """Test concurrent checks of one domain share a single query."""
+        checker = DomainChecker()
+
+        async def slow_resolve(domain, rdtype):
+            await asyncio.sleep(0.01)
+            return [MagicMock(address="1.2.3.4")]
+
+        with patch.object(
+            checker.resolver, "resolve", new=AsyncMock(side_effect=slow_resolve)
+        ) as mock_resolve:
+            results = await asyncio.gather(
+                *(checker.acheck("example.com") for _ in range(10))
+            )
+
+        assert mock_resolve.call_count == 1
+        assert len({id(r) for r in results}) == 1
+        assert checker._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_single_flight_cancel_one_waiter(self):
+        """Test cancelling one waiter does not cancel the shared query."""
+        checker = DomainChecker()
+
+        async def slow_resolve(domain, rdtype):
+            await asyncio.sleep(0.05)
+            return [MagicMock(address="1.2.3.4")]
+
+        with patch.object(
+            checker.resolver, "resolve", new=AsyncMock(side_effect=slow_resolve)
+        ):
+            first = asyncio.create_task(checker.acheck("example.com"))
+            second = asyncio.create_task(checker.acheck("example.com"))
+            await asyncio.sleep(0.01)
+            first.cancel()
+
+            result = await second
+
+        assert result.is_free
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_resolver(self):
+        """Test cached results are served without a DNS query."""
+        checker = DomainChecker(cache=ResultCache())
+
+        with patch.object(
+            checker.resolver, "resolve", new_callable=AsyncMock
+        ) as mock_resolve:
+            mock_resolve.return_value = [MagicMock(address="1.2.3.4")]
+
+            await checker.acheck("example.com")
+            await checker.acheck("EXAMPLE.com")
+
+        assert mock_resolve.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_ahead_keeps_hot_entry_cached(self):
+        """Test a hot entry is refreshed in the background, never missed."""
+        cache = ResultCache(min_ttl=0, refresh_ahead=0.5, refresh_min_hits=1)
+        checker = DomainChecker(cache=cache)
+        checker._resolve = AsyncMock(
+            side_effect=lambda d: CheckResult(
+                domain=d, status=FilterStatus.FREE, ttl=100
+            )
+        )
+
+        with patch("check_filter.cache.time.monotonic", return_value=0.0):
+            await checker.acheck("a.com")
+            await checker.acheck("a.com")
+        with patch("check_filter.cache.time.monotonic", return_value=60.0):
+            await checker.acheck("a.com")
+            await asyncio.gather(*checker._prefetches)
+        with patch("check_filter.cache.time.monotonic", return_value=105.0):
+            await checker.acheck("a.com")  # the original entry expired at 100
+
+        assert checker._resolve.call_count == 2
+        assert cache.stats.misses == 1
+        assert cache.stats.refreshes == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_is_retried(self):
+        """Test a refresh returning ERROR lets a later hit refresh again."""
+        cache = ResultCache(min_ttl=0, refresh_ahead=0.5, refresh_min_hits=1)
+        checker = DomainChecker(cache=cache)
+        statuses = iter([FilterStatus.FREE, FilterStatus.ERROR, FilterStatus.FREE])
+        checker._resolve = AsyncMock(
+            side_effect=lambda d: CheckResult(domain=d, status=next(statuses), ttl=100)
+        )
+
+        with patch("check_filter.cache.time.monotonic", return_value=0.0):
+            await checker.acheck("a.com")
+            await checker.acheck("a.com")
+        with patch("check_filter.cache.time.monotonic", return_value=60.0):
+            await checker.acheck("a.com")
+            await asyncio.gather(*checker._prefetches)
+            await checker.acheck("a.com")
+            await asyncio.gather(*checker._prefetches)
+
+        assert checker._resolve.call_count == 3
+        assert cache.stats.refreshes == 2
+
+    @pytest.mark.asyncio
+    async def test_prefetch_concurrency_limit(self):
+        """Test refreshes beyond the limit are skipped and released."""
+        cache = ResultCache(min_ttl=0, refresh_ahead=0.5, refresh_min_hits=1)
+        checker = DomainChecker(cache=cache, prefetch_concurrency=1)
+        release = asyncio.Event()
+
+        async def resolve(domain):
+            if cache.get(domain) is not None:
+                await release.wait()
+            return CheckResult(domain=domain, status=FilterStatus.FREE, ttl=100)
+
+        checker._resolve = AsyncMock(side_effect=resolve)
+        with patch("check_filter.cache.time.monotonic", return_value=0.0):
+            await checker.acheck_many(["a.com", "b.com"])
+            await checker.acheck_many(["a.com", "b.com"])
+        with patch("check_filter.cache.time.monotonic", return_value=60.0):
+            await checker.acheck_many(["a.com", "b.com"])
+            await asyncio.sleep(0)
+
+            assert len(checker._prefetches) == 1
+            assert cache.claim_refresh("b.com") is True
+
+            release.set()
+            await asyncio.gather(*checker._prefetches)
+
+    @pytest.mark.asyncio
+    async def test_acheck_iter_bounded(self):
+        """Test acheck_iter never exceeds its concurrency limit."""
+        checker = DomainChecker()
+        active = 0
+        peak = 0
+
+        async def resolve(domain, rdtype):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.001)
+            active -= 1
+            return [MagicMock(address="1.2.3.4")]
+
+        with patch.object(
+            checker.resolver, "resolve", new=AsyncMock(side_effect=resolve)
+        ):
+            domains = (f"d{i}.com" for i in range(50))
+            results = [r async for r in checker.acheck_iter(domains, concurrency=5)]
+
+        assert len(results) == 50
+        assert peak <= 5
+
+    @pytest.mark.asyncio
+    async def test_acheck_iter_not_before(self):
+        """Test checks wait for their start times and unstarted ones expire."""
+        checker = DomainChecker()
+        loop = asyncio.get_running_loop()
+        started = {}
+
+        async def resolve(domain, rdtype):
+            started[domain] = loop.time()
+            return [MagicMock(address="1.2.3.4")]
+
+        now = loop.time()
+        start_times = {"a.com": now, "b.com": now + 0.05, "c.com": now + 10}
+        with patch.object(
+            checker.resolver, "resolve", new=AsyncMock(side_effect=resolve)
+        ):
+            results = [
+                r
+                async for r in checker.acheck_iter(
+                    ["a.com", "b.com", "c.com"],
+                    not_before=start_times,
+                    time_budget=0.2,
+                )
+            ]
+
+        assert started["b.com"] >= start_times["b.com"]
+        assert "c.com" not in started
+        assert [r.status for r in results] == [
+            FilterStatus.FREE,
+            FilterStatus.FREE,
+            FilterStatus.UNCHECKED,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_acheck_iter_invalid_concurrency(self):
+        """Test acheck_iter rejects a concurrency below 1."""
+        checker = DomainChecker()
+
+        with pytest.raises(ValueError):
+            async for _ in checker.acheck_iter(["a.com"], concurrency=0):
+                pass
+
+
+class TestCheckerStats:
+    """Tests for the metrics kept by DomainChecker."""
+
+    @pytest.mark.asyncio
+    async def test_counts_checks_and_queries(self):
+        """Test cache hits count as checks but not as queries."""
+        checker = DomainChecker(cache=ResultCache())
+        checker.resolver.resolve = AsyncMock(
+            return_value=[MagicMock(address="1.2.3.4")]
+        )
+
+        await checker.acheck("a.com")
+        await checker.acheck("a.com")
+
+        assert checker.stats.checks == 2
+        assert checker.stats.queries == 1
+        assert checker.stats.statuses[FilterStatus.FREE] == 2
+
+    @pytest.mark.asyncio
+    async def test_counts_shared_queries(self):
+        """Test checks joining an in-flight query are counted as shared."""
+        checker = DomainChecker()
+
+        async def slow_resolve(domain, rdtype):
+            await asyncio.sleep(0.01)
+            return [MagicMock(address="1.2.3.4")]
+
+        checker.resolver.resolve = AsyncMock(side_effect=slow_resolve)
+
+        await asyncio.gather(*(checker.acheck("a.com") for _ in range(3)))
+
+        assert checker.stats.queries == 1
+        assert checker.stats.shared == 2
+        assert checker.stats.checks == 3
+
+    @pytest.mark.asyncio
+    async def test_counts_batch_failures(self):
+        """Test acheck_iter counts checks that raised as failures."""
+        checker = DomainChecker()
+        checker.resolver.resolve = AsyncMock(
+            return_value=[MagicMock(address="10.10.34.34")]
+        )
+        single_flight = checker._single_flight
+
+        async def flaky(domain):
+            if domain == "bad.com":
+                raise RuntimeError("boom")
+            return await single_flight(domain)
+
+        with patch.object(checker, "_single_flight", side_effect=flaky):
+            results = [r async for r in checker.acheck_iter(["a.com", "bad.com"])]
+
+        assert len(results) == 2
+        assert checker.stats.failures == 1
+        assert checker.stats.statuses[FilterStatus.BLOCKED] == 1
+
+
+class TestSyncAPI:
+    """Tests for the synchronous API backed by a background loop."""
+
+    @pytest.fixture
+    def checker(self):
+        """Create a checker with a fake resolver and close it afterwards."""
+        checker = DomainChecker()
+
+        async def resolve(domain, rdtype):
+            await asyncio.sleep(0.001)
+            address = "10.10.34.34" if domain.startswith("blocked") else "1.2.3.4"
+            return [MagicMock(address=address)]
+
+        with patch.object(
+            checker.resolver, "resolve", new=AsyncMock(side_effect=resolve)
+        ):
+            yield checker
+        checker.close()
+
+    def test_check(self, checker):
+        """Test a synchronous single check."""
+        assert checker.check("example.com").is_free
+        assert checker.check("blocked.com").is_blocked
+
+    def test_check_many(self, checker):
+        """Test synchronous batch checks keep input order."""
+        results = checker.check_many(["a.com", "blocked.com", "c.com"])
+
+        assert [r.domain for r in results] == ["a.com", "blocked.com", "c.com"]
+        assert results[1].is_blocked
+
+    def test_submit_returns_future(self, checker):
+        """Test submit returns a concurrent future."""
+        future = checker.submit("example.com")
+
+        assert isinstance(future, Future)
+        assert future.result(timeout=5).domain == "example.com"
+
+    def test_reuses_one_loop(self, checker):
+        """Test all synchronous calls share one background loop."""
+        checker.check("a.com")
+        loop = checker._background.loop
+        checker.check("b.com")
+
+        assert checker._background.loop is loop
+
+    def test_thread_safety(self, checker):
+        """Test many threads can check at once."""
+        domains = [f"d{i}.com" for i in range(200)]
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(checker.check, domains))
+
+        assert [r.domain for r in results] == domains
+        assert checker._background is not None
+
+    def test_check_many_timeout_cancels_scan(self):
+        """Test a timed-out batch is cancelled on the background loop."""
+        checker = DomainChecker()
+        cancelled = threading.Event()
+
+        async def resolve(domain, rdtype):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with patch.object(
+            checker.resolver, "resolve", new=AsyncMock(side_effect=resolve)
+        ):
+            with pytest.raises(TimeoutError):
+                checker.check_many(["a.com", "b.com"], timeout=0.05)
+
+            assert cancelled.wait(5)
+        checker.close()
+
+    def test_stop_before_loop_starts(self):
+        """Test stopping a loop thread that has not started its loop yet."""
+
+        class SlowStart(_LoopThread):
+            def _run(self):
+                time.sleep(0.05)
+                super()._run()
+
+        background = SlowStart()
+        stopper = threading.Thread(target=background.stop)
+        stopper.start()
+        stopper.join(5)
+
+        assert not stopper.is_alive()
+        assert background.loop.is_closed()
+
+    def test_close_stops_thread(self, checker):
+        """Test close stops the background thread and allows restarting."""
+        checker.check("a.com")
+        thread = checker._background.thread
+
+        checker.close()
+
+        assert not thread.is_alive()
+        assert checker._background is None
+        assert checker.check("b.com").is_free
+
+    @pytest.mark.asyncio
+    async def test_check_from_loop_thread_rejected(self, checker):
+        """Test calling check() on the background loop itself is refused."""
+        checker.check("a.com")
+
+        async def nested():
+            return checker.check("b.com")
+
+        with pytest.raises(RuntimeError):
+            checker._background.submit(nested()).result(timeout=5)
+
+
+class TestDualStack:
+    """Tests for dual-stack (A + AAAA) checks."""
+
+    @staticmethod
+    def _resolver(records, delay=0.0):
+        """Create a fake resolve() answering from {rdtype: addresses}."""
+
+        async def resolve(domain, rdtype):
+            await asyncio.sleep(delay)
+            outcome = records.get(rdtype)
+            if isinstance(outcome, Exception):
+                raise outcome
+            if outcome is None:
+                raise dns.resolver.NoAnswer()
+            answer = MagicMock()
+            answer.__iter__ = lambda self: iter([MagicMock(address=a) for a in outcome])
+            answer.rrset.ttl = 300 if rdtype == "A" else 60
+            return answer
+
+        return AsyncMock(side_effect=resolve)
+
+    def test_default_blocked_set_includes_ipv6(self):
+        """Test dual-stack mode matches the IPv6 sinkholes by default."""
+        checker = DomainChecker(dual_stack=True)
+
+        assert checker.blocked_ips == DEFAULT_BLOCKED_IPS | DEFAULT_BLOCKED_IPV6
+
+    def test_custom_ipv6_blocked_ips_are_canonical(self):
+        """Test custom IPv6 addresses are compared in compressed form."""
+        checker = DomainChecker(blocked_ips={"00d0:0:0::0011", "1.1.1.1"})
+
+        assert checker.blocked_ips == frozenset({"d0::11", "1.1.1.1"})
+
+    @pytest.mark.asyncio
+    async def test_merges_both_families(self):
+        """Test A and AAAA addresses are merged into one result."""
+        checker = DomainChecker(dual_stack=True)
+        checker.resolver.resolve = self._resolver(
+            {"A": ["142.250.80.46"], "AAAA": ["2a00:1450::200e"]}
+        )
+
+        result = await checker.acheck("google.com")
+
+        assert result.status == FilterStatus.FREE
+        assert result.ips == frozenset({"142.250.80.46", "2a00:1450::200e"})
+        assert result.ttl == 60
+
+    @pytest.mark.asyncio
+    async def test_ipv6_sinkhole_blocks(self):
+        """Test a sinkholed AAAA answer marks the domain blocked."""
+        checker = DomainChecker(dual_stack=True)
+        checker.resolver.resolve = self._resolver(
+            {"A": ["93.184.216.34"], "AAAA": ["d0::11"]}
+        )
+
+        result = await checker.acheck("blocked.com")
+
+        assert result.status == FilterStatus.BLOCKED
+
+    @pytest.mark.asyncio
+    async def test_ipv6_only_domain(self):
+        """Test a domain without A records is checked via AAAA."""
+        checker = DomainChecker(dual_stack=True)
+        checker.resolver.resolve = self._resolver({"AAAA": ["2001:db8::1"]})
+
+        result = await checker.acheck("v6only.com")
+
+        assert result.status == FilterStatus.FREE
+        assert result.ips == frozenset({"2001:db8::1"})
+
+    @pytest.mark.asyncio
+    async def test_nxdomain_preferred_over_error(self):
+        """Test UNKNOWN wins when neither family answers."""
+        checker = DomainChecker(dual_stack=True)
+        checker.resolver.resolve = self._resolver(
+            {"A": dns.resolver.NXDOMAIN(), "AAAA": dns.exception.Timeout()}
+        )
+
+        result = await checker.acheck("missing.com")
+
+        assert result.status == FilterStatus.UNKNOWN
+
+    @pytest.mark.asyncio
+    async def test_queries_run_concurrently(self):
+        """Test wall time is that of the slower query, not the sum."""
+        checker = DomainChecker(dual_stack=True)
+        checker.resolver.resolve = self._resolver(
+            {"A": ["1.2.3.4"], "AAAA": ["2001:db8::1"]}, delay=0.2
+        )
+        loop = asyncio.get_running_loop()
+
+        start = loop.time()
+        await checker.acheck("example.com")
+
+        assert loop.time() - start < 0.35
+        assert checker.resolver.resolve.call_count == 2
+
+
+class TestLifecycle:
+    """Tests for DomainChecker resource management and the shared default."""
+
+    @pytest.mark.asyncio
+    async def test_async_context_manager_closes_transport(self):
+        """Test leaving the context closes the owned transport."""
+        transport = MagicMock()
+        transport.nameservers = ["127.0.0.1"]
+        transport.aclose = AsyncMock()
+
+        async with DomainChecker(transport=transport) as checker:
+            assert isinstance(checker, DomainChecker)
+
+        transport.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_aclose_cancels_prefetches(self):
+        """Test aclose cancels background refreshes and stays reusable."""
+        checker = DomainChecker()
+        refresh = asyncio.create_task(asyncio.sleep(10))
+        checker._prefetches.add(refresh)
+
+        await checker.aclose()
+
+        assert refresh.cancelled()
+        checker.resolver.resolve = AsyncMock(side_effect=dns.resolver.NXDOMAIN())
+        assert (await checker.acheck("a.com")).status is FilterStatus.UNKNOWN
+
+    def test_default_checker_is_shared(self):
+        """Test the default checker is created once and can be replaced."""
+        from check_filter import check
+
+        previous = check._default.checker
+        try:
+            check.set_default_checker(None)
+            first = check.get_default_checker()
+            assert check.get_default_checker() is first
+
+            custom = DomainChecker(cache=ResultCache())
+            check.set_default_checker(custom)
+            assert check.get_default_checker() is custom
+        finally:
+            check.set_default_checker(previous)
+
+
 class TestDefaultConstants:
     """Tests for module constants."""
 
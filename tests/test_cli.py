@@ -1,5 +1,6 @@
 """Tests for the CLI module."""
 
+import json
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -222,6 +223,144 @@ class TestFileCommand:
             assert result.exit_code == 1
 
 
+class TestReadUnique:
+    """Tests for streaming deduplication of domain files."""
+
+    def test_unicode_and_punycode_are_duplicates(self, tmp_path):
+        """Test spellings of one name are deduplicated on the normalized form."""
+        bad = "ü" * 64 + ".com"
+        file_path = tmp_path / "domains.txt"
+        file_path.write_text(
+            f"Bücher.example, 5\nXN--BCHER-KVA.example\n{bad}\n{bad}\n",
+            encoding="utf-8",
+        )
+
+        names, priorities = cli._read_unique(str(file_path), "exact", 0.001)
+
+        assert names == ["Bücher.example", bad]
+        assert priorities == {"xn--bcher-kva.example": 5.0}
+
+
+class TestFileJournal:
+    """Tests for file command journaling and resume."""
+
+    def test_journal_records_results(self, tmp_path):
+        """Test --journal passes a journal to print_result."""
+        file_path = tmp_path / "domains.txt"
+        file_path.write_text("example.com\ngoogle.com")
+        journal_path = tmp_path / "scan.jsonl"
+
+        with patch(
+            "check_filter.cli.utils.print_result", new_callable=AsyncMock
+        ) as mock_print:
+            result = runner.invoke(
+                cli.app, ["file", str(file_path), "--journal", str(journal_path)]
+            )
+
+            assert result.exit_code == 0
+            assert mock_print.call_args.kwargs["journal"] is not None
+            assert journal_path.exists()
+
+    def test_resume_skips_completed(self, tmp_path):
+        """Test --resume only checks domains missing from the journal."""
+        file_path = tmp_path / "domains.txt"
+        file_path.write_text("example.com\ngoogle.com")
+        journal_path = tmp_path / "scan.jsonl"
+        journal_path.write_text('{"domain":"example.com","status":"free"}\n')
+
+        with patch(
+            "check_filter.cli.utils.print_result", new_callable=AsyncMock
+        ) as mock_print:
+            result = runner.invoke(
+                cli.app,
+                ["file", str(file_path), "--journal", str(journal_path), "--resume"],
+            )
+
+            assert result.exit_code == 0
+            assert "Resuming" in result.stdout
+            assert mock_print.call_args.args[0] == ["google.com"]
+
+    def test_resume_requires_journal(self, tmp_path):
+        """Test --resume without --journal is rejected."""
+        file_path = tmp_path / "domains.txt"
+        file_path.write_text("example.com")
+
+        result = runner.invoke(cli.app, ["file", str(file_path), "--resume"])
+
+        assert result.exit_code == 1
+
+
+class TestStdoutSink:
+    """Tests for keeping --sink stdout output machine-readable."""
+
+    @staticmethod
+    async def _resolve(domain):
+        """Resolve every domain to a free address."""
+        return CheckResult(
+            domain=domain, status=FilterStatus.FREE, ips=frozenset({"1.2.3.4"})
+        )
+
+    def test_stdout_is_ndjson(self, tmp_path):
+        """Test stdout holds only JSON lines while the table goes to stderr."""
+        from check_filter import check
+
+        file_path = tmp_path / "domains.txt"
+        file_path.write_text("example.com\ngoogle.com\n")
+        checker = check.DomainChecker()
+        checker._resolve = AsyncMock(side_effect=self._resolve)
+        previous = check._default.checker
+        check.set_default_checker(checker)
+        try:
+            result = runner.invoke(
+                cli.app, ["file", str(file_path), "--sink", "stdout", "--stats"]
+            )
+        finally:
+            check.set_default_checker(previous)
+
+        assert result.exit_code == 0
+        records = [json.loads(line) for line in result.stdout.splitlines()]
+        assert sorted(r["domain"] for r in records) == ["example.com", "google.com"]
+        assert "Reading" in result.stderr
+        assert "example.com" in result.stderr
+
+
+class TestWatchCommand:
+    """Tests for the watch command."""
+
+    @staticmethod
+    async def _no_changes():
+        """Yield no status changes."""
+        return
+        yield
+
+    def _run(self, tmp_path, *args):
+        """Run watch on a one-domain file and return the checker it built."""
+        path = tmp_path / "domains.txt"
+        path.write_text("google.com\n")
+        with patch("check_filter.watch.DomainWatcher") as mock_watcher:
+            mock_watcher.return_value.domains = ["google.com"]
+            mock_watcher.return_value.slot = 300.0
+            mock_watcher.return_value.watch = self._no_changes
+            result = runner.invoke(cli.app, ["watch", str(path), *args])
+
+        assert result.exit_code == 0
+        return mock_watcher.call_args.args[0]
+
+    def test_checker_refreshes_ahead(self, tmp_path):
+        """Test the watch checker caches results and refreshes them early."""
+        checker = self._run(tmp_path, "--refresh-ahead", "0.5")
+
+        assert checker.cache is not None
+        assert checker.cache.refresh_ahead == 0.5
+
+    def test_refresh_ahead_off(self, tmp_path):
+        """Test --refresh-ahead 0 keeps the cache but disables refreshes."""
+        checker = self._run(tmp_path, "--refresh-ahead", "0")
+
+        assert checker.cache is not None
+        assert checker.cache.refresh_ahead is None
+
+
 class TestNoArgs:
     """Tests for CLI with no arguments."""
 
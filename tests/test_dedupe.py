@@ -0,0 +1,150 @@
+"""Tests for the dedupe module."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from check_filter import CheckResult, DomainChecker, FilterStatus, cli
+from check_filter.dedupe import (
+    BloomDeduplicator,
+    BloomFilter,
+    ExactDeduplicator,
+    make_deduplicator,
+)
+
+runner = CliRunner()
+
+DOMAINS = ["a.com", "b.com", "a.com", "c.com", "b.com", "a.com"]
+
+
+class TestExactDeduplicator:
+    """Tests for ExactDeduplicator class."""
+
+    def test_filters_in_order(self):
+        """Test first occurrences pass through in input order."""
+        with ExactDeduplicator() as dedupe:
+            unique = list(dedupe.filter(DOMAINS))
+
+        assert unique == ["a.com", "b.com", "c.com"]
+        assert dedupe.stats.unique == 3
+        assert dedupe.stats.duplicates == 3
+
+    def test_spills_beyond_memory_budget(self):
+        """Test results stay exact with a tiny page cache."""
+        domains = [f"d{i % 5000}.example.com" for i in range(20_000)]
+
+        with ExactDeduplicator(max_memory=1) as dedupe:
+            unique = list(dedupe.filter(domains))
+
+        assert len(unique) == 5000
+        assert dedupe.stats.duplicates == 15_000
+
+    def test_invalid_memory(self):
+        """Test a non-positive budget is rejected."""
+        with pytest.raises(ValueError):
+            ExactDeduplicator(max_memory=0)
+
+
+class TestBloomFilter:
+    """Tests for BloomFilter class."""
+
+    def test_no_false_negatives(self):
+        """Test every added item is reported as present."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [f"d{i}.com" for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        assert all(item in bloom for item in items)
+
+    def test_false_positive_rate(self):
+        """Test the observed false-positive rate is near the target."""
+        bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+        for i in range(10_000):
+            bloom.add(f"in{i}.com")
+
+        false_positives = sum(f"out{i}.com" in bloom for i in range(10_000))
+
+        assert false_positives < 200
+
+    def test_sizing(self):
+        """Test the filter is sized from capacity and error rate."""
+        bloom = BloomFilter(capacity=1_000_000, error_rate=0.001)
+
+        assert bloom.hashes == 10
+        assert 1_700_000 < bloom.nbytes < 1_900_000
+
+    def test_invalid_arguments(self):
+        """Test invalid sizing is rejected."""
+        with pytest.raises(ValueError):
+            BloomFilter(capacity=0)
+        with pytest.raises(ValueError):
+            BloomFilter(error_rate=1)
+
+
+class TestBloomDeduplicator:
+    """Tests for BloomDeduplicator class."""
+
+    def test_filters_in_order(self):
+        """Test duplicates are skipped and counted."""
+        dedupe = BloomDeduplicator(capacity=100)
+
+        assert list(dedupe.filter(DOMAINS)) == ["a.com", "b.com", "c.com"]
+        assert dedupe.stats.duplicates == 3
+
+
+class TestMakeDeduplicator:
+    """Tests for make_deduplicator function."""
+
+    def test_modes(self):
+        """Test each mode builds the matching class."""
+        with make_deduplicator("exact") as exact:
+            assert isinstance(exact, ExactDeduplicator)
+        assert isinstance(make_deduplicator("bloom", capacity=10), BloomDeduplicator)
+
+    def test_unknown_mode(self):
+        """Test an unknown mode raises ValueError."""
+        with pytest.raises(ValueError):
+            make_deduplicator("set")
+
+
+class TestFileDedupe:
+    """Tests for the file command's --dedupe option."""
+
+    @staticmethod
+    def _invoke(args, **kwargs):
+        async def acheck(domain):
+            return CheckResult(domain=domain, status=FilterStatus.FREE)
+
+        with patch.object(DomainChecker, "acheck", new=AsyncMock(side_effect=acheck)):
+            return runner.invoke(cli.app, ["file", *args], **kwargs)
+
+    @pytest.mark.parametrize("mode", ["exact", "bloom"])
+    def test_skips_duplicates(self, tmp_path, mode):
+        """Test repeated domains are checked once and counted."""
+        path = tmp_path / "domains.txt"
+        path.write_text("\n".join(DOMAINS + ["A.com"]))
+
+        result = self._invoke([str(path), "--dedupe", mode])
+
+        assert result.exit_code == 0
+        assert "Skipped 4 duplicate domain(s)" in result.stdout
+
+    def test_dedupes_while_streaming(self):
+        """Test standard input is deduplicated before it is validated."""
+        with patch(
+            "check_filter.utils.validate_domains", return_value=([], ["x"])
+        ) as validate:
+            self._invoke(["-", "--dedupe", "exact"], input="\n".join(DOMAINS))
+
+        validate.assert_called_once_with(["a.com", "b.com", "c.com"])
+
+    def test_rejects_unknown_mode(self, tmp_path):
+        """Test an unknown mode exits with an error."""
+        path = tmp_path / "domains.txt"
+        path.write_text("a.com\n")
+
+        result = self._invoke([str(path), "--dedupe", "set"])
+
+        assert result.exit_code == 1
@@ -0,0 +1,199 @@
+"""Tests for the differential module."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import dns.resolver
+import pytest
+from typer.testing import CliRunner
+
+from check_filter import CheckResult, FilterStatus, cli
+from check_filter.differential import (
+    ComparisonResult,
+    DifferentialChecker,
+    answers_agree,
+)
+
+runner = CliRunner()
+
+
+class FakeResolver:
+    """Resolver stand-in answering from a table after a fixed delay."""
+
+    def __init__(self, answers, delay=0.0):
+        self.answers = answers
+        self.delay = delay
+
+    async def resolve(self, domain, rdtype):
+        await asyncio.sleep(self.delay)
+        answer = self.answers.get(domain, dns.resolver.NXDOMAIN())
+        if isinstance(answer, Exception):
+            raise answer
+        return [SimpleNamespace(address=ip) for ip in answer]
+
+
+def _checker(test, control, delay=0.0):
+    checker = DifferentialChecker(["192.0.2.1"] * len(test), ["192.0.2.2"])
+    checker.test_resolvers = [FakeResolver(answers, delay) for answers in test]
+    checker.control_resolvers = [FakeResolver(control, delay)]
+    return checker
+
+
+class TestAnswersAgree:
+    """Tests for answers_agree function."""
+
+    def test_shared_address(self):
+        """Test overlapping answers agree."""
+        assert answers_agree(frozenset({"1.2.3.4"}), frozenset({"1.2.3.4", "5.6.7.8"}))
+
+    def test_same_network(self):
+        """Test answers from the same /24 agree."""
+        assert answers_agree(frozenset({"1.2.3.4"}), frozenset({"1.2.3.200"}))
+        assert answers_agree(frozenset({"2001:db8::1"}), frozenset({"2001:db8:0:1::1"}))
+
+    def test_disjoint(self):
+        """Test unrelated answers disagree."""
+        assert not answers_agree(frozenset({"10.0.0.1"}), frozenset({"1.2.3.4"}))
+
+
+class TestDifferentialChecker:
+    """Tests for DifferentialChecker class."""
+
+    @pytest.mark.asyncio
+    async def test_agreeing_answers_are_free(self):
+        """Test matching answers give FREE with both answer sets."""
+        checker = _checker([{"a.com": ["1.2.3.4"]}], {"a.com": ["1.2.3.5"]})
+
+        result = await checker.acheck("a.com")
+
+        assert isinstance(result, ComparisonResult)
+        assert result.status is FilterStatus.FREE
+        assert result.ips == frozenset({"1.2.3.4"})
+        assert result.control_ips == frozenset({"1.2.3.5"})
+
+    @pytest.mark.asyncio
+    async def test_disagreeing_answer_is_tampered(self):
+        """Test an unknown redirect address is flagged."""
+        checker = _checker(
+            [{"a.com": ["1.2.3.4"]}, {"a.com": ["198.51.100.7"]}],
+            {"a.com": ["1.2.3.4"]},
+        )
+
+        result = await checker.acheck("a.com")
+
+        assert result.status is FilterStatus.TAMPERED
+        assert result.ips == frozenset({"1.2.3.4", "198.51.100.7"})
+
+    @pytest.mark.asyncio
+    async def test_forged_nxdomain_is_tampered(self):
+        """Test a denial the control does not share is flagged."""
+        checker = _checker([{}], {"a.com": ["1.2.3.4"]})
+
+        result = await checker.acheck("a.com")
+
+        assert result.status is FilterStatus.TAMPERED
+        assert result.error_class == "nxdomain"
+
+    @pytest.mark.asyncio
+    async def test_given_resolver_replaces_test_resolvers(self):
+        """Test an explicit resolver is compared against the control."""
+        checker = _checker([{"a.com": ["1.2.3.4"]}], {"a.com": ["1.2.3.4"]})
+
+        result = await checker._resolve(
+            "a.com", FakeResolver({"a.com": ["198.51.100.7"]})
+        )
+
+        assert result.status is FilterStatus.TAMPERED
+        assert result.ips == frozenset({"198.51.100.7"})
+
+    @pytest.mark.asyncio
+    async def test_blocking_ip_wins(self):
+        """Test a known blocking IP is still reported as BLOCKED."""
+        checker = _checker([{"a.com": ["10.10.34.34"]}], {"a.com": ["1.2.3.4"]})
+
+        result = await checker.acheck("a.com")
+
+        assert result.status is FilterStatus.BLOCKED
+
+    @pytest.mark.asyncio
+    async def test_control_failure_falls_back_to_test(self):
+        """Test the test answer decides when the control cannot answer."""
+        checker = _checker(
+            [{"a.com": ["1.2.3.4"]}], {"a.com": dns.resolver.NoNameservers()}
+        )
+
+        result = await checker.acheck("a.com")
+
+        assert result.status is FilterStatus.FREE
+        assert result.control_error_class == "no_nameservers"
+
+    @pytest.mark.asyncio
+    async def test_both_deny(self):
+        """Test a name missing everywhere stays UNKNOWN."""
+        checker = _checker([{}], {})
+
+        result = await checker.acheck("missing.com")
+
+        assert result.status is FilterStatus.UNKNOWN
+
+    @pytest.mark.asyncio
+    async def test_fan_out_is_concurrent(self):
+        """Test resolvers are queried concurrently, not one after another."""
+        answers = {"a.com": ["1.2.3.4"]}
+        checker = _checker([answers, answers, answers], answers, delay=0.1)
+
+        started = time.perf_counter()
+        await checker.acheck("a.com")
+
+        assert time.perf_counter() - started < 0.3
+
+    def test_to_dict_includes_control(self):
+        """Test serialized results carry the control answers."""
+        result = ComparisonResult(
+            domain="a.com",
+            status=FilterStatus.TAMPERED,
+            ips=frozenset({"198.51.100.7"}),
+            control_ips=frozenset({"1.2.3.4"}),
+        )
+
+        data = result.to_dict()
+
+        assert data["status"] == "tampered"
+        assert data["control_ips"] == ["1.2.3.4"]
+
+    def test_invalid_arguments(self):
+        """Test empty resolver sets and unsupported options are rejected."""
+        with pytest.raises(ValueError):
+            DifferentialChecker([], ["9.9.9.9"])
+        with pytest.raises(TypeError):
+            DifferentialChecker(["192.0.2.1"], ["9.9.9.9"], nameservers=["8.8.8.8"])
+
+
+class TestControlOption:
+    """Tests for the --control CLI option."""
+
+    def test_domains_uses_differential_checker(self):
+        """Test --control passes a DifferentialChecker to print_result."""
+        with patch(
+            "check_filter.cli.utils.print_result", new_callable=AsyncMock
+        ) as mock_print:
+            mock_print.return_value = [
+                CheckResult(domain="a.com", status=FilterStatus.TAMPERED)
+            ]
+            result = runner.invoke(
+                cli.app,
+                ["domains", "a.com", "--resolver", "192.0.2.1", "--control", "9.9.9.9"],
+            )
+
+        assert result.exit_code == 0
+        checker = mock_print.call_args.kwargs["checker"]
+        assert isinstance(checker, DifferentialChecker)
+        assert len(checker.test_resolvers) == 1
+
+    def test_resolver_requires_control(self):
+        """Test --resolver alone is rejected."""
+        result = runner.invoke(cli.app, ["domains", "a.com", "--resolver", "192.0.2.1"])
+
+        assert result.exit_code == 1
@@ -0,0 +1,238 @@
+"""Tests for the history module."""
+
+import sqlite3
+import time
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from check_filter import CheckResult, FilterStatus, cli
+from check_filter.history import HistoryStore, StatusChange, parse_duration
+
+runner = CliRunner()
+
+
+def _add(store, checked_at, *results):
+    """Store (domain, status) pairs as results checked at the given time."""
+    with patch("check_filter.journal.time.time", return_value=checked_at):
+        return store.add_many(
+            CheckResult(domain=domain, status=status) for domain, status in results
+        )
+
+
+@pytest.fixture
+def store(tmp_path):
+    with HistoryStore(tmp_path / "history.db") as store:
+        yield store
+
+
+class TestParseDuration:
+    """Tests for parse_duration function."""
+
+    @pytest.mark.parametrize(
+        ("text", "seconds"),
+        [("90", 90), ("30s", 30), ("30m", 1800), ("24h", 86400), ("1.5d", 129600)],
+    )
+    def test_valid(self, text, seconds):
+        """Test numbers with and without units are parsed."""
+        assert parse_duration(text) == seconds
+
+    @pytest.mark.parametrize("text", ["", "h", "-1h", "24 hours", "1y"])
+    def test_invalid(self, text):
+        """Test anything else is rejected."""
+        with pytest.raises(ValueError):
+            parse_duration(text)
+
+
+class TestHistoryStore:
+    """Tests for HistoryStore class."""
+
+    def test_records_changes(self, store):
+        """Test only status transitions are logged as changes."""
+        assert _add(store, 100.0, ("a.com", FilterStatus.FREE)) == 1
+        assert _add(store, 200.0, ("a.com", FilterStatus.FREE)) == 0
+        assert _add(store, 300.0, ("a.com", FilterStatus.BLOCKED)) == 1
+        _add(store, 400.0, ("a.com", FilterStatus.BLOCKED))
+
+        assert store.timeline("a.com") == [
+            StatusChange("a.com", FilterStatus.FREE, FilterStatus.BLOCKED, 300.0),
+            StatusChange("a.com", None, FilterStatus.FREE, 100.0),
+        ]
+        state = store.latest("a.com")
+        assert state.status is FilterStatus.BLOCKED
+        assert (state.checked_at, state.changed_at) == (400.0, 300.0)
+        assert len(store.checks("a.com")) == 4
+
+    def test_changes_within_batch(self, store):
+        """Test transitions inside one batch are all logged."""
+        changes = _add(
+            store,
+            100.0,
+            ("a.com", FilterStatus.FREE),
+            ("a.com", FilterStatus.FREE),
+            ("a.com", FilterStatus.BLOCKED),
+        )
+
+        assert changes == 2
+        assert store.latest("a.com").status is FilterStatus.BLOCKED
+
+    def test_inconclusive_results(self, store):
+        """Test ERROR results are stored but never count as a change."""
+        _add(store, 100.0, ("a.com", FilterStatus.BLOCKED))
+        _add(store, 200.0, ("a.com", FilterStatus.ERROR))
+        _add(store, 250.0, ("a.com", FilterStatus.UNCHECKED))
+        _add(store, 300.0, ("a.com", FilterStatus.BLOCKED))
+
+        assert len(store.timeline("a.com")) == 1
+        assert store.latest("a.com").status is FilterStatus.BLOCKED
+        assert [c["status"] for c in store.checks("a.com")] == [
+            "blocked",
+            "error",
+            "blocked",
+        ]
+
+    def test_became(self, store):
+        """Test the time a domain last became a status is returned."""
+        for checked_at, status in (
+            (100.0, FilterStatus.FREE),
+            (200.0, FilterStatus.BLOCKED),
+            (300.0, FilterStatus.FREE),
+            (400.0, FilterStatus.BLOCKED),
+        ):
+            _add(store, checked_at, ("a.com", status))
+
+        assert store.became("a.com", FilterStatus.BLOCKED) == 400.0
+        assert store.became("a.com", FilterStatus.TAMPERED) is None
+        assert store.became("b.com", FilterStatus.BLOCKED) is None
+
+    def test_changed_since(self, store):
+        """Test recent changes are listed without first observations."""
+        _add(store, 100.0, ("a.com", FilterStatus.FREE), ("b.com", FilterStatus.FREE))
+        _add(store, 200.0, ("a.com", FilterStatus.BLOCKED))
+        _add(store, 250.0, ("c.com", FilterStatus.BLOCKED))
+        _add(store, 300.0, ("b.com", FilterStatus.TAMPERED))
+
+        assert [c.domain for c in store.changed_since(150.0)] == ["b.com", "a.com"]
+        assert [
+            c.domain for c in store.changed_since(150.0, status=FilterStatus.BLOCKED)
+        ] == ["a.com"]
+        assert store.changed_since(150.0, limit=1)[0].domain == "b.com"
+
+    def test_status_counts(self, store):
+        """Test domains are counted by their latest status."""
+        _add(store, 100.0, ("a.com", FilterStatus.FREE), ("b.com", FilterStatus.FREE))
+        _add(store, 200.0, ("a.com", FilterStatus.BLOCKED))
+
+        assert store.status_counts() == {
+            FilterStatus.FREE: 1,
+            FilterStatus.BLOCKED: 1,
+        }
+
+    def test_indexes_and_wal(self, tmp_path):
+        """Test the database is in WAL mode and its queries use indexes."""
+        path = tmp_path / "history.db"
+        HistoryStore(path).close()
+
+        with sqlite3.connect(path) as db:
+            assert db.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+            plan = " ".join(
+                row[-1]
+                for row in db.execute(
+                    "EXPLAIN QUERY PLAN SELECT * FROM changes WHERE changed_at >= 0"
+                )
+            )
+        assert "changes_time" in plan
+
+    def test_readonly(self, tmp_path):
+        """Test a read-only store cannot write or open a missing file."""
+        path = tmp_path / "history.db"
+        HistoryStore(path).close()
+
+        with (
+            HistoryStore(path, readonly=True) as store,
+            pytest.raises(sqlite3.OperationalError),
+        ):
+            store.add(CheckResult(domain="a.com", status=FilterStatus.FREE))
+        with pytest.raises(sqlite3.OperationalError):
+            HistoryStore(tmp_path / "missing.db", readonly=True)
+
+    def test_readonly_rejects_other_files(self, tmp_path):
+        """Test a read-only store fails on open for a non-history file."""
+        path = tmp_path / "other.db"
+        with sqlite3.connect(path) as db:
+            db.execute("CREATE TABLE t (x)")
+        (tmp_path / "text.db").write_text("not a database" * 100)
+
+        with pytest.raises(sqlite3.OperationalError, match="latest"):
+            HistoryStore(path, readonly=True)
+        with pytest.raises(sqlite3.DatabaseError):
+            HistoryStore(tmp_path / "text.db", readonly=True)
+
+
+class TestHistoryCommand:
+    """Tests for the history CLI command."""
+
+    @pytest.fixture
+    def database(self, tmp_path):
+        path = tmp_path / "history.db"
+        now = time.time()
+        with HistoryStore(path) as store:
+            _add(
+                store,
+                now - 7200,
+                ("a.com", FilterStatus.FREE),
+                ("b.com", FilterStatus.FREE),
+            )
+            _add(store, now - 60, ("a.com", FilterStatus.BLOCKED))
+        return path
+
+    def test_summary(self, database):
+        """Test the default output counts domains per status."""
+        result = runner.invoke(cli.app, ["history", str(database)])
+
+        assert result.exit_code == 0
+        assert "Blocked" in result.stdout
+        assert "Total" in result.stdout
+
+    def test_domain(self, database):
+        """Test a domain's latest status and timeline are shown."""
+        result = runner.invoke(
+            cli.app, ["history", str(database), "a.com", "--status", "blocked"]
+        )
+
+        assert result.exit_code == 0
+        assert "a.com: blocked" in result.stdout
+        assert "Became blocked:" in result.stdout
+
+    def test_changed(self, database):
+        """Test recent changes are listed."""
+        result = runner.invoke(cli.app, ["history", str(database), "--changed", "1h"])
+
+        assert result.exit_code == 0
+        assert "a.com" in result.stdout
+        assert "b.com" not in result.stdout
+
+    @pytest.mark.parametrize(
+        "args",
+        [["--changed", "soon"], ["--status", "gone"], ["x.com"]],
+    )
+    def test_invalid_arguments(self, database, args):
+        """Test bad arguments and unknown domains exit with an error."""
+        result = runner.invoke(cli.app, ["history", str(database), *args])
+
+        assert result.exit_code == 1
+
+    def test_missing_database(self, tmp_path):
+        """Test a missing database exits with an error."""
+        result = runner.invoke(cli.app, ["history", str(tmp_path / "none.db")])
+
+        assert result.exit_code == 1
+
+    def test_summary_counts_only_for_summary(self, database):
+        """Test domain and change queries do not count the whole store."""
+        with patch.object(HistoryStore, "status_counts") as counts:
+            result = runner.invoke(cli.app, ["history", str(database), "a.com"])
+
+        assert result.exit_code == 0
+        counts.assert_not_called()
@@ -0,0 +1,284 @@
+"""Tests for the incremental module."""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from check_filter import CheckResult, DomainChecker, FilterStatus, cli
+from check_filter.incremental import (
+    PreviousEntry,
+    arecheck,
+    due_domains,
+    load_previous,
+)
+from check_filter.journal import ScanJournal, iter_records
+
+runner = CliRunner()
+
+NOW = 1_700_000_000.0
+
+
+def _checker(statuses: dict[str, FilterStatus]) -> DomainChecker:
+    """Create a checker returning fixed statuses."""
+    checker = DomainChecker()
+
+    async def acheck(domain):
+        return CheckResult(domain=domain, status=statuses[domain])
+
+    checker.acheck = AsyncMock(side_effect=acheck)
+    return checker
+
+
+class TestLoadPrevious:
+    """Tests for load_previous function."""
+
+    def test_latest_record_wins(self, tmp_path):
+        """Test later journal records override earlier ones."""
+        path = tmp_path / "scan.jsonl"
+        path.write_text(
+            "\n".join(
+                json.dumps(r)
+                for r in [
+                    {"domain": "a.com", "status": "free", "checked_at": 1},
+                    {"domain": "a.com", "status": "blocked", "checked_at": 2},
+                    {"domain": "b.com", "status": "bogus", "checked_at": 3},
+                ]
+            )
+        )
+
+        previous = load_previous(path)
+
+        assert previous == {
+            "a.com": PreviousEntry(FilterStatus.BLOCKED, 2.0, changed_at=2.0)
+        }
+
+    def test_changed_at_ignores_inconclusive_records(self, tmp_path):
+        """Test ERROR records neither count as nor hide a status change."""
+        path = tmp_path / "scan.jsonl"
+        path.write_text(
+            "\n".join(
+                json.dumps({"domain": "a.com", "status": s, "checked_at": t})
+                for s, t in [("free", 1), ("error", 2), ("free", 3), ("error", 4)]
+            )
+        )
+
+        assert load_previous(path)["a.com"].changed_at is None
+
+        with path.open("a") as f:
+            f.write(
+                "\n"
+                + json.dumps({"domain": "a.com", "status": "blocked", "checked_at": 5})
+            )
+
+        assert load_previous(path)["a.com"].changed_at == 5.0
+
+    def test_keeps_last_conclusive_status(self, tmp_path):
+        """Test the last conclusive status survives later ERROR records."""
+        path = tmp_path / "scan.jsonl"
+        path.write_text(
+            "\n".join(
+                json.dumps({"domain": d, "status": s, "checked_at": t})
+                for d, s, t in [("a.com", "free", 1), ("a.com", "error", 2)]
+                + [("b.com", "error", 1)]
+            )
+        )
+
+        previous = load_previous(path)
+
+        assert previous["a.com"].status is FilterStatus.ERROR
+        assert previous["a.com"].conclusive is FilterStatus.FREE
+        assert previous["b.com"].conclusive is None
+
+
+class TestDueDomains:
+    """Tests for due_domains function."""
+
+    def test_selects_expired_and_failed(self):
+        """Test only expired or failed entries are selected, failures first."""
+        previous = {
+            "fresh.com": PreviousEntry(FilterStatus.FREE, NOW - 10),
+            "old.com": PreviousEntry(FilterStatus.FREE, NOW - 1000),
+            "older.com": PreviousEntry(FilterStatus.BLOCKED, NOW - 2000),
+            "error.com": PreviousEntry(FilterStatus.ERROR, NOW - 1),
+            "gone.com": PreviousEntry(FilterStatus.UNKNOWN, NOW - 5),
+        }
+
+        due = due_domains(previous, max_age=500, now=NOW)
+
+        assert due == ["gone.com", "error.com", "older.com", "old.com"]
+
+    def test_use_ttl(self):
+        """Test recorded TTLs replace max_age when requested."""
+        previous = {
+            "short.com": PreviousEntry(FilterStatus.FREE, NOW - 100, ttl=60),
+            "long.com": PreviousEntry(FilterStatus.FREE, NOW - 100, ttl=3600),
+            "none.com": PreviousEntry(FilterStatus.FREE, NOW - 100),
+        }
+
+        assert due_domains(previous, max_age=50, use_ttl=True, now=NOW) == [
+            "none.com",
+            "short.com",
+        ]
+
+    def test_use_ttl_honours_negative_ttl(self):
+        """Test dead domains wait for their negative TTL with use_ttl."""
+        previous = {
+            "dead.com": PreviousEntry(FilterStatus.UNKNOWN, NOW - 100, ttl=900),
+            "expired.com": PreviousEntry(FilterStatus.UNKNOWN, NOW - 100, ttl=60),
+            "nosoa.com": PreviousEntry(FilterStatus.UNKNOWN, NOW - 100),
+        }
+
+        assert due_domains(previous, max_age=50, use_ttl=True, now=NOW) == [
+            "nosoa.com",
+            "expired.com",
+        ]
+        assert len(due_domains(previous, max_age=50, now=NOW)) == 3
+
+
+class TestArecheck:
+    """Tests for arecheck function."""
+
+    @pytest.mark.asyncio
+    async def test_emits_only_transitions(self, tmp_path):
+        """Test only changed statuses are reported and results journaled."""
+        previous = {
+            "a.com": PreviousEntry(FilterStatus.FREE, 0),
+            "b.com": PreviousEntry(FilterStatus.FREE, 0),
+            "c.com": PreviousEntry(FilterStatus.BLOCKED, 0),
+            "d.com": PreviousEntry(FilterStatus.FREE, 0),
+        }
+        checker = _checker(
+            {
+                "a.com": FilterStatus.BLOCKED,
+                "b.com": FilterStatus.FREE,
+                "c.com": FilterStatus.FREE,
+                "d.com": FilterStatus.ERROR,
+            }
+        )
+        path = tmp_path / "scan.jsonl"
+
+        with ScanJournal(path) as journal:
+            transitions = await arecheck(
+                checker, previous, concurrency=2, journal=journal
+            )
+
+        changes = {(t.domain, t.previous, t.current) for t in transitions}
+        assert changes == {
+            ("a.com", FilterStatus.FREE, FilterStatus.BLOCKED),
+            ("c.com", FilterStatus.BLOCKED, FilterStatus.FREE),
+        }
+        assert len(list(iter_records(path))) == 4
+
+    @pytest.mark.asyncio
+    async def test_compares_with_last_conclusive_status(self):
+        """Test an ERROR in between neither hides nor fakes a transition."""
+        previous = {
+            "same.com": PreviousEntry(
+                FilterStatus.ERROR, 0, conclusive=FilterStatus.FREE
+            ),
+            "changed.com": PreviousEntry(
+                FilterStatus.ERROR, 0, conclusive=FilterStatus.FREE
+            ),
+            "failed.com": PreviousEntry(FilterStatus.ERROR, 0),
+        }
+        checker = _checker(
+            {
+                "same.com": FilterStatus.FREE,
+                "changed.com": FilterStatus.BLOCKED,
+                "failed.com": FilterStatus.FREE,
+            }
+        )
+
+        transitions = await arecheck(checker, previous)
+
+        assert [(t.domain, t.previous, t.current) for t in transitions] == [
+            ("changed.com", FilterStatus.FREE, FilterStatus.BLOCKED)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_skips_fresh_entries(self):
+        """Test entries younger than max_age are not queried."""
+        previous = {"a.com": PreviousEntry(FilterStatus.FREE, time.time())}
+        checker = _checker({})
+
+        assert await arecheck(checker, previous) == []
+        checker.acheck.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_time_budget_cancels_in_flight(self):
+        """Test checks in flight are cancelled when the budget elapses."""
+        previous = {f"{i}.com": PreviousEntry(FilterStatus.FREE, 0) for i in range(5)}
+        checker = DomainChecker()
+
+        async def slow(domain):
+            await asyncio.sleep(10)
+
+        checker.acheck = AsyncMock(side_effect=slow)
+
+        transitions = await arecheck(checker, previous, time_budget=0.05, concurrency=2)
+
+        assert transitions == []
+        assert checker.acheck.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_concurrency(self):
+        """Test concurrency below 1 is rejected."""
+        with pytest.raises(ValueError):
+            await arecheck(_checker({}), {}, concurrency=0)
+
+    @pytest.mark.asyncio
+    async def test_checker_method_accepts_path(self, tmp_path):
+        """Test DomainChecker.arecheck loads a journal path."""
+        path = tmp_path / "scan.jsonl"
+        path.write_text(
+            '{"domain":"a.com","status":"free","checked_at":0}\n'
+            '{"domain":"a.com","status":"error","checked_at":1}\n'
+        )
+        checker = DomainChecker()
+
+        with patch.object(
+            checker,
+            "acheck",
+            new=AsyncMock(
+                return_value=CheckResult(domain="a.com", status=FilterStatus.BLOCKED)
+            ),
+        ):
+            transitions = await checker.arecheck(path)
+
+        assert [(t.previous, t.current) for t in transitions] == [
+            (FilterStatus.FREE, FilterStatus.BLOCKED)
+        ]
+
+
+class TestRecheckCommand:
+    """Tests for the recheck CLI command."""
+
+    def test_prints_transitions(self, tmp_path):
+        """Test transitions are printed."""
+        path = tmp_path / "scan.jsonl"
+        path.write_text('{"domain":"a.com","status":"free","checked_at":0}\n')
+
+        with patch.object(
+            DomainChecker,
+            "acheck",
+            new=AsyncMock(
+                return_value=CheckResult(domain="a.com", status=FilterStatus.BLOCKED)
+            ),
+        ):
+            result = runner.invoke(cli.app, ["recheck", str(path)])
+
+        assert result.exit_code == 0
+        assert "a.com: free -> blocked" in result.stdout
+
+    def test_empty_journal(self, tmp_path):
+        """Test an empty journal is rejected."""
+        path = tmp_path / "scan.jsonl"
+        path.write_text("")
+
+        result = runner.invoke(cli.app, ["recheck", str(path)])
+
+        assert result.exit_code == 1
@@ -0,0 +1,166 @@
+"""Tests for the inputs module."""
+
+import bz2
+import gzip
+import io
+import sys
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from check_filter import CheckResult, DomainChecker, FilterStatus, cli
+from check_filter.inputs import detect_compression, is_mappable, iter_domains
+
+runner = CliRunner()
+
+CONTENT = b"# feed\nexample.com\n\n  Google.com  \n"
+EXPECTED = ["example.com", "Google.com"]
+
+
+class TestDetectCompression:
+    """Tests for detect_compression function."""
+
+    @pytest.mark.parametrize(
+        ("name", "head", "expected"),
+        [
+            ("feed.txt", b"exam", None),
+            ("feed.txt.gz", b"", "gzip"),
+            ("feed.BZ2", b"", "bz2"),
+            ("feed.zst", b"", "zstd"),
+            ("-", b"\x1f\x8b\x08\x00", "gzip"),
+            ("feed", b"BZh9", "bz2"),
+            ("feed", b"\x28\xb5\x2f\xfd", "zstd"),
+        ],
+    )
+    def test_detect(self, name, head, expected):
+        """Test detection by extension and by magic bytes."""
+        assert detect_compression(name, head) == expected
+
+
+class TestIterDomains:
+    """Tests for iter_domains function."""
+
+    def test_plain(self, tmp_path):
+        """Test reading a plain text file."""
+        path = tmp_path / "feed.txt"
+        path.write_bytes(CONTENT)
+
+        assert list(iter_domains(path)) == EXPECTED
+
+    @pytest.mark.parametrize(
+        ("name", "compress"),
+        [("feed.txt.gz", gzip.compress), ("feed.txt.bz2", bz2.compress)],
+    )
+    def test_compressed(self, tmp_path, name, compress):
+        """Test transparent decompression by extension."""
+        path = tmp_path / name
+        path.write_bytes(compress(CONTENT))
+
+        assert list(iter_domains(path)) == EXPECTED
+
+    def test_compressed_without_extension(self, tmp_path):
+        """Test decompression detected from magic bytes."""
+        path = tmp_path / "feed"
+        path.write_bytes(gzip.compress(CONTENT))
+
+        assert list(iter_domains(path)) == EXPECTED
+
+    def test_zstd(self, tmp_path):
+        """Test Zstandard input."""
+        zstandard = pytest.importorskip("zstandard")
+        path = tmp_path / "feed.zst"
+        path.write_bytes(zstandard.ZstdCompressor().compress(CONTENT))
+
+        assert list(iter_domains(path)) == EXPECTED
+
+    def test_is_lazy(self, tmp_path):
+        """Test lines are yielded before the whole input is read."""
+        path = tmp_path / "feed.txt.gz"
+        path.write_bytes(gzip.compress(b"a.com\n" * 1_000_000))
+
+        domains = iter_domains(path)
+
+        assert next(domains) == "a.com"
+        domains.close()
+
+    def test_stdin_is_not_closed(self, monkeypatch):
+        """Test reading stdin leaves it open."""
+        stdin = io.TextIOWrapper(io.BufferedReader(io.BytesIO(gzip.compress(CONTENT))))
+        monkeypatch.setattr(sys, "stdin", stdin)
+
+        assert list(iter_domains("-")) == EXPECTED
+        assert not stdin.closed
+
+    def test_missing_file(self, tmp_path):
+        """Test a missing file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            list(iter_domains(tmp_path / "missing.txt"))
+
+
+class TestIsMappable:
+    """Tests for is_mappable function."""
+
+    def test_large_plain_file(self, tmp_path):
+        """Test a plain file above the threshold qualifies."""
+        path = tmp_path / "feed.txt"
+        path.write_bytes(CONTENT)
+
+        assert is_mappable(path, min_size=1)
+        assert not is_mappable(path, min_size=len(CONTENT) + 1)
+
+    def test_streams_are_not_mappable(self, tmp_path):
+        """Test stdin, compressed and missing inputs never qualify."""
+        path = tmp_path / "feed.txt"
+        path.write_bytes(gzip.compress(CONTENT))
+
+        assert not is_mappable("-", min_size=1)
+        assert not is_mappable(path, min_size=1)
+        assert not is_mappable(tmp_path / "missing.txt", min_size=1)
+        assert not is_mappable(tmp_path, min_size=1)
+
+
+class TestFileCommandInputs:
+    """Tests for stdin and compressed input in the file command."""
+
+    @staticmethod
+    def _invoke(args, **kwargs):
+        async def acheck(domain):
+            return CheckResult(domain=domain, status=FilterStatus.FREE)
+
+        with patch.object(DomainChecker, "acheck", new=AsyncMock(side_effect=acheck)):
+            return runner.invoke(cli.app, ["file", *args], **kwargs)
+
+    def test_stdin(self):
+        """Test '-' reads the domain list from stdin."""
+        result = self._invoke(["-"], input="example.com\ngoogle.com\n")
+
+        assert result.exit_code == 0
+        assert "standard input" in result.stdout
+        assert "Checking 2 domain(s)" in result.stdout
+
+    def test_gzip_file(self, tmp_path):
+        """Test a gzip-compressed file is accepted."""
+        path = tmp_path / "feed.txt.gz"
+        path.write_bytes(gzip.compress(CONTENT))
+
+        result = self._invoke([str(path)])
+
+        assert result.exit_code == 0
+        assert "Checking 2 domain(s)" in result.stdout
+
+    def test_large_file_is_mapped(self, tmp_path):
+        """Test large plain files are validated from a memory map."""
+        path = tmp_path / "feed.txt"
+        path.write_bytes(b"example.com,5\ninvalid\n")
+
+        with (
+            patch("check_filter.inputs.is_mappable", return_value=True),
+            patch("check_filter.utils.validate_domains") as mock_validate,
+        ):
+            result = self._invoke([str(path)])
+
+        mock_validate.assert_not_called()
+        assert result.exit_code == 1
+        assert "Checking 2 domain(s)" in result.stdout
+        assert "`invalid` is invalid" in result.stdout
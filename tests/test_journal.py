@@ -0,0 +1,147 @@
+"""Tests for the journal module."""
+
+import json
+import random
+import tracemalloc
+from array import array
+
+import pytest
+
+from check_filter import CheckResult, FilterStatus, journal
+from check_filter.journal import CompletedIndex, ScanJournal, iter_records
+
+
+def _result(domain: str, status: FilterStatus = FilterStatus.FREE) -> CheckResult:
+    return CheckResult(domain=domain, status=status, ips=frozenset({"1.2.3.4"}))
+
+
+class TestScanJournal:
+    """Tests for ScanJournal class."""
+
+    def test_writes_jsonl_records(self, tmp_path):
+        """Test results are written as one JSON object per line."""
+        path = tmp_path / "scan.jsonl"
+
+        with ScanJournal(path) as journal:
+            journal.append(_result("a.com"))
+            journal.append(_result("b.com", FilterStatus.BLOCKED))
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 2
+        record = json.loads(lines[1])
+        assert record["domain"] == "b.com"
+        assert record["status"] == "blocked"
+        assert record["ips"] == ["1.2.3.4"]
+        assert "checked_at" in record
+
+    def test_flushes_in_batches(self, tmp_path):
+        """Test results are buffered until the batch size is reached."""
+        path = tmp_path / "scan.jsonl"
+        journal = ScanJournal(path, flush_every=2)
+
+        journal.append(_result("a.com"))
+        assert path.read_text() == ""
+
+        journal.append(_result("b.com"))
+        assert len(path.read_text().splitlines()) == 2
+        assert journal.written == 2
+
+        journal.close()
+        assert journal.closed
+
+    def test_appends_to_existing_journal(self, tmp_path):
+        """Test reopening a journal appends rather than truncates."""
+        path = tmp_path / "scan.jsonl"
+
+        with ScanJournal(path) as journal:
+            journal.append(_result("a.com"))
+        with ScanJournal(path) as journal:
+            journal.append(_result("b.com"))
+
+        assert [r["domain"] for r in iter_records(path)] == ["a.com", "b.com"]
+
+    def test_repairs_torn_tail(self, tmp_path):
+        """Test a partially written last line does not corrupt new records."""
+        path = tmp_path / "scan.jsonl"
+        path.write_text('{"domain":"a.com","status":"free"}\n{"domain":"b.c')
+
+        with ScanJournal(path) as journal:
+            journal.append(_result("c.com"))
+
+        assert [r["domain"] for r in iter_records(path)] == ["a.com", "c.com"]
+
+    def test_flush_after_close_raises(self, tmp_path):
+        """Test flushing a closed journal raises ValueError."""
+        journal = ScanJournal(tmp_path / "scan.jsonl")
+        journal.close()
+
+        with pytest.raises(ValueError):
+            journal.flush()
+
+    def test_invalid_flush_every(self, tmp_path):
+        """Test non-positive batch sizes are rejected."""
+        with pytest.raises(ValueError):
+            ScanJournal(tmp_path / "scan.jsonl", flush_every=0)
+
+    def test_records_round_trip(self, tmp_path):
+        """Test journal records convert back into CheckResult objects."""
+        path = tmp_path / "scan.jsonl"
+        original = _result("a.com", FilterStatus.BLOCKED)
+
+        with ScanJournal(path) as journal:
+            journal.append(original)
+
+        (record,) = iter_records(path)
+        assert CheckResult.from_dict(record) == original
+
+
+class TestCompletedIndex:
+    """Tests for CompletedIndex class."""
+
+    def test_membership(self, tmp_path):
+        """Test domains in the journal are reported as completed."""
+        path = tmp_path / "scan.jsonl"
+        with ScanJournal(path) as journal:
+            for domain in ("a.com", "b.com", "a.com"):
+                journal.append(_result(domain))
+
+        index = CompletedIndex.from_journal(path)
+
+        assert "a.com" in index
+        assert "A.COM" in index
+        assert "c.com" not in index
+        assert len(index) == 2
+
+    def test_missing_journal(self, tmp_path):
+        """Test a missing journal produces an empty index."""
+        index = CompletedIndex.from_journal(tmp_path / "missing.jsonl")
+
+        assert len(index) == 0
+        assert "a.com" not in index
+
+    def test_sorts_across_chunks(self, monkeypatch):
+        """Test keys split over several sort chunks are merged and deduplicated."""
+        monkeypatch.setattr(journal, "SORT_CHUNK", 3)
+        keys = array("Q", [9, 2, 7, 2, 5, 9, 1, 8, 1, 0])
+
+        index = CompletedIndex(keys)
+
+        assert list(index._keys) == [0, 1, 2, 5, 7, 8, 9]
+
+    def test_large_index_peak_memory(self, monkeypatch):
+        """Test building a large index does not box every key at once."""
+        monkeypatch.setattr(journal, "SORT_CHUNK", 4096)
+        count = 200_000
+        keys = array("Q", (random.getrandbits(64) for _ in range(count)))
+
+        tracemalloc.start()
+        try:
+            index = CompletedIndex(keys)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert len(index) == len(set(keys))
+        # Sorted runs plus the result take about 16 bytes per key; boxing
+        # every key as an int in a list would take about 48.
+        assert peak < 24 * count
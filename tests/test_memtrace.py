@@ -0,0 +1,94 @@
+"""Tests for the memtrace module."""
+
+import time
+import tracemalloc
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from check_filter import CheckResult, DomainChecker, FilterStatus, cli
+from check_filter.memtrace import MemoryReport, MemoryTracer
+
+runner = CliRunner()
+
+
+def _allocate():
+    return [bytearray(1024) for _ in range(2000)]
+
+
+class TestMemoryTracer:
+    """Tests for MemoryTracer class."""
+
+    def test_reports_peak_and_sites(self):
+        """Test the report attributes live memory to its source line."""
+        with MemoryTracer(interval=0.01) as tracer:
+            held = _allocate()
+            time.sleep(0.05)
+        report = tracer.report(domains=len(held))
+
+        assert not tracemalloc.is_tracing()
+        assert report.peak >= 2000 * 1024
+        assert report.samples
+        assert report.bytes_per_domain == report.peak / 2000
+        assert report.top_lines[0].location.startswith("tests/test_memtrace.py:")
+        assert report.top_lines[0].size >= 2000 * 1024
+        assert report.top_files[0].location == "tests/test_memtrace.py"
+
+    def test_snapshot_taken_at_peak(self):
+        """Test memory freed before the end still shows in the report."""
+        with MemoryTracer(interval=0.01) as tracer:
+            held = _allocate()
+            time.sleep(0.05)
+            del held
+        report = tracer.report()
+
+        assert report.current < 2000 * 1024
+        assert report.top_lines[0].size >= 2000 * 1024
+        assert report.bytes_per_domain is None
+
+    def test_keeps_existing_tracing(self):
+        """Test tracing started elsewhere is left running."""
+        tracemalloc.start()
+        try:
+            with MemoryTracer(interval=0.01):
+                pass
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+
+    def test_stop_is_idempotent(self):
+        """Test stopping twice (or never starting) is harmless."""
+        tracer = MemoryTracer()
+        tracer.stop()
+        tracer.start()
+        tracer.stop()
+        tracer.stop()
+
+        assert isinstance(tracer.report(), MemoryReport)
+        with pytest.raises(RuntimeError):
+            tracer.start()
+
+    @pytest.mark.parametrize("kwargs", [{"interval": 0}, {"top": 0}, {"frames": 0}])
+    def test_invalid_arguments(self, kwargs):
+        """Test invalid configuration is rejected."""
+        with pytest.raises(ValueError):
+            MemoryTracer(**kwargs)
+
+
+class TestMemtraceOption:
+    """Tests for the --memtrace CLI option."""
+
+    def test_domains_memtrace(self):
+        """Test --memtrace prints a memory report after the table."""
+        acheck = AsyncMock(
+            side_effect=lambda d: CheckResult(domain=d, status=FilterStatus.FREE)
+        )
+        with patch.object(DomainChecker, "acheck", new=acheck):
+            result = runner.invoke(cli.app, ["domains", "x.com,y.com", "--memtrace"])
+
+        assert result.exit_code == 0
+        assert "Memory" in result.stdout
+        assert "Peak per domain" in result.stdout
+        assert "Top Allocation Sites" in result.stdout
+        assert not tracemalloc.is_tracing()
@@ -0,0 +1,250 @@
+"""Performance regression tests compared with stored baselines.
+
+Every benchmark runs a hot path against in-process fakes (no network) and
+compares two measurements with ``tests/perf_baselines.json``:
+
+* time, in units of a fixed calibration workload timed on the same
+  machine, so that baselines recorded on one machine hold on another;
+* peak memory allocated while the benchmark runs, from tracemalloc.
+
+A benchmark fails when it is slower than its baseline by more than
+``CHECK_FILTER_PERF_TOLERANCE`` (default 1.0, i.e. twice as slow) or
+allocates more than ``MEMORY_TOLERANCE`` above its baseline. After an
+intended change, record new baselines with::
+
+    pytest -m perf --update-perf-baselines
+
+The benchmarks are deselected by default; run them with ``pytest -m perf``.
+They are skipped on a Python version other than the one the baselines
+were recorded with.
+"""
+
+import asyncio
+import gc
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import dns.message
+import dns.rrset
+import pytest
+from rich.console import Console
+
+from check_filter import CheckResult, DomainChecker, FilterStatus
+from check_filter.transport import answer_from_response
+from check_filter.utils import (
+    create_results_table,
+    format_status,
+    read_domains_from_file,
+    validate_domains,
+)
+
+pytestmark = pytest.mark.perf
+
+BASELINES = Path(__file__).with_name("perf_baselines.json")
+
+# Allowed slowdown relative to the baseline (1.0 = twice as slow)
+TIME_TOLERANCE = float(os.environ.get("CHECK_FILTER_PERF_TOLERANCE", "1.0"))
+
+# Allowed growth of peak allocations relative to the baseline, plus a
+# fixed slack for interpreter noise (KiB)
+MEMORY_TOLERANCE = 0.25
+MEMORY_SLACK_KIB = 64
+
+# Timed runs per benchmark; the fastest one counts
+REPEAT = 5
+
+# Workload sizes
+DOMAINS = 2000
+FILE_LINES = 50_000
+TABLE_ROWS = 500
+
+
+def _calibration() -> None:
+    """Fixed pure-Python workload used as the unit of time."""
+    words = [f"label{i}.example{i % 97}.com" for i in range(20_000)]
+    index: dict[str, int] = {}
+    for word in sorted(words, key=str.upper):
+        index[word.split(".", 1)[0]] = len(word)
+
+
+def _relative_time(func) -> tuple[float, float]:
+    """Time a benchmark in calibration units.
+
+    Benchmark and calibration runs are interleaved and the fastest run of
+    each counts, so that load on the machine affects both alike.
+
+    Returns:
+        Tuple of (calibration units, fastest benchmark time in seconds).
+    """
+    best = unit = float("inf")
+    for _ in range(REPEAT):
+        gc.collect()
+        start = time.perf_counter()
+        _calibration()
+        middle = time.perf_counter()
+        func()
+        end = time.perf_counter()
+        unit = min(unit, middle - start)
+        best = min(best, end - middle)
+    return best / unit, best
+
+
+def _peak_kib(func) -> float:
+    """Return the peak memory allocated during one run, in KiB."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+@pytest.fixture(scope="module")
+def baselines(request):
+    """Stored baselines, written back when updating them."""
+    stored = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    yield stored
+    if request.config.getoption("--update-perf-baselines"):
+        stored["python"] = f"{sys.version_info.major}.{sys.version_info.minor}"
+        BASELINES.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture
+def check_performance(request, baselines):
+    """Measure a benchmark and compare it with (or record) its baseline."""
+
+    def check(name: str, func, operations: int) -> None:
+        func()  # warm up caches and lazy imports
+        relative, elapsed = _relative_time(func)
+        measured = {"time": round(relative, 3), "peak_kib": round(_peak_kib(func))}
+
+        if request.config.getoption("--update-perf-baselines"):
+            baselines[name] = measured
+            return
+        python = f"{sys.version_info.major}.{sys.version_info.minor}"
+        if baselines.get("python", python) != python:
+            pytest.skip(
+                f"baselines were recorded with Python {baselines['python']}, "
+                f"not {python}"
+            )
+        baseline = baselines.get(name)
+        if baseline is None:
+            pytest.skip(f"no baseline for {name}; run with --update-perf-baselines")
+
+        limit = baseline["time"] * (1 + TIME_TOLERANCE)
+        if measured["time"] > limit:
+            # Confirm a slowdown before failing; a burst of load on a
+            # shared runner can slow down a single measurement.
+            relative, elapsed = _relative_time(func)
+            measured["time"] = round(relative, 3)
+        throughput = operations / elapsed
+        assert measured["time"] <= limit, (
+            f"{name} regressed: {measured['time']} calibration units "
+            f"(baseline {baseline['time']}), {throughput:,.0f} ops/s"
+        )
+        assert measured["peak_kib"] <= (
+            baseline["peak_kib"] * (1 + MEMORY_TOLERANCE) + MEMORY_SLACK_KIB
+        ), (
+            f"{name} allocates more: peak {measured['peak_kib']} KiB "
+            f"(baseline {baseline['peak_kib']} KiB)"
+        )
+
+    return check
+
+
+class FakeResolver:
+    """In-process resolver returning prebuilt answers without I/O.
+
+    Names whose length is a multiple of ten resolve to a blocking IP, the
+    rest to a public one.
+    """
+
+    nameservers = ["192.0.2.53"]
+
+    def __init__(self) -> None:
+        self._answers = {
+            ip: self._answer(ip) for ip in ("10.10.34.35", "93.184.216.34")
+        }
+
+    @staticmethod
+    def _answer(ip: str):
+        request = dns.message.make_query("example.com", "A")
+        response = dns.message.make_response(request)
+        rrset = response.find_rrset(
+            response.answer,
+            request.question[0].name,
+            request.question[0].rdclass,
+            request.question[0].rdtype,
+            create=True,
+        )
+        rrset.update(dns.rrset.from_text("example.com", 300, "IN", "A", ip))
+        return answer_from_response(request, response)
+
+    async def resolve(self, qname: str, rdtype: str = "A"):
+        blocked = len(qname) % 10 == 0
+        return self._answers["10.10.34.35" if blocked else "93.184.216.34"]
+
+
+def _domains(count: int) -> list[str]:
+    return [f"www.domain-{i}.example{i % 50}.com" for i in range(count)]
+
+
+class TestPerformance:
+    """Tests for throughput and allocations of hot paths."""
+
+    def test_acheck_many(self, check_performance):
+        """Test checking many domains through a fake resolver."""
+        domains = _domains(DOMAINS)
+
+        def run() -> None:
+            checker = DomainChecker()
+            checker.resolver = FakeResolver()
+            results = asyncio.run(checker.acheck_many(domains))
+            assert len(results) == DOMAINS
+
+        check_performance("acheck_many", run, DOMAINS)
+
+    def test_validate_domains(self, check_performance):
+        """Test validating a batch of domains."""
+        domains = _domains(DOMAINS) + ["not a domain", "-bad-.com"]
+
+        def run() -> None:
+            valid, invalid = validate_domains(domains, verbose=False)
+            assert len(valid) == DOMAINS
+            assert len(invalid) == 2
+
+        check_performance("validate_domains", run, len(domains))
+
+    def test_read_domains_from_file(self, check_performance, tmp_path):
+        """Test reading a domain file."""
+        path = tmp_path / "domains.txt"
+        path.write_text("# feed\n" + "\n".join(_domains(FILE_LINES)) + "\n")
+
+        def run() -> None:
+            assert len(read_domains_from_file(str(path))) == FILE_LINES
+
+        check_performance("read_domains_from_file", run, FILE_LINES)
+
+    def test_render_results_table(self, check_performance):
+        """Test formatting results and rendering the results table."""
+        statuses = list(FilterStatus)
+        results = [
+            CheckResult(domain=domain, status=statuses[i % len(statuses)])
+            for i, domain in enumerate(_domains(TABLE_ROWS))
+        ]
+
+        def run() -> None:
+            table = create_results_table()
+            for result in results:
+                table.add_row(*format_status(result))
+            console = Console(file=io.StringIO(), width=100, color_system=None)
+            console.print(table)
+
+        check_performance("render_results_table", run, TABLE_ROWS)
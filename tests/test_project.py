@@ -1,5 +1,10 @@
 """Tests for package metadata and exports."""
 
+import subprocess
+import sys
+
+import pytest
+
 import check_filter
 from check_filter import (
     CheckResult,
@@ -120,3 +125,72 @@ class TestClassAvailability:
         assert FilterStatus.BLOCKED.value == "blocked"
         assert FilterStatus.ERROR.value == "error"
         assert FilterStatus.UNKNOWN.value == "unknown"
+
+
+class TestLazyImports:
+    """Tests for keeping CLI startup cheap."""
+
+    # Cumulative ``-X importtime`` budget for ``check_filter.cli`` in
+    # microseconds, for the fastest of IMPORT_RUNS imports. The import takes
+    # about 130 ms, so this leaves room for slower runners but still fails
+    # well before the cost doubles (e.g. by eagerly importing dnspython).
+    IMPORT_BUDGET_US = 250_000
+
+    # Number of imports timed; the fastest one is compared with the budget
+    IMPORT_RUNS = 3
+
+    HEAVY_MODULES = ("asyncio", "dns", "rich.live", "rich.table")
+
+    @staticmethod
+    def _importtime(module: str) -> dict[str, int]:
+        """Return cumulative import times (us) reported by ``-X importtime``."""
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        times: dict[str, int] = {}
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+        return times
+
+    def test_cli_does_not_import_heavy_modules(self):
+        """Test importing the CLI leaves dnspython and friends unloaded."""
+        times = self._importtime("check_filter.cli")
+
+        loaded = [
+            name
+            for name in times
+            if any(
+                name == heavy or name.startswith(f"{heavy}.")
+                for heavy in self.HEAVY_MODULES
+            )
+        ]
+        assert loaded == []
+
+    @pytest.mark.perf
+    def test_cli_import_time_budget(self):
+        """Test importing the CLI stays within the import-time budget."""
+        fastest = min(
+            self._importtime("check_filter.cli")["check_filter.cli"]
+            for _ in range(self.IMPORT_RUNS)
+        )
+
+        assert fastest < self.IMPORT_BUDGET_US
+
+    def test_lazy_attribute_resolves(self):
+        """Test lazily exported names resolve to the check module objects."""
+        from check_filter import check
+
+        assert check_filter.DomainChecker is check.DomainChecker
+        assert "DomainChecker" in dir(check_filter)
+
+    def test_unknown_attribute_raises(self):
+        """Test unknown package attributes raise AttributeError."""
+        with pytest.raises(AttributeError):
+            _ = check_filter.does_not_exist
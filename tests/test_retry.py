@@ -0,0 +1,171 @@
+"""Tests for the retry module."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import dns.exception
+import pytest
+
+from check_filter import CheckResult, DomainChecker, FilterStatus
+from check_filter.retry import RetryQueue
+
+
+def _timeout(domain):
+    return CheckResult(
+        domain=domain,
+        status=FilterStatus.ERROR,
+        error="DNS query timeout",
+        error_class="timeout",
+    )
+
+
+def _flaky_checker(failures):
+    """Create a checker whose resolver times out ``failures[domain]`` times."""
+    checker = DomainChecker()
+    remaining = dict(failures)
+    answer = MagicMock()
+    answer.__iter__ = lambda self: iter([MagicMock(address="1.2.3.4")])
+
+    async def resolve(domain, rdtype):
+        if remaining.get(domain, 0) > 0:
+            remaining[domain] -= 1
+            raise dns.exception.Timeout()
+        return answer
+
+    checker.resolver.resolve = AsyncMock(side_effect=resolve)
+    return checker
+
+
+class TestRetryQueue:
+    """Tests for RetryQueue class."""
+
+    def test_defers_transient_failures(self):
+        """Test transient failures are queued with backoff."""
+        queue = RetryQueue(backoff=2)
+
+        assert queue.offer(_timeout("a.com"), attempt=0, now=10) is True
+        assert queue.next_due() == 12
+        assert queue.pop_due(now=11) is None
+        assert queue.pop_due(now=12) == ("a.com", 1)
+        assert len(queue) == 0
+
+    def test_backoff_doubles(self):
+        """Test later attempts wait longer."""
+        queue = RetryQueue(backoff=1)
+
+        queue.offer(_timeout("a.com"), attempt=1, now=0)
+
+        assert queue.next_due() == 2
+
+    def test_final_results_not_deferred(self):
+        """Test non-transient results are reported immediately."""
+        queue = RetryQueue()
+        free = CheckResult(domain="a.com", status=FilterStatus.FREE)
+        missing = CheckResult(
+            domain="b.com", status=FilterStatus.UNKNOWN, error_class="nxdomain"
+        )
+
+        assert queue.offer(free, attempt=0, now=0) is False
+        assert queue.offer(missing, attempt=0, now=0) is False
+        assert queue.offer(free, attempt=1, now=0) is False
+        assert queue.stats.recovered == 1
+
+    def test_attempts_and_budget_limit_retries(self):
+        """Test retries stop at max_attempts and when the budget is spent."""
+        queue = RetryQueue(max_attempts=2, budget=1)
+
+        assert queue.offer(_timeout("a.com"), attempt=1, now=0) is False
+        assert queue.offer(_timeout("b.com"), attempt=0, now=0) is True
+        assert queue.offer(_timeout("c.com"), attempt=0, now=0) is False
+        assert queue.remaining_budget == 0
+        assert queue.stats.exhausted == 2
+
+    @pytest.mark.parametrize(
+        "kwargs", [{"max_attempts": 0}, {"budget": -1}, {"backoff": -1}]
+    )
+    def test_invalid_arguments(self, kwargs):
+        """Test invalid configuration is rejected."""
+        with pytest.raises(ValueError):
+            RetryQueue(**kwargs)
+
+
+class TestDeferredRetries:
+    """Tests for retries driven by DomainChecker."""
+
+    @pytest.mark.asyncio
+    async def test_acheck_iter_retries_after_main_pass(self):
+        """Test a timed out domain is retried after the other domains."""
+        checker = _flaky_checker({"slow.com": 1})
+        retries = RetryQueue(backoff=0)
+
+        results = [
+            r
+            async for r in checker.acheck_iter(
+                ["slow.com", "a.com", "b.com"], concurrency=1, retries=retries
+            )
+        ]
+
+        assert [r.domain for r in results] == ["a.com", "b.com", "slow.com"]
+        assert all(r.status == FilterStatus.FREE for r in results)
+        assert retries.stats.recovered == 1
+
+    @pytest.mark.asyncio
+    async def test_due_retry_does_not_spin_while_slots_busy(self):
+        """Test a due retry waits for a free slot instead of busy-polling."""
+        checker = DomainChecker()
+        answer = MagicMock()
+        answer.__iter__ = lambda self: iter([MagicMock(address="1.2.3.4")])
+
+        async def resolve(domain, rdtype):
+            if domain == "down.com":
+                raise dns.exception.Timeout()
+            await asyncio.sleep(0.02)
+            return answer
+
+        checker.resolver.resolve = AsyncMock(side_effect=resolve)
+        domains = ["down.com"] + [f"d{i}.com" for i in range(8)]
+        waits = 0
+        real_wait = asyncio.wait
+
+        async def counting_wait(*args, **kwargs):
+            nonlocal waits
+            waits += 1
+            return await real_wait(*args, **kwargs)
+
+        with patch("check_filter.check.asyncio.wait", new=counting_wait):
+            results = [
+                r
+                async for r in checker.acheck_iter(
+                    domains,
+                    concurrency=2,
+                    retries=RetryQueue(max_attempts=3, backoff=0),
+                )
+            ]
+
+        assert len(results) == 9
+        # About one pass per completed check; a busy loop makes thousands.
+        assert waits < 30
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        """Test the last failure is reported once attempts run out."""
+        checker = _flaky_checker({"down.com": 5})
+        retries = RetryQueue(max_attempts=3, backoff=0.01)
+
+        results = await checker.acheck_many(["down.com", "a.com"], retries=retries)
+
+        assert results[0].error_class == "timeout"
+        assert results[1].status == FilterStatus.FREE
+        assert checker.resolver.resolve.call_count == 4
+        assert retries.stats.exhausted == 1
+
+    @pytest.mark.asyncio
+    async def test_acheck_many_keeps_input_order(self):
+        """Test results come back in input order with retries."""
+        checker = _flaky_checker({"b.com": 1})
+        retries = RetryQueue(backoff=0)
+
+        results = await checker.acheck_many(["b.com", "a.com"], retries=retries)
+
+        assert [r.domain for r in results] == ["b.com", "a.com"]
+        assert results[0].status == FilterStatus.FREE
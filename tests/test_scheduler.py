@@ -0,0 +1,152 @@
+"""Tests for the scheduler module."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from typer.testing import CliRunner
+
+from check_filter import CheckResult, DomainChecker, FilterStatus, cli
+from check_filter.incremental import PreviousEntry
+from check_filter.scheduler import PriorityScheduler
+from check_filter.validation import parse_priority
+
+runner = CliRunner()
+
+NOW = 1_700_000_000.0
+
+
+class TestParsePriority:
+    """Tests for parse_priority function."""
+
+    @pytest.mark.parametrize(
+        ("line", "expected"),
+        [
+            ("example.com", ("example.com", None)),
+            ("example.com,10", ("example.com", 10.0)),
+            ("example.com, 2.5", ("example.com", 2.5)),
+            ("example.com\t-1", ("example.com", -1.0)),
+            ("example.com;3", ("example.com", 3.0)),
+            ("example.com high", ("example.com high", None)),
+        ],
+    )
+    def test_parse(self, line, expected):
+        """Test the optional priority column is split off."""
+        assert parse_priority(line) == expected
+
+
+class TestPriorityScheduler:
+    """Tests for PriorityScheduler class."""
+
+    def test_order(self):
+        """Test user priority, then recent changes, then blocked, then input."""
+        scheduler = PriorityScheduler(
+            priorities={"vip.com": 5},
+            previous={
+                "blocked.com": PreviousEntry(FilterStatus.BLOCKED, NOW - 10),
+                "changed.com": PreviousEntry(
+                    FilterStatus.FREE, NOW - 10, changed_at=NOW - 3600
+                ),
+                "stale.com": PreviousEntry(
+                    FilterStatus.FREE, NOW - 10, changed_at=NOW - 30 * 86400
+                ),
+            },
+            now=NOW,
+        )
+        domains = ["a.com", "stale.com", "blocked.com", "b.com", "changed.com"]
+        domains.append("vip.com")
+
+        assert list(scheduler.order(domains)) == [
+            "vip.com",
+            "changed.com",
+            "blocked.com",
+            "a.com",
+            "stale.com",
+            "b.com",
+        ]
+
+    def test_order_is_lazy(self):
+        """Test order() is a generator."""
+        iterator = PriorityScheduler().order(["a.com"])
+
+        assert next(iterator) == "a.com"
+        assert next(iterator, None) is None
+
+
+class TestTimeBudget:
+    """Tests for time-budgeted checks."""
+
+    @staticmethod
+    def _checker(slow):
+        checker = DomainChecker()
+
+        async def resolve(domain):
+            if domain in slow:
+                await asyncio.sleep(10)
+            return CheckResult(domain=domain, status=FilterStatus.FREE)
+
+        checker._resolve = AsyncMock(side_effect=resolve)
+        return checker
+
+    @pytest.mark.asyncio
+    async def test_acheck_many_marks_unchecked(self):
+        """Test the deadline cancels in-flight work and marks the rest."""
+        checker = self._checker(slow={"slow.com"})
+        scheduler = PriorityScheduler(priorities={"a.com": 2, "slow.com": 1})
+        domains = ["late.com", "slow.com", "a.com"]
+
+        results = await asyncio.wait_for(
+            checker.acheck_many(domains, time_budget=0.1, scheduler=scheduler),
+            timeout=2,
+        )
+
+        assert [(r.domain, r.status) for r in results] == [
+            ("late.com", FilterStatus.FREE),
+            ("slow.com", FilterStatus.UNCHECKED),
+            ("a.com", FilterStatus.FREE),
+        ]
+        assert results[1].error_class == "deadline"
+        await asyncio.sleep(0)
+        assert not checker._inflight
+
+    @pytest.mark.asyncio
+    async def test_acheck_iter_reports_unstarted_domains(self):
+        """Test domains never started before the deadline are unchecked."""
+        checker = self._checker(slow={"a.com"})
+
+        results = [
+            r
+            async for r in checker.acheck_iter(
+                ["a.com", "b.com", "c.com"], concurrency=1, time_budget=0.05
+            )
+        ]
+
+        assert {r.domain: r.status for r in results} == {
+            "a.com": FilterStatus.UNCHECKED,
+            "b.com": FilterStatus.UNCHECKED,
+            "c.com": FilterStatus.UNCHECKED,
+        }
+
+
+class TestDeadlineOption:
+    """Tests for the --deadline CLI option."""
+
+    def test_file_with_priorities_and_deadline(self, tmp_path, monkeypatch):
+        """Test the file command honours priorities and reports unchecked."""
+        file_path = tmp_path / "domains.txt"
+        file_path.write_text("slow.com\nfast.com,10\n")
+        calls = []
+
+        async def resolve(self, domain):
+            calls.append(domain)
+            if domain == "slow.com":
+                await asyncio.sleep(10)
+            return CheckResult(domain=domain, status=FilterStatus.FREE)
+
+        monkeypatch.setattr(DomainChecker, "_resolve", resolve)
+
+        result = runner.invoke(cli.app, ["file", str(file_path), "--deadline", "0.2"])
+
+        assert result.exit_code == 0
+        assert calls[0] == "fast.com"
+        assert "1 domain(s) left unchecked" in result.stdout
@@ -0,0 +1,184 @@
+"""Tests for the server module."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from check_filter import CheckResult, DomainChecker, FilterStatus
+from check_filter.cache import ResultCache
+from check_filter.server import CheckServer
+
+
+async def _fake_resolve(domain):
+    status = FilterStatus.BLOCKED if domain.startswith("blocked") else FilterStatus.FREE
+    return CheckResult(domain=domain, status=status, ips=frozenset({"1.2.3.4"}))
+
+
+async def _request(port, method, target, body=b"", headers=None):
+    """Send one HTTP request and return (status, headers, body)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    lines = [f"{method} {target} HTTP/1.1", "Connection: close"]
+    lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+    lines.append(f"Content-Length: {len(body)}")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode() + body)
+    await writer.drain()
+
+    raw = await reader.read()
+    writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode().split("\r\n")
+    response_headers = {
+        k.lower(): v.strip() for k, _, v in (h.partition(":") for h in header_lines)
+    }
+    if response_headers.get("transfer-encoding") == "chunked":
+        payload = _dechunk(payload)
+    return int(status_line.split()[1]), response_headers, payload
+
+
+def _dechunk(data):
+    out = b""
+    while data:
+        size_line, _, rest = data.partition(b"\r\n")
+        size = int(size_line, 16)
+        if size == 0:
+            break
+        out += rest[:size]
+        data = rest[size + 2 :]
+    return out
+
+
+@pytest.fixture
+async def server():
+    """Run a CheckServer with a fake resolver on an ephemeral port."""
+    checker = DomainChecker(cache=ResultCache())
+    with patch.object(
+        checker, "_resolve", new=AsyncMock(side_effect=_fake_resolve)
+    ) as mock_resolve:
+        async with CheckServer(checker, port=0) as srv:
+            srv.mock_resolve = mock_resolve
+            yield srv
+
+
+class TestCheckServer:
+    """Tests for CheckServer class."""
+
+    @pytest.mark.asyncio
+    async def test_health(self, server):
+        """Test the health endpoint."""
+        status, _, body = await _request(server.port, "GET", "/health")
+
+        assert status == 200
+        assert json.loads(body)["status"] == "ok"
+        assert json.loads(body)["checks"]["total"] == 0
+
+    @pytest.mark.asyncio
+    async def test_check_single(self, server):
+        """Test checking one domain."""
+        status, headers, body = await _request(
+            server.port, "GET", "/check?domain=Blocked.Example.com"
+        )
+
+        assert status == 200
+        assert headers["content-type"] == "application/json"
+        record = json.loads(body)
+        assert record["domain"] == "blocked.example.com"
+        assert record["status"] == "blocked"
+
+    @pytest.mark.asyncio
+    async def test_check_single_invalid(self, server):
+        """Test an invalid domain returns 400."""
+        status, _, body = await _request(server.port, "GET", "/check?domain=invalid")
+
+        assert status == 400
+        assert "error" in json.loads(body)
+
+    @pytest.mark.asyncio
+    async def test_batch_json_streams_ndjson(self, server):
+        """Test a JSON batch is streamed back as NDJSON."""
+        payload = json.dumps({"domains": ["a.com", "blocked.com", "bad"]}).encode()
+
+        status, headers, body = await _request(
+            server.port,
+            "POST",
+            "/check",
+            payload,
+            {"Content-Type": "application/json"},
+        )
+
+        assert status == 200
+        assert headers["content-type"] == "application/x-ndjson"
+        records = {r["domain"]: r["status"] for r in map(json.loads, body.splitlines())}
+        assert records == {"a.com": "free", "blocked.com": "blocked", "bad": "invalid"}
+
+    @pytest.mark.asyncio
+    async def test_batch_plain_text(self, server):
+        """Test a newline separated batch body."""
+        status, _, body = await _request(
+            server.port, "POST", "/check", b"a.com\nb.com\n"
+        )
+
+        assert status == 200
+        assert len(body.splitlines()) == 2
+
+    @pytest.mark.asyncio
+    async def test_shared_cache_and_single_flight(self, server):
+        """Test repeated and concurrent lookups share one DNS query."""
+        await asyncio.gather(
+            *(_request(server.port, "GET", "/check?domain=a.com") for _ in range(5))
+        )
+        await _request(server.port, "GET", "/check?domain=a.com")
+
+        assert server.mock_resolve.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_too_large(self, server):
+        """Test oversized batches are rejected."""
+        server.max_batch = 1
+
+        status, _, _ = await _request(server.port, "POST", "/check", b"a.com\nb.com")
+
+        assert status == 413
+
+    @pytest.mark.asyncio
+    async def test_bad_json(self, server):
+        """Test malformed JSON batches are rejected."""
+        status, _, _ = await _request(
+            server.port,
+            "POST",
+            "/check",
+            b"{nope",
+            {"Content-Type": "application/json"},
+        )
+
+        assert status == 400
+
+    @pytest.mark.asyncio
+    async def test_negative_content_length(self, server):
+        """Test a negative Content-Length is rejected."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(b"POST /check HTTP/1.1\r\nContent-Length: -1\r\n\r\n")
+        await writer.drain()
+
+        assert (await reader.readline()).startswith(b"HTTP/1.1 400")
+        writer.close()
+
+    @pytest.mark.asyncio
+    async def test_not_found_and_method(self, server):
+        """Test unknown paths and methods."""
+        assert (await _request(server.port, "GET", "/nope"))[0] == 404
+        assert (await _request(server.port, "DELETE", "/check"))[0] == 405
+
+    @pytest.mark.asyncio
+    async def test_keep_alive(self, server):
+        """Test several requests on one connection."""
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        for _ in range(2):
+            writer.write(b"GET /health HTTP/1.1\r\n\r\n")
+            await writer.drain()
+            assert (await reader.readline()).startswith(b"HTTP/1.1 200")
+            while (await reader.readline()) != b"\r\n":
+                pass
+            await reader.readexactly(len(json.dumps(server._health())))
+        writer.close()
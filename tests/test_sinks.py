@@ -0,0 +1,296 @@
+"""Tests for the sinks module."""
+
+import asyncio
+import io
+import json
+import sqlite3
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from check_filter import CheckResult, DomainChecker, FilterStatus, cli
+from check_filter.history import HistoryStore
+from check_filter.sinks import (
+    JSONLSink,
+    ResultFanOut,
+    ResultSink,
+    SinkError,
+    SQLiteSink,
+    StdoutSink,
+    WebhookSink,
+    make_sink,
+)
+
+runner = CliRunner()
+
+
+def _results(count):
+    return [
+        CheckResult(
+            domain=f"d{i}.com", status=FilterStatus.FREE, ips=frozenset({"1.2.3.4"})
+        )
+        for i in range(count)
+    ]
+
+
+async def _stream(results):
+    for result in results:
+        yield result
+
+
+class MemorySink(ResultSink):
+    """Sink collecting batches in memory, optionally slowly."""
+
+    name = "memory"
+
+    def __init__(self, delay=0.0, fail=False, fail_close=False):
+        self.delay = delay
+        self.fail = fail
+        self.fail_close = fail_close
+        self.batches = []
+        self.closed = False
+
+    async def write(self, results):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise OSError("disk full")
+        self.batches.append(list(results))
+
+    async def aclose(self):
+        self.closed = True
+        if self.fail_close:
+            raise OSError("close failed")
+
+
+class WebhookStandIn:
+    """Minimal HTTP server recording the JSON bodies POSTed to it."""
+
+    def __init__(self, status=204):
+        self.status = status
+        self.bodies = []
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.sockets[0].getsockname()[1]}/hook"
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        headers = {}
+        request_line = await reader.readline()
+        while (line := await reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode().partition(":")
+            headers[name.lower()] = value.strip()
+        body = await reader.readexactly(int(headers["content-length"]))
+        assert request_line.startswith(b"POST /hook ")
+        self.bodies.append(json.loads(body))
+        writer.write(f"HTTP/1.1 {self.status} X\r\nContent-Length: 0\r\n\r\n".encode())
+        await writer.drain()
+        writer.close()
+
+
+class TestSinks:
+    """Tests for the individual sinks."""
+
+    @pytest.mark.asyncio
+    async def test_jsonl_sink(self, tmp_path):
+        """Test results are appended as journal records."""
+        path = tmp_path / "out.jsonl"
+        sink = JSONLSink(path)
+        await sink.write(_results(2))
+        await sink.write(_results(1))
+        await sink.aclose()
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [r["domain"] for r in records] == ["d0.com", "d1.com", "d0.com"]
+        assert "checked_at" in records[0]
+
+    @pytest.mark.asyncio
+    async def test_sqlite_sink(self, tmp_path):
+        """Test results are stored as rows of the history database."""
+        path = tmp_path / "out.db"
+        sink = SQLiteSink(path)
+        await sink.write(_results(3))
+        await sink.aclose()
+
+        with sqlite3.connect(path) as db:
+            rows = db.execute("SELECT domain, status, ips FROM results").fetchall()
+        assert rows[0] == ("d0.com", "free", '["1.2.3.4"]')
+        assert len(rows) == 3
+        with HistoryStore(path, readonly=True) as store:
+            assert store.status_counts() == {FilterStatus.FREE: 3}
+
+    @pytest.mark.asyncio
+    async def test_stdout_sink(self):
+        """Test results are written as JSON lines."""
+        stream = io.StringIO()
+        await StdoutSink(stream).write(_results(2))
+
+        assert len(stream.getvalue().splitlines()) == 2
+
+    @pytest.mark.asyncio
+    async def test_webhook_sink(self):
+        """Test batches are POSTed as JSON."""
+        async with WebhookStandIn() as server:
+            sink = WebhookSink(server.url)
+            await sink.write(_results(2))
+
+        assert [r["domain"] for r in server.bodies[0]["results"]] == [
+            "d0.com",
+            "d1.com",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_webhook_error_status(self):
+        """Test a non-2xx response fails the write."""
+        async with WebhookStandIn(status=500) as server:
+            with pytest.raises(ConnectionError, match="500"):
+                await WebhookSink(server.url).write(_results(1))
+
+    def test_make_sink(self, tmp_path):
+        """Test sink specifications are parsed."""
+        assert isinstance(make_sink("stdout"), StdoutSink)
+        assert isinstance(make_sink("http://127.0.0.1:9/hook"), WebhookSink)
+        assert isinstance(make_sink(f"jsonl:{tmp_path / 'a.jsonl'}"), JSONLSink)
+        assert isinstance(make_sink(f"sqlite:{tmp_path / 'a.db'}"), SQLiteSink)
+        with pytest.raises(ValueError):
+            make_sink("kafka:topic")
+        with pytest.raises(ValueError):
+            make_sink("jsonl:")
+
+
+class TestResultFanOut:
+    """Tests for ResultFanOut class."""
+
+    @pytest.mark.asyncio
+    async def test_fans_out_in_batches(self):
+        """Test every sink receives every result, in batches."""
+        first, second = MemorySink(), MemorySink()
+        results = _results(25)
+        async with ResultFanOut([first, second], batch_size=10) as fan_out:
+            seen = [r async for r in fan_out.tee(_stream(results))]
+
+        assert seen == results
+        for sink in (first, second):
+            assert sink.closed
+            assert [r for batch in sink.batches for r in batch] == results
+            assert max(len(batch) for batch in sink.batches) <= 10
+        assert [s.written for s in fan_out.stats] == [25, 25]
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_flushed_after_interval(self):
+        """Test a partial batch is written once the flush interval passes."""
+        sink = MemorySink()
+        async with ResultFanOut([sink], batch_size=100, flush_interval=0.01) as fan_out:
+            await fan_out.put(_results(1)[0])
+            await asyncio.sleep(0.1)
+
+            assert len(sink.batches) == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_sink_applies_backpressure(self):
+        """Test a slow sink bounds the queue and slows the producer down."""
+        slow, fast = MemorySink(delay=0.02), MemorySink()
+        fan_out = ResultFanOut([slow, fast], batch_size=2, max_queue=4)
+        fan_out.start()
+        worker = fan_out._workers[0]
+        depth = 0
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for result in _results(20):
+            await fan_out.put(result)
+            depth = max(depth, worker.queue.qsize())
+        elapsed = loop.time() - start
+        await fan_out.aclose()
+
+        assert depth <= 4
+        # 20 results in batches of 2 at 20 ms per batch, minus what fits
+        # in the queue and the batch being written
+        assert elapsed >= 0.1
+        assert sum(len(b) for b in fast.batches) == 20
+
+    @pytest.mark.asyncio
+    async def test_failed_sink_raises(self):
+        """Test a failing sink raises SinkError without blocking the scan."""
+        broken = MemorySink(fail=True)
+        fan_out = ResultFanOut([broken], batch_size=1, max_queue=1)
+        fan_out.start()
+
+        with pytest.raises(SinkError, match="disk full"):
+            for result in _results(50):
+                await fan_out.put(result)
+        with pytest.raises(SinkError):
+            await fan_out.aclose()
+        assert broken.closed
+        assert fan_out.stats[0].dropped >= 1
+
+    @pytest.mark.asyncio
+    async def test_close_failure_closes_other_sinks(self):
+        """Test every sink is closed before a close failure is raised."""
+        broken, healthy = MemorySink(fail_close=True), MemorySink()
+        fan_out = ResultFanOut([broken, healthy])
+        fan_out.start()
+        await fan_out.put(_results(1)[0])
+
+        with pytest.raises(SinkError, match="close failed"):
+            await fan_out.aclose()
+        assert healthy.closed
+        assert healthy.batches == [_results(1)]
+
+    def test_abstract_sink(self):
+        """Test a sink without write and aclose methods cannot be created."""
+        with pytest.raises(TypeError):
+            ResultSink()
+
+    def test_invalid_arguments(self):
+        """Test invalid configuration is rejected."""
+        with pytest.raises(ValueError):
+            ResultFanOut([], batch_size=0)
+        with pytest.raises(ValueError):
+            ResultFanOut([], flush_interval=-1)
+
+
+class TestSinkOption:
+    """Tests for the --sink CLI option."""
+
+    def test_file_writes_to_sinks(self, tmp_path):
+        """Test --sink writes every result to each sink."""
+        file_path = tmp_path / "domains.txt"
+        file_path.write_text("a.com\nb.com\n")
+        jsonl = tmp_path / "out.jsonl"
+        database = tmp_path / "out.db"
+
+        acheck = AsyncMock(
+            side_effect=lambda d: CheckResult(domain=d, status=FilterStatus.FREE)
+        )
+        with patch.object(DomainChecker, "acheck", new=acheck):
+            result = runner.invoke(
+                cli.app,
+                [
+                    "file",
+                    str(file_path),
+                    "--sink",
+                    f"jsonl:{jsonl}",
+                    "--sink",
+                    f"sqlite:{database}",
+                ],
+            )
+
+        assert result.exit_code == 0
+        assert len(jsonl.read_text().splitlines()) == 2
+        with sqlite3.connect(database) as db:
+            assert db.execute("SELECT COUNT(*) FROM results").fetchone() == (2,)
+
+    def test_unknown_sink(self):
+        """Test an invalid sink is reported before the scan."""
+        result = runner.invoke(cli.app, ["domains", "a.com", "--sink", "kafka:x"])
+
+        assert result.exit_code == 1
@@ -0,0 +1,186 @@
+"""Tests for the stats module."""
+
+import random
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from check_filter import CheckResult, DomainChecker, FilterStatus, cli
+from check_filter.stats import (
+    OTHER_GROUP,
+    QuantileSketch,
+    ScanStats,
+    registrable_domain,
+)
+
+runner = CliRunner()
+
+
+def _result(domain, status, error_class=None, elapsed=None):
+    return CheckResult(
+        domain=domain, status=status, error_class=error_class, elapsed=elapsed
+    )
+
+
+class TestRegistrableDomain:
+    """Tests for registrable_domain function."""
+
+    @pytest.mark.parametrize(
+        ("domain", "expected"),
+        [
+            ("example.com", "example.com"),
+            ("www.example.com", "example.com"),
+            ("www.example.co.ir", "example.co.ir"),
+            ("a.b.example.ac.uk", "example.ac.uk"),
+            ("co.ir", "co.ir"),
+            ("com", "com"),
+        ],
+    )
+    def test_registrable_domain(self, domain, expected):
+        """Test the registrable part is extracted."""
+        assert registrable_domain(domain) == expected
+
+
+class TestQuantileSketch:
+    """Tests for QuantileSketch class."""
+
+    def test_quantiles_within_accuracy(self):
+        """Test quantiles stay within the relative accuracy."""
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(-3, 1) for _ in range(10_000))
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.5, 0.9, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+
+    def test_merge_matches_single_sketch(self):
+        """Test merging two sketches equals sketching all values."""
+        values = [i / 100 for i in range(1, 1001)]
+        whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for value in values:
+            whole.add(value)
+        for value in values[::2]:
+            left.add(value)
+        for value in values[1::2]:
+            right.add(value)
+
+        left.merge(right)
+
+        assert left.count == whole.count
+        assert left.quantile(0.9) == whole.quantile(0.9)
+        assert left.min == whole.min and left.max == whole.max
+
+    def test_bucket_limit(self):
+        """Test the bucket count is capped without losing high quantiles."""
+        sketch = QuantileSketch(max_buckets=16)
+        for exponent in range(-20, 20):
+            sketch.add(2.0**exponent)
+
+        assert len(sketch._buckets) <= 16
+        assert sketch.quantile(1) == 2.0**19
+
+    def test_empty_and_zero(self):
+        """Test empty sketches and zero values."""
+        sketch = QuantileSketch()
+        assert sketch.quantile(0.5) is None
+        assert sketch.mean is None
+
+        sketch.add(0)
+        assert sketch.quantile(0.5) == 0.0
+
+    def test_invalid_arguments(self):
+        """Test invalid settings and values are rejected."""
+        with pytest.raises(ValueError):
+            QuantileSketch(relative_accuracy=0)
+        with pytest.raises(ValueError):
+            QuantileSketch().add(-1)
+        with pytest.raises(ValueError):
+            QuantileSketch(relative_accuracy=0.01).merge(QuantileSketch(0.02))
+
+
+class TestScanStats:
+    """Tests for ScanStats class."""
+
+    RESULTS = [
+        _result("a.com", FilterStatus.BLOCKED, elapsed=0.01),
+        _result("www.a.com", FilterStatus.BLOCKED, elapsed=0.02),
+        _result("b.com", FilterStatus.FREE, elapsed=0.03),
+        _result("c.ir", FilterStatus.FREE, elapsed=0.04),
+        _result("x.co.ir", FilterStatus.BLOCKED, elapsed=0.05),
+        _result("gone.ir", FilterStatus.UNKNOWN, "nxdomain"),
+        _result("slow.ir", FilterStatus.ERROR, "timeout"),
+    ]
+
+    def test_counts_and_ratios(self):
+        """Test status counts and blocked ratios per group."""
+        stats = ScanStats()
+        stats.update(self.RESULTS)
+
+        assert stats.total == 7
+        assert stats.statuses[FilterStatus.BLOCKED] == 3
+        assert stats.blocked_ratio == pytest.approx(3 / 5)
+        assert stats.tlds["com"].blocked_ratio == pytest.approx(2 / 3)
+        assert stats.tlds["ir"].total == 4
+        assert stats.tlds["ir"].blocked_ratio == pytest.approx(1 / 2)
+        assert stats.registrable["a.com"].blocked == 2
+        assert stats.registrable["x.co.ir"].blocked == 1
+        assert stats.error_classes == {"nxdomain": 1, "timeout": 1}
+        assert stats.latency.count == 5
+
+    def test_merge(self):
+        """Test merged statistics equal a single pass."""
+        whole, left, right = ScanStats(), ScanStats(), ScanStats()
+        whole.update(self.RESULTS)
+        left.update(self.RESULTS[:3])
+        right.update(self.RESULTS[3:])
+
+        left.merge(right)
+        merged, expected = left.to_dict(), whole.to_dict()
+
+        assert merged["latency"].pop("mean") == pytest.approx(
+            expected["latency"].pop("mean")
+        )
+        assert merged == expected
+
+    def test_group_limit(self):
+        """Test registrable domains beyond the limit share one group."""
+        stats = ScanStats(max_groups=2)
+        stats.update(self.RESULTS)
+
+        assert len(stats.registrable) == 3
+        assert stats.registrable[OTHER_GROUP].total == 4
+
+    def test_to_dict(self):
+        """Test the summary lists the top groups and quantiles."""
+        stats = ScanStats()
+        stats.update(self.RESULTS)
+
+        summary = stats.to_dict(limit=1)
+
+        assert summary["statuses"]["blocked"] == 3
+        assert list(summary["tlds"]) == ["com"]
+        assert summary["latency"]["p50"] == pytest.approx(0.03, rel=0.02)
+        assert summary["errors"] == {"nxdomain": 1}
+
+
+class TestStatsOption:
+    """Tests for the --stats CLI option."""
+
+    def test_domains_stats(self):
+        """Test --stats prints a statistics summary after the table."""
+
+        async def acheck(domain):
+            status = FilterStatus.BLOCKED if domain == "x.com" else FilterStatus.FREE
+            return CheckResult(domain=domain, status=status, elapsed=0.01)
+
+        with patch.object(DomainChecker, "acheck", new=AsyncMock(side_effect=acheck)):
+            result = runner.invoke(cli.app, ["domains", "x.com,y.com", "--stats"])
+
+        assert result.exit_code == 0
+        assert "Statistics" in result.stdout
+        assert "50.0%" in result.stdout
+        assert "Blocked by TLD" in result.stdout
@@ -0,0 +1,172 @@
+"""Tests for the trace module."""
+
+import asyncio
+import gzip
+import time
+
+import dns.message
+import dns.rcode
+import dns.rrset
+import pytest
+
+from check_filter import DomainChecker, FilterStatus
+from check_filter.trace import (
+    TIMEOUT,
+    RecordingTransport,
+    ReplayTransport,
+    TraceRecord,
+    load_trace,
+)
+
+
+class FakeTransport:
+    """Transport answering from a table of addresses, with a delay.
+
+    Names mapped to None time out; names not in the table are NXDOMAIN.
+    """
+
+    nameservers = ["192.0.2.53"]
+
+    def __init__(self, answers, delay=0.0):
+        self.answers = answers
+        self.delay = delay
+        self.closed = False
+
+    async def query(self, request):
+        await asyncio.sleep(self.delay)
+        name = request.question[0].name
+        address = self.answers.get(name.to_text().rstrip("."), "")
+        if address is None:
+            raise asyncio.TimeoutError
+        response = dns.message.make_response(request)
+        if address:
+            response.answer.append(dns.rrset.from_text(name, 60, "IN", "A", address))
+        else:
+            response.set_rcode(dns.rcode.NXDOMAIN)
+        return dns.message.from_wire(response.to_wire())
+
+    async def aclose(self):
+        self.closed = True
+
+
+ANSWERS = {"free.com": "1.2.3.4", "blocked.com": "10.10.34.35", "slow.com": None}
+
+
+async def _record(path, answers=ANSWERS, delay=0.0):
+    inner = FakeTransport(answers, delay)
+    transport = RecordingTransport(inner, path)
+    async with DomainChecker(transport=transport, timeout=1.0) as checker:
+        results = await checker.acheck_many(sorted(answers) + ["missing.com"])
+    assert inner.closed
+    return transport, results
+
+
+class TestTraceRecord:
+    """Tests for TraceRecord class."""
+
+    def test_round_trip(self):
+        """Test records survive to_dict/from_dict."""
+        record = TraceRecord("a.com.", "A", 0.0123, wire=b"\x00\x01")
+        assert TraceRecord.from_dict(record.to_dict()) == record
+
+        failure = TraceRecord("a.com.", "AAAA", 2.0, error=TIMEOUT)
+        assert TraceRecord.from_dict(failure.to_dict()) == failure
+        assert "wire" not in failure.to_dict()
+
+
+class TestRecordAndReplay:
+    """Tests for RecordingTransport and ReplayTransport classes."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("name", ["scan.trace", "scan.trace.gz"])
+    async def test_replay_matches_recording(self, tmp_path, name):
+        """Test a replayed scan reproduces the recorded results."""
+        path = tmp_path / name
+        transport, recorded = await _record(path)
+
+        assert transport.records == 4
+        header, records = load_trace(path)
+        assert header["nameservers"] == ["192.0.2.53"]
+        assert {r.qname for r in records} == {
+            "blocked.com.",
+            "free.com.",
+            "missing.com.",
+            "slow.com.",
+        }
+
+        replay = ReplayTransport(path, speed=0)
+        async with DomainChecker(transport=replay, timeout=1.0) as checker:
+            replayed = await checker.acheck_many(sorted(ANSWERS) + ["missing.com"])
+
+        assert [(r.domain, r.status, r.ips, r.error_class) for r in replayed] == [
+            (r.domain, r.status, r.ips, r.error_class) for r in recorded
+        ]
+        statuses = {r.domain: r.status for r in replayed}
+        assert statuses["free.com"] == FilterStatus.FREE
+        assert statuses["blocked.com"] == FilterStatus.BLOCKED
+        assert statuses["slow.com"] == FilterStatus.ERROR
+        assert replay.stats.replayed == 4
+
+    def test_gzip_is_compact(self, tmp_path):
+        """Test a .gz trace is written gzip-compressed."""
+        path = tmp_path / "scan.trace.gz"
+        asyncio.run(_record(path))
+
+        with gzip.open(path, "rt") as f:
+            assert '"format":"check-filter-trace"' in f.readline()
+
+    @pytest.mark.asyncio
+    async def test_scaled_latency(self, tmp_path):
+        """Test recorded latencies are replayed scaled by speed."""
+        path = tmp_path / "scan.trace"
+        await _record(path, {"free.com": "1.2.3.4"}, delay=0.2)
+        replay = ReplayTransport(path, speed=0.25)
+        assert all(latency >= 0.2 for latency in replay.latencies())
+
+        start = time.perf_counter()
+        await replay.query(dns.message.make_query("free.com", "A"))
+        elapsed = time.perf_counter() - start
+
+        assert 0.04 <= elapsed < 0.2
+
+    @pytest.mark.asyncio
+    async def test_repeated_queries_cycle(self, tmp_path):
+        """Test a name recorded twice replays both exchanges in turn."""
+        path = tmp_path / "scan.trace"
+        inner = FakeTransport({"a.com": "1.1.1.1"})
+        transport = RecordingTransport(inner, path)
+        await transport.query(dns.message.make_query("a.com", "A"))
+        inner.answers["a.com"] = "2.2.2.2"
+        await transport.query(dns.message.make_query("a.com", "A"))
+        await transport.aclose()
+
+        replay = ReplayTransport(path, speed=0)
+        answers = []
+        for _ in range(3):
+            request = dns.message.make_query("A.com", "A")
+            response = await replay.query(request)
+            assert response.id == request.id
+            answers.append(response.answer[0][0].address)
+
+        assert answers == ["1.1.1.1", "2.2.2.2", "1.1.1.1"]
+
+    @pytest.mark.asyncio
+    async def test_missing_question(self, tmp_path):
+        """Test questions absent from the trace fail and are counted."""
+        path = tmp_path / "scan.trace"
+        await _record(path)
+        replay = ReplayTransport(path, speed=0)
+
+        with pytest.raises(ConnectionError):
+            await replay.query(dns.message.make_query("free.com", "AAAA"))
+        assert replay.stats.missing == 1
+
+    def test_rejects_other_files(self, tmp_path):
+        """Test files that are not traces are rejected."""
+        path = tmp_path / "journal.jsonl"
+        path.write_text('{"domain": "a.com"}\n')
+
+        with pytest.raises(ValueError, match="not a DNS trace"):
+            ReplayTransport(path)
+        with pytest.raises(ValueError):
+            ReplayTransport(tmp_path / "x", speed=-1)
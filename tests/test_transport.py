@@ -0,0 +1,450 @@
+"""Tests for the transport module."""
+
+import asyncio
+import shutil
+import socket
+import ssl
+import subprocess
+import sys
+from unittest.mock import AsyncMock, MagicMock
+
+import dns.flags
+import dns.message
+import dns.rcode
+import dns.rrset
+import pytest
+from dns import resolver
+
+from check_filter import DomainChecker, FilterStatus
+from check_filter.transport import (
+    PooledTCPTransport,
+    PooledUDPTransport,
+    TransportResolver,
+)
+
+
+class StandInServer:
+    """Minimal DNS-over-TCP server answering queries out of order.
+
+    Queries are buffered until ``batch`` have arrived on a connection and
+    then answered in reverse order, which forces the client to match
+    responses by message ID.
+    """
+
+    def __init__(self, batch=1, ssl_context=None):
+        self.batch = batch
+        self.ssl_context = ssl_context
+        self.connections = 0
+        self.queries = 0
+        self.writers = []
+        self._server = None
+
+    @property
+    def port(self):
+        return self._server.sockets[0].getsockname()[1]
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(
+            self._handle, "127.0.0.1", 0, ssl=self.ssl_context
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        for writer in self.writers:
+            writer.close()
+        self._server.close()
+        await self._server.wait_closed()
+
+    def answer(self, request):
+        name = request.question[0].name.to_text().rstrip(".")
+        response = dns.message.make_response(request)
+        if name.startswith("missing"):
+            response.set_rcode(dns.rcode.NXDOMAIN)
+        else:
+            response.answer.append(
+                dns.rrset.from_text(request.question[0].name, 60, "IN", "A", "1.2.3.4")
+            )
+        return response
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self.writers.append(writer)
+        held = []
+        try:
+            while True:
+                length = int.from_bytes(await reader.readexactly(2), "big")
+                request = dns.message.from_wire(await reader.readexactly(length))
+                self.queries += 1
+                held.append(request)
+                if len(held) < self.batch:
+                    continue
+                for request in reversed(held):
+                    wire = self.answer(request).to_wire()
+                    writer.write(len(wire).to_bytes(2, "big") + wire)
+                held.clear()
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+class UDPStandInServer(asyncio.DatagramProtocol):
+    """Minimal DNS-over-UDP server.
+
+    Names starting with ``drop`` are never answered, ``big`` answers are
+    truncated, and ``late`` answers arrive after ``delay`` seconds.
+    """
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.sources = set()
+        self.queries = 0
+        self._transport = None
+
+    @property
+    def port(self):
+        return self._transport.get_extra_info("sockname")[1]
+
+    async def __aenter__(self):
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: self, local_addr=("127.0.0.1", 0)
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._transport.close()
+
+    def datagram_received(self, data, addr):
+        request = dns.message.from_wire(data)
+        self.queries += 1
+        self.sources.add(addr[1])
+        name = request.question[0].name.to_text()
+        if name.startswith("drop"):
+            return
+        response = dns.message.make_response(request)
+        response.answer.append(
+            dns.rrset.from_text(request.question[0].name, 60, "IN", "A", "1.2.3.4")
+        )
+        if name.startswith("big"):
+            response.flags |= dns.flags.TC
+        wire = response.to_wire()
+        if name.startswith("late"):
+            asyncio.get_running_loop().call_later(
+                self.delay, self._transport.sendto, wire, addr
+            )
+        else:
+            self._transport.sendto(wire, addr)
+
+
+def _query(name):
+    return dns.message.make_query(name, "A")
+
+
+class TestPooledTCPTransport:
+    """Tests for PooledTCPTransport class."""
+
+    @pytest.mark.asyncio
+    async def test_pipelines_out_of_order_responses(self):
+        """Test concurrent queries share one connection and match by ID."""
+        async with StandInServer(batch=5) as server:
+            transport = PooledTCPTransport(["127.0.0.1"], port=server.port)
+            names = [f"d{i}.example.com" for i in range(5)]
+
+            responses = await asyncio.gather(
+                *(transport.query(_query(n)) for n in names)
+            )
+            await transport.aclose()
+
+        assert [r.question[0].name.to_text() for r in responses] == [
+            f"{n}." for n in names
+        ]
+        assert server.connections == 1
+
+    @pytest.mark.asyncio
+    async def test_pool_grows_when_pipeline_saturated(self):
+        """Test extra connections open up to pool_size."""
+        async with StandInServer(batch=6) as server:
+            transport = PooledTCPTransport(
+                ["127.0.0.1"], port=server.port, pool_size=2, max_pipeline=3
+            )
+            tasks = [
+                asyncio.create_task(transport.query(_query(f"d{i}.com")))
+                for i in range(12)
+            ]
+            await asyncio.sleep(0.1)
+
+            assert transport.connections("127.0.0.1") == 2
+            for writer in server.writers:
+                writer.close()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_reconnects_after_server_close(self):
+        """Test a dropped connection is replaced transparently."""
+        async with StandInServer() as server:
+            transport = PooledTCPTransport(["127.0.0.1"], port=server.port)
+            await transport.query(_query("a.com"))
+            server.writers[0].close()
+            await asyncio.sleep(0.05)
+
+            response = await transport.query(_query("b.com"))
+            await transport.aclose()
+
+        assert response.rcode() == dns.rcode.NOERROR
+        assert server.connections == 2
+
+    @pytest.mark.asyncio
+    async def test_idle_connections_are_closed(self):
+        """Test connections close after the idle timeout."""
+        async with StandInServer() as server:
+            transport = PooledTCPTransport(
+                ["127.0.0.1"], port=server.port, idle_timeout=0.05
+            )
+            await transport.query(_query("a.com"))
+            assert transport.connections("127.0.0.1") == 1
+
+            await asyncio.sleep(0.15)
+
+            assert transport.connections("127.0.0.1") == 0
+            await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_nameserver(self):
+        """Test a refused connection raises ConnectionError."""
+        transport = PooledTCPTransport(["127.0.0.1"], port=1, connect_timeout=1)
+
+        with pytest.raises(ConnectionError):
+            await transport.query(_query("a.com"))
+
+    def test_invalid_arguments(self):
+        """Test invalid configuration is rejected."""
+        with pytest.raises(ValueError):
+            PooledTCPTransport([])
+        with pytest.raises(ValueError):
+            PooledTCPTransport(["127.0.0.1"], pool_size=0)
+
+    @pytest.mark.asyncio
+    async def test_tls(self, tmp_path):
+        """Test DNS-over-TLS with a self-signed certificate."""
+        openssl = shutil.which("openssl")
+        if openssl is None:
+            pytest.skip("openssl not available")
+        cert, key = tmp_path / "cert.pem", tmp_path / "key.pem"
+        subprocess.run(
+            [
+                openssl,
+                "req",
+                "-x509",
+                "-newkey",
+                "rsa:2048",
+                "-nodes",
+                "-days",
+                "1",
+                "-subj",
+                "/CN=dns.test",
+                "-addext",
+                "subjectAltName=DNS:dns.test",
+                "-keyout",
+                str(key),
+                "-out",
+                str(cert),
+            ],
+            check=True,
+            capture_output=True,
+        )
+        server_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        server_context.load_cert_chain(cert, key)
+        client_context = ssl.create_default_context(cafile=str(cert))
+
+        async with StandInServer(ssl_context=server_context) as server:
+            transport = PooledTCPTransport(
+                ["127.0.0.1"],
+                port=server.port,
+                ssl_context=client_context,
+                server_hostname="dns.test",
+            )
+            response = await transport.query(_query("a.com"))
+            await transport.aclose()
+
+        assert transport.tls
+        assert response.rcode() == dns.rcode.NOERROR
+
+
+class TestPooledUDPTransport:
+    """Tests for PooledUDPTransport class."""
+
+    @pytest.mark.asyncio
+    async def test_spreads_queries_over_random_ports(self):
+        """Test concurrent queries use several sockets on distinct ports."""
+        async with UDPStandInServer() as server:
+            transport = PooledUDPTransport(
+                ["127.0.0.1"], port=server.port, sockets=4, max_outstanding=2
+            )
+            responses = await asyncio.gather(
+                *(transport.query(_query(f"d{i}.com")) for i in range(32))
+            )
+            ports = transport.source_ports()
+            stats = transport.stats
+            await transport.aclose()
+
+        assert all(r.rcode() == dns.rcode.NOERROR for r in responses)
+        assert len(set(ports)) == 4
+        assert server.sources <= set(ports)
+        assert stats.sent == stats.received == 32
+
+    @pytest.mark.asyncio
+    async def test_outstanding_limit(self):
+        """Test queries beyond the per-socket limit wait for a free slot."""
+        async with UDPStandInServer(delay=0.1) as server:
+            transport = PooledUDPTransport(
+                ["127.0.0.1"], port=server.port, sockets=2, max_outstanding=3
+            )
+            tasks = [
+                asyncio.create_task(transport.query(_query(f"late{i}.com")))
+                for i in range(10)
+            ]
+            await asyncio.sleep(0.05)
+
+            assert transport.stats.sent == 6
+            await asyncio.gather(*tasks)
+            await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_timeout_and_late_reply(self):
+        """Test lost replies time out and late ones count as unmatched."""
+        async with UDPStandInServer(delay=0.2) as server:
+            transport = PooledUDPTransport(
+                ["127.0.0.1"], port=server.port, timeout=0.05, attempts=1
+            )
+            with pytest.raises(asyncio.TimeoutError):
+                await transport.query(_query("drop.com"))
+            with pytest.raises(asyncio.TimeoutError):
+                await transport.query(_query("late.com"))
+            await asyncio.sleep(0.25)
+            stats = transport.stats
+            await transport.aclose()
+
+        assert stats.timeouts == 2
+        assert stats.unmatched == 1
+
+    @pytest.mark.asyncio
+    async def test_attempts_resend(self):
+        """Test every attempt re-sends the query."""
+        async with UDPStandInServer() as server:
+            transport = PooledUDPTransport(
+                ["127.0.0.1"], port=server.port, timeout=0.05, attempts=3
+            )
+            with pytest.raises(asyncio.TimeoutError):
+                await transport.query(_query("drop.com"))
+            await transport.aclose()
+
+        assert server.queries == 3
+
+    @pytest.mark.asyncio
+    async def test_truncated_uses_fallback(self):
+        """Test truncated responses are re-sent over the fallback."""
+        fallback = MagicMock()
+        fallback.query = AsyncMock(return_value="tcp response")
+        fallback.aclose = AsyncMock()
+
+        async with UDPStandInServer() as server:
+            transport = PooledUDPTransport(
+                ["127.0.0.1"], port=server.port, fallback=fallback
+            )
+            response = await transport.query(_query("big.com"))
+            await transport.aclose()
+
+        assert response == "tcp response"
+        assert transport.stats.truncated == 1
+        fallback.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_socket_buffers_and_drop_counter(self):
+        """Test buffer sizes are applied and kernel drops are readable."""
+        async with UDPStandInServer() as server:
+            transport = PooledUDPTransport(
+                ["127.0.0.1"], port=server.port, sockets=1, rcvbuf=256 << 10
+            )
+            await transport.query(_query("a.com"))
+            sock = transport._pools[socket.AF_INET][0].sock
+
+            assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) >= 256 << 10
+            if sys.platform.startswith("linux"):
+                assert transport.stats.kernel_drops == 0
+            await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_domain_checker_over_udp_pool(self):
+        """Test DomainChecker resolves through the UDP pool."""
+        async with UDPStandInServer() as server:
+            transport = PooledUDPTransport(["127.0.0.1"], port=server.port)
+            async with DomainChecker(transport=transport) as checker:
+                result = await checker.acheck("a.com")
+
+        assert result.status == FilterStatus.FREE
+        assert result.ips == frozenset({"1.2.3.4"})
+
+    def test_reuse_on_new_loop(self):
+        """Test a closed transport works again from another event loop."""
+        transport = PooledUDPTransport(["127.0.0.1"], sockets=1, max_outstanding=1)
+
+        async def scan():
+            async with UDPStandInServer() as server:
+                transport.port = server.port
+                responses = await asyncio.gather(
+                    *(transport.query(_query(f"d{i}.com")) for i in range(4))
+                )
+                await transport.aclose()
+            return responses
+
+        for _ in range(2):
+            responses = asyncio.run(scan())
+            assert all(r.rcode() == dns.rcode.NOERROR for r in responses)
+
+    def test_invalid_arguments(self):
+        """Test invalid configuration is rejected."""
+        with pytest.raises(ValueError):
+            PooledUDPTransport([])
+        with pytest.raises(ValueError):
+            PooledUDPTransport(["127.0.0.1"], max_outstanding=0)
+
+
+class TestTransportResolver:
+    """Tests for TransportResolver class."""
+
+    @pytest.mark.asyncio
+    async def test_nxdomain(self):
+        """Test NXDOMAIN responses raise the resolver exception."""
+        async with StandInServer() as server:
+            transport = PooledTCPTransport(["127.0.0.1"], port=server.port)
+
+            with pytest.raises(resolver.NXDOMAIN):
+                await TransportResolver(transport).resolve("missing.com")
+            await transport.aclose()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_raises_no_nameservers(self):
+        """Test transport failures map to NoNameservers."""
+        transport = PooledTCPTransport(["127.0.0.1"], port=1, connect_timeout=1)
+
+        with pytest.raises(resolver.NoNameservers):
+            await TransportResolver(transport).resolve("a.com")
+
+    @pytest.mark.asyncio
+    async def test_domain_checker_uses_transport(self):
+        """Test DomainChecker resolves through a custom transport."""
+        async with StandInServer() as server:
+            transport = PooledTCPTransport(["127.0.0.1"], port=server.port)
+            checker = DomainChecker(transport=transport)
+
+            free = await checker.acheck("a.com")
+            missing = await checker.acheck("missing.com")
+            await transport.aclose()
+
+        assert free.status == FilterStatus.FREE
+        assert free.ips == frozenset({"1.2.3.4"})
+        assert free.ttl == 60
+        assert missing.status == FilterStatus.UNKNOWN
@@ -88,6 +88,19 @@ class TestValidateDomains:
         assert valid == []
         assert invalid == []
 
+    def test_normalizes_valid_domains(self):
+        """Test valid domains are returned lowercase and IDNA-encoded."""
+        valid, _ = utils.validate_domains(["Example.COM", "bücher.de"], verbose=False)
+        assert valid == ["example.com", "xn--bcher-kva.de"]
+
+    def test_verbose_summary_is_bounded(self, capsys):
+        """Test verbose mode lists a bounded number of invalid domains."""
+        bad = [f"bad{i}" for i in range(utils.MAX_REPORTED_INVALID + 5)]
+        utils.validate_domains(bad)
+        captured = capsys.readouterr()
+        assert "bad0" in captured.out
+        assert "and 5 more" in captured.out
+
 
 class TestFormatStatus:
     """Tests for format_status function."""
@@ -277,6 +290,20 @@ class TestPrintResult:
         assert results[0].is_blocked is True
         mock_checker.acheck.assert_called_once_with("example.com")
 
+    @pytest.mark.asyncio
+    async def test_print_result_uses_default_checker(self):
+        """Test print_result reuses the shared default checker."""
+        default = MagicMock(spec=DomainChecker)
+        default.acheck = AsyncMock(
+            return_value=CheckResult(domain="example.com", status=FilterStatus.FREE)
+        )
+
+        with patch("check_filter.utils.get_default_checker", return_value=default):
+            await utils.print_result(["example.com"], show_progress=False)
+            await utils.print_result(["example.com"], show_progress=False)
+
+        assert default.acheck.call_count == 2
+
 
 class TestDomainPattern:
     """Tests for DOMAIN_PATTERN constant."""
@@ -0,0 +1,212 @@
+"""Tests for the validation module."""
+
+import pytest
+
+from check_filter import validation
+from check_filter.validation import (
+    REASON_EMPTY,
+    REASON_SYNTAX,
+    REASON_TOO_LONG,
+    REASON_WHITESPACE,
+    ValidationError,
+    check_domain,
+    is_valid_domain,
+    normalize_domain,
+    split_ranges,
+    validate_batch,
+    validate_file,
+)
+
+
+class TestNormalizeDomain:
+    """Tests for normalize_domain function."""
+
+    def test_strips_and_lowercases(self):
+        """Test surrounding whitespace is removed and case folded."""
+        assert normalize_domain("  Example.COM\t") == "example.com"
+
+    def test_idna_encoding(self):
+        """Test internationalized names are converted to punycode."""
+        assert normalize_domain("Bücher.example") == "xn--bcher-kva.example"
+
+
+class TestCheckDomain:
+    """Tests for check_domain function."""
+
+    @pytest.mark.parametrize(
+        "domain",
+        [
+            "example.com",
+            "sub.example.co.uk",
+            "a.io",
+            "123.com",
+            "xn--bcher-kva.com",
+            "xn--p1ai.xn--p1ai",
+            "bücher.com",
+        ],
+    )
+    def test_valid(self, domain):
+        """Test valid domains are accepted."""
+        normalized, reason = check_domain(domain)
+
+        assert reason is None
+        assert normalized
+
+    @pytest.mark.parametrize(
+        "domain",
+        ["invalid", "-invalid.com", "invalid-.com", ".com", "foo_bar.com", "1.2.3.4"],
+    )
+    def test_invalid_syntax(self, domain):
+        """Test syntactically invalid domains are rejected."""
+        assert check_domain(domain) == (None, REASON_SYNTAX)
+
+    def test_empty(self):
+        """Test empty and None inputs."""
+        assert check_domain("") == (None, REASON_EMPTY)
+        assert check_domain(None) == (None, REASON_EMPTY)
+
+    def test_whitespace(self):
+        """Test whitespace-only input."""
+        assert check_domain("   ") == (None, REASON_WHITESPACE)
+
+    def test_too_long(self):
+        """Test names over 253 characters are rejected."""
+        domain = ".".join(["a" * 63] * 4) + ".com"
+
+        assert check_domain(domain) == (None, REASON_TOO_LONG)
+
+    def test_is_valid_domain(self):
+        """Test boolean helper."""
+        assert is_valid_domain("example.com") is True
+        assert is_valid_domain("invalid") is False
+
+
+class TestValidateBatch:
+    """Tests for validate_batch function."""
+
+    def test_collects_errors_in_order(self):
+        """Test valid and invalid inputs are split preserving order."""
+        report = validate_batch(["Example.com", " invalid ", "google.com", ""])
+
+        assert report.valid == ["example.com", "google.com"]
+        assert report.invalid == ["invalid", ""]
+        assert report.errors[0] == ValidationError("invalid", REASON_SYNTAX)
+
+    def test_does_not_print(self, capsys):
+        """Test batch validation never prints."""
+        validate_batch(["invalid", "also invalid"])
+
+        assert capsys.readouterr().out == ""
+
+    def test_accepts_generator(self):
+        """Test any iterable can be validated."""
+        report = validate_batch(d for d in ["a.com", "b.com"])
+
+        assert report.valid == ["a.com", "b.com"]
+
+    @pytest.mark.slow
+    def test_parallel_preserves_order(self):
+        """Test chunked multi-process validation preserves input order."""
+        domains = [f"d{i}.com" if i % 3 else f"bad{i}" for i in range(1000)]
+
+        serial = validate_batch(domains)
+        parallel = validate_batch(domains, processes=2, chunk_size=64)
+
+        assert parallel.valid == serial.valid
+        assert parallel.invalid == serial.invalid
+
+    def test_invalid_arguments(self):
+        """Test invalid worker settings raise ValueError."""
+        with pytest.raises(ValueError):
+            validate_batch([], processes=0)
+        with pytest.raises(ValueError):
+            validate_batch([], chunk_size=0)
+
+    def test_chunks(self):
+        """Test chunk helper splits evenly with a short tail."""
+        chunks = list(validation._chunks(range(5), 2))
+
+        assert chunks == [[0, 1], [2, 3], [4]]
+
+
+class TestValidateFile:
+    """Tests for memory-mapped file validation."""
+
+    CONTENT = (
+        "# feed\n"
+        "Example.com\n"
+        "\n"
+        "invalid\n"
+        "important.com,10\n"
+        "b\u00fccher.example\n"
+        "last.com"
+    )
+
+    def test_split_ranges_align_to_newlines(self, tmp_path):
+        """Test ranges cover the file and end right after a newline."""
+        path = tmp_path / "domains.txt"
+        data = "".join(f"d{i}.com\n" for i in range(100)).encode()
+        path.write_bytes(data)
+
+        ranges = split_ranges(path, 7)
+
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == len(data)
+        for (_, end), (start, _) in zip(ranges, ranges[1:], strict=False):
+            assert end == start
+            assert data[end - 1 : end] == b"\n"
+
+    def test_split_ranges_more_parts_than_lines(self, tmp_path):
+        """Test a short file yields one range per line at most."""
+        path = tmp_path / "domains.txt"
+        path.write_text("a.com\nb.com\n")
+
+        assert split_ranges(path, 16) == [(0, 6), (6, 12)]
+
+    def test_split_ranges_empty_file(self, tmp_path):
+        """Test an empty file has no ranges."""
+        path = tmp_path / "empty.txt"
+        path.write_text("")
+
+        assert split_ranges(path, 4) == []
+
+    def test_parses_like_line_reader(self, tmp_path):
+        """Test comments, blanks, priorities and IDNA are handled."""
+        path = tmp_path / "domains.txt"
+        path.write_text(self.CONTENT, encoding="utf-8")
+
+        report = validate_file(path, processes=1)
+
+        assert report.valid == [
+            "example.com",
+            "important.com",
+            "xn--bcher-kva.example",
+            "last.com",
+        ]
+        assert report.invalid == ["invalid"]
+        assert report.priorities == {"important.com": 10.0}
+
+    @pytest.mark.slow
+    def test_parallel_preserves_order(self, tmp_path):
+        """Test multi-process range validation matches a single pass."""
+        path = tmp_path / "domains.txt"
+        lines = [f"d{i}.com,{i}" if i % 3 else f"bad{i}" for i in range(5000)]
+        path.write_text("\n".join(lines))
+
+        serial = validate_file(path, processes=1)
+        parallel = validate_file(path, processes=3, min_range_size=1024)
+
+        assert parallel.valid == serial.valid
+        assert parallel.invalid == serial.invalid
+        assert parallel.priorities == serial.priorities
+        assert len(serial.valid) + len(serial.invalid) == 5000
+
+    def test_invalid_arguments(self, tmp_path):
+        """Test invalid worker settings raise ValueError."""
+        path = tmp_path / "domains.txt"
+        path.write_text("a.com\n")
+
+        with pytest.raises(ValueError):
+            validate_file(path, processes=0)
+        with pytest.raises(ValueError):
+            validate_file(path, min_range_size=0)
@@ -0,0 +1,138 @@
+"""Tests for the watch module."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from typer.testing import CliRunner
+
+from check_filter import CheckResult, DomainChecker, FilterStatus, cli
+from check_filter.watch import DomainWatcher
+
+runner = CliRunner()
+
+
+def _sequenced_checker(sequences):
+    """Create a checker returning successive statuses per domain."""
+    checker = DomainChecker()
+    calls = {domain: iter(statuses) for domain, statuses in sequences.items()}
+    started = []
+
+    async def acheck(domain):
+        started.append((domain, asyncio.get_running_loop().time()))
+        return CheckResult(domain=domain, status=next(calls[domain]))
+
+    checker.acheck = AsyncMock(side_effect=acheck)
+    checker.started = started
+    return checker
+
+
+async def _collect(watcher, rounds):
+    return [change async for change in watcher.watch(rounds=rounds)]
+
+
+class TestDomainWatcher:
+    """Tests for DomainWatcher class."""
+
+    @pytest.mark.asyncio
+    async def test_emits_only_transitions(self):
+        """Test only status changes after the baseline are emitted."""
+        free, blocked, error = (
+            FilterStatus.FREE,
+            FilterStatus.BLOCKED,
+            FilterStatus.ERROR,
+        )
+        checker = _sequenced_checker(
+            {
+                "a.com": [free, blocked, blocked, free],
+                "b.com": [free, free, error, free],
+            }
+        )
+        watcher = DomainWatcher(checker, ["a.com", "b.com"], interval=0.02, jitter=0)
+
+        changes = await _collect(watcher, rounds=4)
+
+        assert [(c.domain, c.previous, c.current) for c in changes] == [
+            ("a.com", free, blocked),
+            ("a.com", blocked, free),
+        ]
+        assert watcher.checks == 8
+        assert watcher.statuses == {"a.com": free, "b.com": free}
+
+    @pytest.mark.asyncio
+    async def test_errors_reported_when_not_ignored(self):
+        """Test ERROR transitions are emitted with ignore_errors=False."""
+        checker = _sequenced_checker({"a.com": [FilterStatus.FREE, FilterStatus.ERROR]})
+        watcher = DomainWatcher(
+            checker, ["a.com"], interval=0.01, jitter=0, ignore_errors=False
+        )
+
+        changes = await _collect(watcher, rounds=2)
+
+        assert [c.current for c in changes] == [FilterStatus.ERROR]
+
+    @pytest.mark.asyncio
+    async def test_checks_are_spread_across_interval(self):
+        """Test check starts are spaced by the per-domain slot."""
+        domains = [f"d{i}.com" for i in range(4)]
+        checker = _sequenced_checker({d: [FilterStatus.FREE] for d in domains})
+        watcher = DomainWatcher(checker, domains, interval=0.2, jitter=0)
+
+        await _collect(watcher, rounds=1)
+
+        starts = [t for _, t in checker.started]
+        gaps = [b - a for a, b in zip(starts, starts[1:], strict=False)]
+        assert all(gap >= watcher.slot * 0.8 for gap in gaps)
+
+    def test_jitter_stays_within_slot(self):
+        """Test jittered offsets never leave their slot."""
+        watcher = DomainWatcher(MagicMock(), ["a.com", "b.com"], interval=10)
+
+        for _ in range(100):
+            assert 0 <= watcher._offset(0) <= watcher.slot * watcher.jitter
+            assert watcher.slot <= watcher._offset(1) <= watcher.slot * 1.5
+
+    def test_deduplicates_domains(self):
+        """Test duplicate domains are watched once."""
+        watcher = DomainWatcher(MagicMock(), ["a.com", "a.com", "b.com"])
+
+        assert watcher.domains == ["a.com", "b.com"]
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"domains": []},
+            {"interval": 0},
+            {"jitter": 2},
+            {"max_in_flight": 0},
+        ],
+    )
+    def test_invalid_arguments(self, kwargs):
+        """Test invalid configuration is rejected."""
+        params = {"checker": MagicMock(), "domains": ["a.com"], **kwargs}
+
+        with pytest.raises(ValueError):
+            DomainWatcher(**params)
+
+
+class TestWatchCommand:
+    """Tests for the watch CLI command."""
+
+    def test_watch_runs_watcher(self, tmp_path):
+        """Test the command validates input and starts watching."""
+        file_path = tmp_path / "domains.txt"
+        file_path.write_text("example.com\n")
+
+        async def fake_watch(self, rounds=None):
+            yield MagicMock(
+                domain="example.com",
+                previous=FilterStatus.FREE,
+                current=FilterStatus.BLOCKED,
+            )
+
+        with patch.object(DomainWatcher, "watch", fake_watch):
+            result = runner.invoke(cli.app, ["watch", str(file_path), "-i", "60"])
+
+        assert result.exit_code == 0
+        assert "Watching 1 domain" in result.stdout
+        assert "example.com: free -> blocked" in result.stdout